@@ -0,0 +1,108 @@
+import copy
+import logging
+import pickle
+
+import redis
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .tokens import GENERATION_CLAIM, generation_key
+from core.cache import LocalLRUCache
+from core.metrics import record_cache_lookup
+from core.services.redis import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+
+def _version_key(user_id) -> str:
+    return f"auth:user:{user_id}:version"
+
+
+def _user_key(user_id, version: int) -> str:
+    return f"auth:user:{user_id}:v{version}"
+
+
+def bump_user_version(user_id):
+    """
+    Invalidate every cached copy of a user.
+
+    Called after ``User`` saves and deletes commit; code that changes users
+    with ``QuerySet.update()`` must call it as well.
+    """
+    try:
+        get_redis_client().incr(_version_key(user_id))
+    except redis.RedisError as e:
+        logger.error(f"Could not invalidate cached user {user_id}: {e}")
+
+
+_local_users = LocalLRUCache(settings.AUTH_USER_LOCAL_CACHE_SIZE, settings.AUTH_USER_LOCAL_CACHE_TTL)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that resolves users from cache instead of the database.
+
+    Each user has a version counter in Redis that is bumped whenever the user
+    is saved or deleted. Requests read the current version together with the
+    user's token generation (one Redis MGET) and use the per-process LRU or
+    the Redis copy stored under that version, so a change, including
+    deactivation, takes effect on the very next request. Tokens from an older
+    generation are rejected. The database is only queried on a miss or when
+    the cached user cannot be read. Without Redis the generation cannot be
+    checked, so requests are rejected rather than let tokens revoked by
+    logging out of all devices back in.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        try:
+            version, generation = get_redis_client().mget(
+                _version_key(user_id),
+                generation_key(user_id)
+            )
+        except redis.RedisError as e:
+            logger.error(f"Token generation unavailable, rejecting request: {e}")
+            raise AuthenticationFailed(_("Token could not be verified"), code="token_not_verified")
+        if validated_token.get(GENERATION_CLAIM, 0) < int(generation or 0):
+            raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+
+        try:
+            user = self._get_cached_user(user_id, int(version or 0))
+        except redis.RedisError as e:
+            logger.warning(f"User cache unavailable, falling back to database: {e}")
+            return super().get_user(validated_token)
+
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        # Callers may mutate request.user; never hand out the shared instance
+        return copy.copy(user)
+
+    def _get_cached_user(self, user_id, version: int):
+        client = get_redis_client()
+        cached = _local_users.get(user_id)
+        if cached is not None and cached[0] == version:
+            record_cache_lookup('auth_user', 'local_hit')
+            return cached[1]
+
+        blob = client.get(_user_key(user_id, version))
+        if blob is not None:
+            record_cache_lookup('auth_user', 'hit')
+            user = pickle.loads(blob)
+        else:
+            record_cache_lookup('auth_user', 'miss')
+            try:
+                user = self.user_model.objects.get(**{api_settings.USER_ID_FIELD: user_id})
+            except self.user_model.DoesNotExist:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            client.set(_user_key(user_id, version), pickle.dumps(user), ex=settings.AUTH_USER_CACHE_TTL)
+
+        _local_users.set(user_id, (version, user))
+        return user
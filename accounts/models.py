@@ -1,4 +1,3 @@
-import uuid
 import random
 from datetime import timedelta
 
@@ -7,6 +6,7 @@ from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.utils import timezone
 from django.conf import settings
 
+from core.ids import uuid7
 from core.models import TimeStampedModel
 
 
@@ -48,7 +48,7 @@ class User(AbstractUser, TimeStampedModel):
     """
     Custom user model that uses phone number for authentication.
     """
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     username = None  # Remove username field
     phone_number = models.CharField(max_length=15, unique=True)
     email = models.EmailField(blank=True, null=True)
@@ -68,7 +68,7 @@ class OTP(TimeStampedModel):
     """
     One-time password model for user verification.
     """
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='otps')
     code = models.CharField(max_length=6)
     is_used = models.BooleanField(default=False)
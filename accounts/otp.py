@@ -0,0 +1,233 @@
+import hashlib
+import hmac
+import json
+import logging
+import secrets
+import uuid
+from datetime import timedelta
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import DataError, IntegrityError, transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from django.utils.translation import gettext_lazy as _
+
+from .models import OTP, User
+from core.services.redis import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+OTP_AUDIT_KEY = 'otp:audit'
+OTP_AUDIT_LOCK_KEY = 'otp:audit:flush'
+OTP_AUDIT_DEAD_LETTER_KEY = 'otp:audit:dead'
+OTP_AUDIT_LOCK_TIMEOUT = 60
+MASKED_CODE = '******'
+
+
+class OTPError(Exception):
+    """
+    Raised when an OTP cannot be verified.
+    """
+
+    def __init__(self, message):
+        super().__init__(message)
+        self.message = message
+
+
+class BaseOTPBackend:
+    """
+    Interface for OTP storage backends.
+    """
+
+    def issue(self, user) -> str:
+        """
+        Create a new OTP for the user, replacing any previous one, and return the code.
+        """
+        raise NotImplementedError
+
+    def verify(self, user, code: str):
+        """
+        Validate and consume the user's OTP, raising ``OTPError`` on failure.
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def generate_code() -> str:
+        return f"{secrets.randbelow(10 ** 6):06d}"
+
+
+class DatabaseOTPBackend(BaseOTPBackend):
+    """
+    Stores every OTP as an ``OTP`` row.
+    """
+
+    def issue(self, user) -> str:
+        return OTP.generate_otp(user).code
+
+    def verify(self, user, code: str):
+        # Get the latest OTP for the user
+        latest_otp = OTP.objects.filter(user=user).order_by('-created_at').first()
+
+        if not latest_otp:
+            raise OTPError(_("No OTP found for this user."))
+
+        if not latest_otp.is_valid():
+            raise OTPError(_("OTP has expired or already been used."))
+
+        if latest_otp.code != code:
+            raise OTPError(_("Invalid OTP code."))
+
+        # Mark OTP as used
+        latest_otp.is_used = True
+        latest_otp.save()
+
+
+# Compare and consume in one round trip. Returns 1 on success, 0 if there is
+# no live code, -1 on a wrong code and -2 once the attempt limit burns the code.
+VERIFY_SCRIPT = """
+local stored = redis.call('HGET', KEYS[1], 'hash')
+if not stored then
+    return 0
+end
+if stored == ARGV[1] then
+    local otp_id = redis.call('HGET', KEYS[1], 'id')
+    redis.call('DEL', KEYS[1])
+    if ARGV[3] == '1' then
+        redis.call('RPUSH', KEYS[2], cjson.encode({event = 'used', id = otp_id}))
+    end
+    return 1
+end
+local attempts = redis.call('HINCRBY', KEYS[1], 'attempts', 1)
+if attempts >= tonumber(ARGV[2]) then
+    redis.call('DEL', KEYS[1])
+    return -2
+end
+return -1
+"""
+
+
+class RedisOTPBackend(BaseOTPBackend):
+    """
+    Keeps only a keyed hash of the current code in Redis, expiring natively.
+
+    When ``OTP_AUDIT_ENABLED`` is set, issue/use events are queued in Redis
+    and written to the ``OTP`` table in batches by ``flush_otp_audit``.
+    """
+
+    def __init__(self):
+        self.redis = get_redis_client()
+        self.ttl = settings.OTP_EXPIRY_MINUTES * 60
+        self.max_attempts = settings.OTP_MAX_ATTEMPTS
+        self.audit = settings.OTP_AUDIT_ENABLED
+        self.verify_script = self.redis.register_script(VERIFY_SCRIPT)
+
+    @staticmethod
+    def _key(user) -> str:
+        return f"otp:{user.pk}"
+
+    @staticmethod
+    def _hash(user, code: str) -> str:
+        return hmac.new(
+            settings.SECRET_KEY.encode(), f"{user.pk}:{code}".encode(), hashlib.sha256
+        ).hexdigest()
+
+    def issue(self, user) -> str:
+        code = self.generate_code()
+        otp_id = str(uuid.uuid4())
+        key = self._key(user)
+
+        pipe = self.redis.pipeline()
+        pipe.delete(key)
+        pipe.hset(key, mapping={'hash': self._hash(user, code), 'id': otp_id, 'attempts': 0})
+        pipe.expire(key, self.ttl)
+        if self.audit:
+            pipe.rpush(OTP_AUDIT_KEY, json.dumps({
+                'event': 'issued',
+                'id': otp_id,
+                'user_id': str(user.pk),
+                'expires_at': (timezone.now() + timedelta(seconds=self.ttl)).isoformat(),
+            }))
+        pipe.execute()
+        return code
+
+    def verify(self, user, code: str):
+        result = self.verify_script(
+            keys=[self._key(user), OTP_AUDIT_KEY],
+            args=[self._hash(user, code), self.max_attempts, '1' if self.audit else '0']
+        )
+        if result == 0:
+            raise OTPError(_("OTP has expired or already been used."))
+        if result == -1:
+            raise OTPError(_("Invalid OTP code."))
+        if result == -2:
+            raise OTPError(_("Too many attempts. Please request a new OTP."))
+
+
+def flush_audit_events(batch_size: int) -> int:
+    """
+    Move queued OTP audit events from Redis into the ``OTP`` table.
+
+    Codes are never written; audit rows carry a masked placeholder. Events
+    are only removed from the queue once their rows are committed, so a
+    failed write leaves them for the next flush. Events of users deleted in
+    the meantime are dropped, and a batch the database rejects outright is
+    moved to ``OTP_AUDIT_DEAD_LETTER_KEY`` rather than retried forever.
+    Returns the number of events processed, or 0 while another flush holds
+    the lock.
+    """
+    client = get_redis_client()
+    # Flushes trim the head of the queue, so two at once would drop each other's events
+    lock = client.lock(OTP_AUDIT_LOCK_KEY, timeout=OTP_AUDIT_LOCK_TIMEOUT)
+    if not lock.acquire(blocking=False):
+        return 0
+
+    try:
+        raw_events = client.lrange(OTP_AUDIT_KEY, 0, batch_size - 1)
+        if not raw_events:
+            return 0
+        try:
+            write_audit_events([json.loads(raw) for raw in raw_events])
+        except (ValueError, KeyError, IntegrityError, DataError) as e:
+            logger.error(f"Moving {len(raw_events)} OTP audit events to {OTP_AUDIT_DEAD_LETTER_KEY}: {e}")
+            pipe = client.pipeline()
+            pipe.rpush(OTP_AUDIT_DEAD_LETTER_KEY, *raw_events)
+            pipe.ltrim(OTP_AUDIT_KEY, len(raw_events), -1)
+            pipe.execute()
+            return len(raw_events)
+        # New events are appended at the tail, so the head still holds this batch
+        client.ltrim(OTP_AUDIT_KEY, len(raw_events), -1)
+        return len(raw_events)
+    finally:
+        lock.release()
+
+
+def write_audit_events(events):
+    """
+    Write one batch of decoded audit events in a single transaction.
+    """
+    user_ids = {event['user_id'] for event in events if event['event'] == 'issued'}
+    existing_users = {str(pk) for pk in User.objects.filter(id__in=user_ids).values_list('id', flat=True)}
+    issued = [
+        OTP(
+            id=event['id'],
+            user_id=event['user_id'],
+            code=MASKED_CODE,
+            expires_at=event['expires_at'],
+        )
+        for event in events if event['event'] == 'issued' and event['user_id'] in existing_users
+    ]
+    used_ids = [event['id'] for event in events if event['event'] == 'used']
+
+    with transaction.atomic():
+        OTP.objects.bulk_create(issued, batch_size=500, ignore_conflicts=True)
+        if used_ids:
+            OTP.objects.filter(id__in=used_ids).update(is_used=True)
+
+
+@lru_cache(maxsize=None)
+def get_otp_backend() -> BaseOTPBackend:
+    """
+    Return the OTP backend configured in ``OTP_BACKEND``.
+    """
+    return import_string(settings.OTP_BACKEND)()
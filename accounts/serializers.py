@@ -1,8 +1,11 @@
 from rest_framework import serializers
 from django.utils.translation import gettext_lazy as _
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
 
-from .models import User, OTP
+from .models import User
+from .otp import OTPError, get_otp_backend
+from .tokens import RedisRefreshToken
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -38,21 +41,11 @@ class OTPVerificationSerializer(serializers.Serializer):
         except User.DoesNotExist:
             raise serializers.ValidationError(_("User with this phone number does not exist."))
         
-        # Get the latest OTP for the user
-        latest_otp = OTP.objects.filter(user=user).order_by('-created_at').first()
-        
-        if not latest_otp:
-            raise serializers.ValidationError(_("No OTP found for this user."))
-        
-        if not latest_otp.is_valid():
-            raise serializers.ValidationError(_("OTP has expired or already been used."))
-        
-        if latest_otp.code != otp_code:
-            raise serializers.ValidationError(_("Invalid OTP code."))
-        
-        # Mark OTP as used
-        latest_otp.is_used = True
-        latest_otp.save()
+        # Validate and consume the OTP
+        try:
+            get_otp_backend().verify(user, otp_code)
+        except OTPError as e:
+            raise serializers.ValidationError(e.message)
         
         # Mark user as verified if not already
         if not user.is_verified:
@@ -60,7 +53,7 @@ class OTPVerificationSerializer(serializers.Serializer):
             user.save()
         
         # Generate tokens
-        refresh = RefreshToken.for_user(user)
+        refresh = RedisRefreshToken.for_user(user)
         
         return {
             'user': user,
@@ -75,3 +68,23 @@ class TelegramIDSerializer(serializers.Serializer):
     """
     telegram_id = serializers.CharField(max_length=20)
 
+
+class RedisTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Token refresh serializer that rotates and revokes tokens through Redis.
+    """
+    token_class = RedisRefreshToken
+
+
+class LogoutSerializer(serializers.Serializer):
+    """
+    Serializer for revoking a refresh token.
+    """
+    refresh = serializers.CharField()
+    
+    def validate(self, attrs):
+        try:
+            RedisRefreshToken(attrs['refresh']).blacklist()
+        except TokenError as e:
+            raise serializers.ValidationError(str(e))
+        return attrs
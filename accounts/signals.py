@@ -0,0 +1,16 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .authentication import bump_user_version
+from .models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    """
+    Invalidate cached copies of the user once the change is committed.
+    """
+    user_id = instance.pk
+    transaction.on_commit(lambda: bump_user_version(user_id))
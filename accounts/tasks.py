@@ -0,0 +1,41 @@
+from celery import shared_task
+from django.conf import settings
+
+from .models import User
+from .otp import flush_audit_events
+from .verification import VerificationStatus, get_verification, set_verification_status
+from core.services.telegram import TelegramClient
+
+
+# Safe to run twice: audit rows are inserted with ignore_conflicts
+@shared_task(ignore_result=True, acks_late=True, reject_on_worker_lost=True)
+def flush_otp_audit():
+    """
+    Write queued OTP audit events to the database in batches.
+    """
+    while flush_audit_events(settings.OTP_AUDIT_BATCH_SIZE) == settings.OTP_AUDIT_BATCH_SIZE:
+        pass
+
+
+# Acked early: a redelivery could message the user twice
+@shared_task(ignore_result=True)
+def verify_telegram_id(verification_id):
+    """
+    Verify a Telegram ID by messaging it, and save it on the user on success.
+    """
+    state = get_verification(verification_id)
+    if state is None or state['status'] != VerificationStatus.PENDING:
+        return
+
+    if not TelegramClient().verify_telegram_id(state['telegram_id']):
+        set_verification_status(verification_id, VerificationStatus.FAILED)
+        return
+
+    user = User.objects.filter(pk=state['user_id']).first()
+    if user is None:
+        set_verification_status(verification_id, VerificationStatus.FAILED)
+        return
+
+    user.telegram_id = state['telegram_id']
+    user.save(update_fields=['telegram_id', 'updated_at'])
+    set_verification_status(verification_id, VerificationStatus.VERIFIED)
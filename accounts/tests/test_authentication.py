@@ -0,0 +1,30 @@
+from unittest import mock
+
+import redis
+from django.test import SimpleTestCase
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+
+from accounts.authentication import CachedJWTAuthentication
+
+
+class GenerationCheckTests(SimpleTestCase):
+
+    def test_rejects_token_when_generation_unreadable(self):
+        client = mock.Mock()
+        client.mget.side_effect = redis.ConnectionError('down')
+
+        with mock.patch('accounts.authentication.get_redis_client', return_value=client), \
+                mock.patch('rest_framework_simplejwt.authentication.JWTAuthentication.get_user') as fallback:
+            with self.assertRaises(AuthenticationFailed):
+                CachedJWTAuthentication().get_user({'user_id': 1, 'gen': 0})
+
+        # A revoked token must not reach the database fallback while Redis is down
+        fallback.assert_not_called()
+
+    def test_rejects_revoked_generation(self):
+        client = mock.Mock()
+        client.mget.return_value = [None, b'2']
+
+        with mock.patch('accounts.authentication.get_redis_client', return_value=client):
+            with self.assertRaises(AuthenticationFailed):
+                CachedJWTAuthentication().get_user({'user_id': 1, 'gen': 1})
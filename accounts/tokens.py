@@ -0,0 +1,72 @@
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from core.services.redis import get_redis_client
+
+GENERATION_CLAIM = 'gen'
+
+
+def revoked_key(jti: str) -> str:
+    return f"auth:revoked:{jti}"
+
+
+def generation_key(user_id) -> str:
+    return f"auth:user:{user_id}:generation"
+
+
+def get_token_generation(user_id) -> int:
+    """
+    Return the user's current token generation.
+    """
+    return int(get_redis_client().get(generation_key(user_id)) or 0)
+
+
+def revoke_all_tokens(user_id) -> int:
+    """
+    Log the user out of every device by invalidating all tokens issued so far.
+    """
+    return get_redis_client().incr(generation_key(user_id))
+
+
+class RedisRefreshToken(RefreshToken):
+    """
+    Refresh token revocable through Redis instead of the token_blacklist tables.
+
+    Revoked JTIs are kept only until the token would have expired anyway, and
+    each token carries the user's token generation, so bumping the generation
+    revokes every token issued before it.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token[GENERATION_CLAIM] = get_token_generation(user.pk)
+        return token
+
+    def verify(self, *args, **kwargs):
+        super().verify(*args, **kwargs)
+        self.check_revoked()
+
+    def check_revoked(self):
+        user_id = self.payload.get(api_settings.USER_ID_CLAIM)
+        revoked, generation = get_redis_client().mget(
+            revoked_key(self.payload[api_settings.JTI_CLAIM]),
+            generation_key(user_id)
+        )
+        if revoked is not None:
+            raise TokenError(_("Token is blacklisted"))
+        if self.payload.get(GENERATION_CLAIM, 0) < int(generation or 0):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        """
+        Revoke this token. Revoking is atomic, so a token can be rotated only once.
+        """
+        expires_at = datetime_from_epoch(self.payload['exp'])
+        ttl = max(1, int((expires_at - timezone.now()).total_seconds()))
+        if not get_redis_client().set(revoked_key(self.payload[api_settings.JTI_CLAIM]), 1, ex=ttl, nx=True):
+            raise TokenError(_("Token is blacklisted"))
@@ -4,7 +4,10 @@ from .views import (
     RequestOTPView,
     VerifyOTPView,
     UserProfileView,
-    UpdateTelegramIDView
+    UpdateTelegramIDView,
+    TelegramVerificationStatusView,
+    LogoutView,
+    LogoutAllView
 )
 
 app_name = 'accounts'
@@ -14,5 +17,12 @@ urlpatterns = [
     path('verify-otp/', VerifyOTPView.as_view(), name='verify-otp'),
     path('profile/', UserProfileView.as_view(), name='profile'),
     path('update-telegram-id/', UpdateTelegramIDView.as_view(), name='update-telegram-id'),
+    path(
+        'telegram-verification/<uuid:verification_id>/',
+        TelegramVerificationStatusView.as_view(),
+        name='telegram-verification-status'
+    ),
+    path('logout/', LogoutView.as_view(), name='logout'),
+    path('logout-all/', LogoutAllView.as_view(), name='logout-all'),
 ]
 
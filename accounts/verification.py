@@ -0,0 +1,65 @@
+import uuid
+from typing import Dict, Optional, Tuple
+
+from django.conf import settings
+
+from core.services.redis import get_redis_client
+
+
+class VerificationStatus:
+    PENDING = 'pending'
+    VERIFIED = 'verified'
+    FAILED = 'failed'
+
+
+def _state_key(verification_id: str) -> str:
+    return f"tgverify:{verification_id}"
+
+
+def _request_key(user_id, telegram_id: str) -> str:
+    return f"tgverify:request:{user_id}:{telegram_id}"
+
+
+def start_verification(user, telegram_id: str) -> Tuple[str, bool]:
+    """
+    Register a Telegram ID verification for the user.
+
+    Repeated requests for the same ID within the coalescing window return the
+    existing verification. Returns ``(verification_id, created)``; the caller
+    queues the verification task only when ``created`` is True.
+    """
+    client = get_redis_client()
+    verification_id = str(uuid.uuid4())
+    request_key = _request_key(user.pk, telegram_id)
+
+    if not client.set(request_key, verification_id, nx=True,
+                      ex=settings.TELEGRAM_VERIFICATION_COALESCE_SECONDS):
+        existing_id = client.get(request_key)
+        if existing_id is not None:
+            return existing_id.decode(), False
+        # The window closed between SET and GET; start a new verification
+        client.set(request_key, verification_id, ex=settings.TELEGRAM_VERIFICATION_COALESCE_SECONDS)
+
+    pipe = client.pipeline()
+    pipe.hset(_state_key(verification_id), mapping={
+        'user_id': str(user.pk),
+        'telegram_id': telegram_id,
+        'status': VerificationStatus.PENDING,
+    })
+    pipe.expire(_state_key(verification_id), settings.TELEGRAM_VERIFICATION_TTL)
+    pipe.execute()
+    return verification_id, True
+
+
+def get_verification(verification_id: str) -> Optional[Dict[str, str]]:
+    """
+    Return the state of a verification, or None if it is unknown or expired.
+    """
+    state = get_redis_client().hgetall(_state_key(verification_id))
+    if not state:
+        return None
+    return {key.decode(): value.decode() for key, value in state.items()}
+
+
+def set_verification_status(verification_id: str, status: str):
+    get_redis_client().hset(_state_key(verification_id), 'status', status)
@@ -4,14 +4,19 @@ from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from django.utils.translation import gettext_lazy as _
 
-from .models import User, OTP
+from .models import User
+from .otp import get_otp_backend
 from .serializers import (
     UserSerializer, 
     PhoneNumberSerializer, 
     OTPVerificationSerializer,
-    TelegramIDSerializer
+    TelegramIDSerializer,
+    LogoutSerializer
 )
-from core.services.telegram import TelegramClient
+from .tasks import verify_telegram_id
+from .tokens import revoke_all_tokens
+from .verification import VerificationStatus, get_verification, start_verification
+from core.throttling import OTPRequestThrottle, OTPVerifyThrottle
 
 
 class RequestOTPView(APIView):
@@ -19,6 +24,7 @@ class RequestOTPView(APIView):
     View for requesting an OTP for login/registration.
     """
     permission_classes = [AllowAny]
+    throttle_classes = [OTPRequestThrottle]
     
     def post(self, request):
         serializer = PhoneNumberSerializer(data=request.data)
@@ -29,13 +35,13 @@ class RequestOTPView(APIView):
             user, created = User.objects.get_or_create(phone_number=phone_number)
             
             # Generate OTP
-            otp = OTP.generate_otp(user)
+            otp_code = get_otp_backend().issue(user)
             
             # In a real application, send the OTP via SMS
             # For now, we'll just return it in the response (for development only)
             return Response({
                 'message': _('OTP sent successfully'),
-                'otp_code': otp.code,  # Remove this in production
+                'otp_code': otp_code,  # Remove this in production
                 'is_new_user': created
             }, status=status.HTTP_200_OK)
         
@@ -47,6 +53,7 @@ class VerifyOTPView(APIView):
     View for verifying OTP and logging in/registering user.
     """
     permission_classes = [AllowAny]
+    throttle_classes = [OTPVerifyThrottle]
     
     def post(self, request):
         serializer = OTPVerificationSerializer(data=request.data)
@@ -75,6 +82,9 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
 class UpdateTelegramIDView(APIView):
     """
     View for updating user's Telegram ID.
+    
+    The ID is verified in the background; poll the verification status view
+    for the result.
     """
     permission_classes = [IsAuthenticated]
     
@@ -83,24 +93,62 @@ class UpdateTelegramIDView(APIView):
         if serializer.is_valid():
             telegram_id = serializer.validated_data['telegram_id']
             
-            # Verify the Telegram ID
-            telegram_client = TelegramClient()
-            is_valid = telegram_client.verify_telegram_id(telegram_id)
+            # Queue the verification unless one is already in progress
+            verification_id, created = start_verification(request.user, telegram_id)
+            if created:
+                verify_telegram_id.delay(verification_id)
             
-            if is_valid:
-                # Update user's Telegram ID
-                user = request.user
-                user.telegram_id = telegram_id
-                user.save()
-                
-                return Response({
-                    'message': _('Telegram ID updated successfully'),
-                    'user': UserSerializer(user).data
-                }, status=status.HTTP_200_OK)
-            else:
-                return Response({
-                    'message': _('Invalid Telegram ID')
-                }, status=status.HTTP_400_BAD_REQUEST)
+            verification = get_verification(verification_id) or {}
+            return Response({
+                'message': _('Telegram ID verification started'),
+                'verification_id': verification_id,
+                'status': verification.get('status', VerificationStatus.PENDING)
+            }, status=status.HTTP_202_ACCEPTED)
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+
+class TelegramVerificationStatusView(APIView):
+    """
+    View for checking the status of a Telegram ID verification.
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def get(self, request, verification_id):
+        verification = get_verification(str(verification_id))
+        if verification is None or verification['user_id'] != str(request.user.pk):
+            return Response({'detail': _('Verification not found')}, status=status.HTTP_404_NOT_FOUND)
+        
+        data = {
+            'verification_id': str(verification_id),
+            'telegram_id': verification['telegram_id'],
+            'status': verification['status']
+        }
+        if verification['status'] == VerificationStatus.VERIFIED:
+            data['user'] = UserSerializer(request.user).data
+        return Response(data, status=status.HTTP_200_OK)
+
+
+class LogoutView(APIView):
+    """
+    View for revoking a refresh token (log out of the current device).
+    """
+    permission_classes = [AllowAny]
+    
+    def post(self, request):
+        serializer = LogoutSerializer(data=request.data)
+        if serializer.is_valid():
+            return Response({'message': _('Logged out successfully')}, status=status.HTTP_200_OK)
+        
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class LogoutAllView(APIView):
+    """
+    View for revoking every token issued to the user (log out of all devices).
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def post(self, request):
+        revoke_all_tokens(request.user.pk)
+        return Response({'message': _('Logged out of all devices')}, status=status.HTTP_200_OK)
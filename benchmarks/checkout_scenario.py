@@ -0,0 +1,159 @@
+"""
+End-to-end checkout load test against the API running on the simulator.
+
+Each virtual user runs the full purchase flow in a loop:
+
+    request_otp -> verify_otp -> browse_catalog -> product_detail
+    -> create_order -> create_payment -> fulfillment (webhook received,
+    order completed)
+
+and the report gives p50/p95/p99 latency and throughput for every step.
+
+    python -m benchmarks.simulator --api-key test --latency 0.2 --callback-delay 1
+    CRYPTOMUS_BASE_URL=http://127.0.0.1:9000/v1 TELEGRAM_API_URL=http://127.0.0.1:9000 \\
+        CRYPTOMUS_API_KEY=test gunicorn config.wsgi -w 4 -b :8000
+    python -m benchmarks.checkout_scenario --users 50 --iterations 4
+
+The catalog needs at least one active product.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import defaultdict
+
+import httpx
+
+from .utils import summarize
+
+STEPS = [
+    'request_otp', 'verify_otp', 'browse_catalog', 'product_detail',
+    'create_order', 'create_payment', 'fulfillment',
+]
+
+
+class ScenarioError(Exception):
+    pass
+
+
+class CheckoutScenario:
+    """
+    Run the checkout flow for many concurrent virtual users and time each step.
+    """
+
+    def __init__(self, base_url, users, iterations, payment_path, fulfillment_timeout, poll_interval):
+        self.base_url = base_url
+        self.users = users
+        self.iterations = iterations
+        self.payment_path = payment_path
+        self.fulfillment_timeout = fulfillment_timeout
+        self.poll_interval = poll_interval
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    async def step(self, name, coroutine):
+        started = time.perf_counter()
+        try:
+            result = await coroutine
+        except (httpx.HTTPError, ScenarioError, KeyError, IndexError):
+            self.errors[name] += 1
+            raise ScenarioError(name)
+        self.latencies[name].append(time.perf_counter() - started)
+        return result
+
+    @staticmethod
+    async def _json(response_coroutine):
+        response = await response_coroutine
+        response.raise_for_status()
+        return response.json()
+
+    async def wait_for_fulfillment(self, client, order_id, headers):
+        deadline = time.perf_counter() + self.fulfillment_timeout
+        while time.perf_counter() < deadline:
+            order = await self._json(client.get(f'/api/v1/orders/{order_id}/', headers=headers))
+            if order['status'] == 'completed':
+                return order
+            if order['status'] in ('failed', 'cancelled'):
+                raise ScenarioError(order['status'])
+            await asyncio.sleep(self.poll_interval)
+        raise ScenarioError('timeout')
+
+    async def checkout(self, client, phone_number):
+        otp = await self.step('request_otp', self._json(
+            client.post('/api/v1/accounts/request-otp/', json={'phone_number': phone_number})
+        ))
+        tokens = await self.step('verify_otp', self._json(
+            client.post('/api/v1/accounts/verify-otp/', json={
+                'phone_number': phone_number,
+                'otp_code': otp['otp_code'],
+            })
+        ))
+        headers = {'Authorization': f"Bearer {tokens['access']}"}
+
+        catalog = await self.step('browse_catalog', self._json(client.get('/api/v1/products/')))
+        product = random.choice(catalog['results'])
+        await self.step('product_detail', self._json(client.get(f"/api/v1/products/{product['slug']}/")))
+
+        order = await self.step('create_order', self._json(client.post(
+            '/api/v1/orders/',
+            json={'telegram_id': '1000000', 'items': [{'product_id': product['id'], 'quantity': '1'}]},
+            headers=headers
+        )))
+        await self.step('create_payment', self._json(client.post(
+            self.payment_path.format(order_id=order['id']),
+            json={'payment_method': 'crypto'},
+            headers=headers
+        )))
+        await self.step('fulfillment', self.wait_for_fulfillment(client, order['id'], headers))
+
+    async def virtual_user(self, client, user_index):
+        for iteration in range(self.iterations):
+            phone_number = f"09{user_index:05d}{iteration:04d}"
+            try:
+                await self.checkout(client, phone_number)
+            except ScenarioError:
+                pass
+
+    async def run(self):
+        limits = httpx.Limits(max_connections=self.users * 2)
+        async with httpx.AsyncClient(base_url=self.base_url, timeout=60, limits=limits) as client:
+            started = time.perf_counter()
+            await asyncio.gather(*(self.virtual_user(client, i) for i in range(self.users)))
+            elapsed = time.perf_counter() - started
+
+        return {
+            'users': self.users,
+            'iterations': self.iterations,
+            'elapsed_s': round(elapsed, 2),
+            'steps': {
+                name: summarize(self.latencies[name], elapsed, self.errors[name])
+                for name in STEPS
+            },
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='End-to-end checkout load test')
+    parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--iterations', type=int, default=5)
+    parser.add_argument('--async-payment', action='store_true', help='use the async payment endpoint')
+    parser.add_argument('--fulfillment-timeout', type=float, default=60.0)
+    parser.add_argument('--poll-interval', type=float, default=0.5)
+    args = parser.parse_args()
+
+    if args.async_payment:
+        payment_path = '/api/v1/orders/{order_id}/create_payment_async/'
+    else:
+        payment_path = '/api/v1/orders/{order_id}/create_payment/'
+
+    scenario = CheckoutScenario(
+        args.base_url, args.users, args.iterations, payment_path,
+        args.fulfillment_timeout, args.poll_interval
+    )
+    print(json.dumps(asyncio.run(scenario.run()), indent=2))
+
+
+if __name__ == '__main__':
+    main()
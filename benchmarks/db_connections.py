@@ -0,0 +1,104 @@
+"""
+Connection overhead with and without persistent database connections.
+
+Worker threads replay the request cycle a gunicorn thread goes through
+(``request_started``, a typical catalog query, ``request_finished``) so
+Django opens, reuses and closes connections exactly as it does when
+serving. Each ``--conn-max-age`` value is run in turn; the report gives
+latency per request and how many connections were opened. Run it against
+the real Postgres (or PgBouncer) host, since connection setup is what is
+being measured. Needs data from ``generate_synthetic_data``.
+
+    python manage.py generate_synthetic_data --users 1000 --orders 5000
+    python -m benchmarks.db_connections --concurrency 16 --requests 200 --output db_connections.json
+"""
+import argparse
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup()
+
+from django.core.signals import request_finished, request_started  # noqa: E402
+from django.db import DEFAULT_DB_ALIAS, connection, connections  # noqa: E402
+from django.db.backends.signals import connection_created  # noqa: E402
+
+from products.models import Product  # noqa: E402
+from .utils import environment, summarize, write_report  # noqa: E402
+
+
+class ConnectionCounter:
+    def __init__(self):
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, sender, connection, **kwargs):
+        with self.lock:
+            self.count += 1
+
+
+def simulate_requests(count):
+    samples = []
+    try:
+        for _ in range(count):
+            request_started.send(sender=None)
+            started = time.perf_counter()
+            list(Product.objects.filter(is_active=True).values_list('id', 'name', 'price')[:20])
+            samples.append(time.perf_counter() - started)
+            request_finished.send(sender=None)
+    finally:
+        connections.close_all()
+    return samples
+
+
+def run(conn_max_age, concurrency, requests):
+    # Connections read CONN_MAX_AGE from this shared dict when they connect
+    connections.settings[DEFAULT_DB_ALIAS]['CONN_MAX_AGE'] = conn_max_age
+    connections.close_all()
+    counter = ConnectionCounter()
+    connection_created.connect(counter)
+    try:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(simulate_requests, [requests] * concurrency))
+        elapsed = time.perf_counter() - started
+    finally:
+        connection_created.disconnect(counter)
+
+    samples = [sample for result in results for sample in result]
+    report = summarize(samples, elapsed)
+    report['mean_ms'] = round(sum(samples) / len(samples) * 1000, 4)
+    report['connections_opened'] = counter.count
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Database connection overhead')
+    parser.add_argument('--concurrency', type=int, default=16, help='Concurrent request threads')
+    parser.add_argument('--requests', type=int, default=200, help='Requests per thread')
+    parser.add_argument('--conn-max-age', type=int, nargs='+', default=[0, 60])
+    parser.add_argument('--output', help='Also write the JSON report to this file')
+    args = parser.parse_args()
+
+    if not Product.objects.exists():
+        raise SystemExit('No data to benchmark; run generate_synthetic_data first')
+
+    results = {
+        f"conn_max_age={conn_max_age}": run(conn_max_age, args.concurrency, args.requests)
+        for conn_max_age in args.conn_max_age
+    }
+    write_report({
+        'benchmark': 'db_connections',
+        'environment': environment(),
+        'database': {'vendor': connection.vendor, 'host': connection.settings_dict.get('HOST')},
+        'parameters': vars(args),
+        'results': results,
+    }, args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,190 @@
+"""
+Macro-benchmarks for every API endpoint, run in-process through the full
+middleware stack.
+
+For each endpoint the report gives latency percentiles, database queries
+and memory allocations per request, plus the status codes seen. Endpoints
+that call Cryptomus or Telegram are listed as skipped; use
+``checkout_scenario`` against the simulator for those. Needs data from
+``generate_synthetic_data`` and a reachable Redis. The write endpoints
+really write (orders, users, revoked tokens), so run it against a
+disposable database.
+
+    python manage.py generate_synthetic_data --users 1000 --orders 5000
+    python -m benchmarks.endpoints --iterations 200 --output endpoints.json
+"""
+import argparse
+import itertools
+import json
+import os
+from collections import Counter
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.db.models import Count  # noqa: E402
+from django.test import Client  # noqa: E402
+
+from accounts.models import User  # noqa: E402
+from accounts.otp import get_otp_backend  # noqa: E402
+from accounts.tokens import RedisRefreshToken  # noqa: E402
+from accounts.verification import start_verification  # noqa: E402
+from core.services.cryptomus import sign_webhook_payload  # noqa: E402
+from orders.models import Payment  # noqa: E402
+from products.models import Category, Product  # noqa: E402
+from .utils import environment, measure, write_report  # noqa: E402
+
+SKIPPED = {
+    'POST /api/v1/accounts/update-telegram-id/': 'Sends a Telegram message',
+    'POST /api/v1/orders/{order_id}/create_payment/': 'Calls Cryptomus',
+    'POST /api/v1/orders/{order_id}/create_payment_async/': 'Calls Cryptomus',
+}
+
+
+def bearer(user) -> str:
+    return f"Bearer {RedisRefreshToken.for_user(user).access_token}"
+
+
+class EndpointBenchmark:
+    """
+    Build a request for every endpoint against the generated data and measure it.
+    """
+
+    def __init__(self):
+        self.client = Client()
+        self.counter = itertools.count()
+        self.user = User.objects.annotate(order_count=Count('orders')).order_by('-order_count').first()
+        if self.user is None or not Product.objects.filter(is_active=True, variants__isnull=False).exists():
+            raise SystemExit('No data to benchmark; run generate_synthetic_data first')
+
+        self.staff, _ = User.objects.get_or_create(phone_number='09980000000', defaults={'is_staff': True})
+        self.product = Product.objects.filter(is_active=True, variants__isnull=False).first()
+        self.variant = self.product.variants.first()
+        self.category = Category.objects.first()
+        self.order = self.user.orders.first()
+        self.payment = Payment.objects.filter(status=Payment.PaymentStatus.PENDING).first()
+        self.verification_id, _ = start_verification(self.user, '123456789')
+        self.auth = bearer(self.user)
+        self.staff_auth = bearer(self.staff)
+
+    def unique_client(self):
+        # Throttled endpoints see a different phone number and address every time
+        n = next(self.counter)
+        return f"0997{n:07d}", f"10.{n // 65536 % 256}.{n // 256 % 256}.{n % 256}"
+
+    def request_otp(self):
+        phone_number, address = self.unique_client()
+        return {'data': {'phone_number': phone_number}, 'REMOTE_ADDR': address}
+
+    def verify_otp(self):
+        phone_number, address = self.unique_client()
+        user, _ = User.objects.get_or_create(phone_number=phone_number)
+        code = get_otp_backend().issue(user)
+        return {'data': {'phone_number': phone_number, 'otp_code': code}, 'REMOTE_ADDR': address}
+
+    def refresh_token(self):
+        return {'data': {'refresh': str(RedisRefreshToken.for_user(self.user))}}
+
+    def logout_all(self):
+        # Revokes every token of a throwaway user, never the benchmark user's
+        user, _ = User.objects.get_or_create(phone_number='09980000001')
+        return {'HTTP_AUTHORIZATION': bearer(user)}
+
+    def webhook(self):
+        data = {
+            'uuid': str(self.payment.gateway_uuid),
+            'order_id': str(self.payment.order_id),
+            'status': 'process',
+        }
+        data['sign'] = sign_webhook_payload(data, settings.CRYPTOMUS_API_KEY)
+        return {'data': data}
+
+    def endpoints(self):
+        user, staff = {'HTTP_AUTHORIZATION': self.auth}, {'HTTP_AUTHORIZATION': self.staff_auth}
+        order_data = {
+            'telegram_id': '123456789',
+            'items': [{'product_id': str(self.product.id), 'variant_id': str(self.variant.id), 'quantity': '1'}],
+        }
+        return [
+            ('GET', '/api/v1/health/', {}),
+            ('GET', '/api/v1/health/live/', {}),
+            ('GET', '/api/v1/health/ready/', {}),
+            ('GET', '/metrics', {}),
+            ('GET', '/swagger.json/', {}),
+            ('POST', '/api/v1/accounts/request-otp/', self.request_otp),
+            ('POST', '/api/v1/accounts/verify-otp/', self.verify_otp),
+            ('GET', '/api/v1/accounts/profile/', user),
+            ('PATCH', '/api/v1/accounts/profile/', {'data': {'first_name': 'Bench'}, **user}),
+            ('GET', '/api/v1/accounts/telegram-verification/{verification_id}/', user),
+            ('POST', '/api/v1/token/refresh/', self.refresh_token),
+            ('POST', '/api/v1/accounts/logout/', self.refresh_token),
+            ('POST', '/api/v1/accounts/logout-all/', self.logout_all),
+            ('GET', '/api/v1/products/categories/', {}),
+            ('GET', '/api/v1/products/categories/{category_slug}/', {}),
+            ('GET', '/api/v1/products/', {}),
+            ('GET', '/api/v1/products/{product_slug}/', {}),
+            ('GET', '/api/v1/products/{product_slug}/variants/', {}),
+            ('GET', '/api/v1/orders/', user),
+            ('GET', '/api/v1/orders/{order_id}/', user),
+            ('POST', '/api/v1/orders/', {'data': order_data, **user}),
+            ('POST', '/api/v1/orders/webhook/', self.webhook),
+            ('POST', '/api/v1/profiles/token/', staff),
+            ('GET', '/api/v1/profiles/', staff),
+        ]
+
+    def path_params(self):
+        return {
+            'verification_id': self.verification_id,
+            'category_slug': self.category.slug,
+            'product_slug': self.product.slug,
+            'order_id': self.order.id,
+        }
+
+    def run_case(self, method, template, spec, iterations):
+        path = template.format(**self.path_params())
+        statuses = Counter()
+        send = getattr(self.client, method.lower())
+
+        def call(kwargs=None):
+            kwargs = dict(kwargs if kwargs is not None else spec)
+            data = kwargs.pop('data', None)
+            if data is not None and method != 'GET':
+                response = send(path, json.dumps(data), content_type='application/json', **kwargs)
+            else:
+                response = send(path, **kwargs)
+            statuses[response.status_code] += 1
+
+        report = measure(call, iterations, spec if callable(spec) else None)
+        report['status_codes'] = {str(code): count for code, count in sorted(statuses.items())}
+        return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='API endpoint macro-benchmarks')
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--only', help='Run only endpoints whose path contains this string')
+    parser.add_argument('--output', help='Also write the JSON report to this file')
+    args = parser.parse_args()
+
+    benchmark = EndpointBenchmark()
+    results = {}
+    # Results are keyed by route template so runs on different data compare
+    for method, template, spec in benchmark.endpoints():
+        if args.only and args.only not in template:
+            continue
+        results[f"{method} {template}"] = benchmark.run_case(method, template, spec, args.iterations)
+
+    write_report({
+        'benchmark': 'endpoints',
+        'environment': environment(),
+        'parameters': vars(args),
+        'results': results,
+        'skipped': SKIPPED,
+    }, args.output)
+
+
+if __name__ == '__main__':
+    main()
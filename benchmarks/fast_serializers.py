@@ -0,0 +1,117 @@
+"""
+Parity check and throughput comparison for the fast-path read serializers.
+
+For every page size, each fast serializer is fed the same rows as the
+serializer it replaces and the two rendered JSON documents must be
+byte-identical; any difference is printed and the script exits non-zero, so
+it can gate a change to either side. Throughput is measured the way the list
+views use them: the regular serializers on model instances loaded as the
+views load them, the fast ones on ``.values()`` rows, database time
+included. Needs data from ``generate_synthetic_data``.
+
+    python manage.py generate_synthetic_data --users 1000 --orders 5000
+    python -m benchmarks.fast_serializers --page-sizes 10 50 100 --output fast_serializers.json
+"""
+import argparse
+import difflib
+import json
+import os
+import sys
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup()
+
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+from orders.models import Order  # noqa: E402
+from orders.serializers import OrderSerializer, OrderFastSerializer  # noqa: E402
+from products.models import Product  # noqa: E402
+from products.serializers import (  # noqa: E402
+    ProductSerializer, ProductListSerializer, ProductFastSerializer, ProductListFastSerializer
+)
+from .utils import environment, measure, write_report  # noqa: E402
+
+
+def build_cases():
+    products = Product.objects.filter(is_active=True).order_by('name', 'id')
+    orders = Order.objects.order_by('-created_at', 'id')
+    return {
+        'products.ProductListSerializer': (products, ProductListSerializer, ProductListFastSerializer),
+        'products.ProductSerializer': (products, ProductSerializer, ProductFastSerializer),
+        'orders.OrderSerializer': (orders, OrderSerializer, OrderFastSerializer),
+    }
+
+
+def regular(queryset, serializer_class, context, page_size):
+    return lambda: serializer_class(queryset[:page_size], many=True, context=context).data
+
+
+def fast(queryset, serializer_class, context, page_size):
+    return lambda: serializer_class(context).serialize(queryset.values(*serializer_class.columns)[:page_size])
+
+
+def check_parity(name, expected, actual) -> bool:
+    renderer = JSONRenderer()
+    expected, actual = renderer.render(expected), renderer.render(actual)
+    if expected == actual:
+        return True
+    diff = difflib.unified_diff(
+        json.dumps(json.loads(expected), indent=2).splitlines(),
+        json.dumps(json.loads(actual), indent=2).splitlines(),
+        'regular', 'fast', lineterm='', n=2
+    )
+    print(f"{name}: output differs", file=sys.stderr)
+    print('\n'.join(list(diff)[:40]), file=sys.stderr)
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fast-path serializer parity and throughput')
+    parser.add_argument('--iterations', type=int, default=100)
+    parser.add_argument('--page-sizes', type=int, nargs='+', default=[10, 25, 50, 100])
+    parser.add_argument('--only', help='Run only cases whose name contains this string')
+    parser.add_argument('--output', help='Also write the JSON report to this file')
+    args = parser.parse_args()
+
+    context = {'request': APIRequestFactory().get('/')}
+    cases = build_cases()
+    if not cases['orders.OrderSerializer'][0].exists():
+        raise SystemExit('No data to benchmark; run generate_synthetic_data first')
+
+    results, mismatches = {}, []
+    for name, (queryset, regular_class, fast_class) in cases.items():
+        if args.only and args.only not in name:
+            continue
+        for page_size in args.page_sizes:
+            run_regular = regular(queryset, regular_class, context, page_size)
+            run_fast = fast(queryset, fast_class, context, page_size)
+            if not check_parity(f"{name} (page size {page_size})", run_regular(), run_fast()):
+                mismatches.append(f"{name}:{page_size}")
+                continue
+
+            before = measure(run_regular, args.iterations)
+            after = measure(run_fast, args.iterations)
+            results[f"{name}:{page_size}"] = {
+                'regular': before,
+                'fast': after,
+                'speedup': round(before['mean_ms'] / after['mean_ms'], 2) if after['mean_ms'] else None,
+                'regular_rows_per_s': round(page_size * 1000 / before['mean_ms']) if before['mean_ms'] else None,
+                'fast_rows_per_s': round(page_size * 1000 / after['mean_ms']) if after['mean_ms'] else None,
+            }
+
+    write_report({
+        'benchmark': 'fast_serializers',
+        'environment': environment(),
+        'parameters': vars(args),
+        'results': results,
+        'mismatches': mismatches,
+    }, args.output)
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
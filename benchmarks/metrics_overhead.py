@@ -0,0 +1,75 @@
+"""
+Measure the per-request cost of ``MetricsMiddleware``.
+
+Sends the same requests through the full middleware stack with and without
+the metrics middleware and reports the difference as a share of request
+latency. Point ``--path`` at a database-backed endpoint (with ``--token``
+for authenticated ones) to include the query wrapper's cost.
+
+    python -m benchmarks.metrics_overhead --requests 5000 --path /api/v1/products/
+"""
+import argparse
+import json
+import os
+import time
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.test import Client, override_settings  # noqa: E402
+
+from .utils import summarize  # noqa: E402
+
+BUDGET_PCT = 3.0
+METRICS_MIDDLEWARE = 'core.metrics.MetricsMiddleware'
+
+
+def run(path: str, count: int, headers):
+    # A new client loads the middleware stack currently configured
+    client = Client(**headers)
+    samples = []
+    started = time.perf_counter()
+    for _ in range(count):
+        call_started = time.perf_counter()
+        client.get(path)
+        samples.append(time.perf_counter() - call_started)
+    return samples, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Metrics middleware overhead')
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--path', default='/api/v1/health/live/')
+    parser.add_argument('--token', help='Bearer token for authenticated endpoints')
+    args = parser.parse_args()
+
+    headers = {'HTTP_AUTHORIZATION': f"Bearer {args.token}"} if args.token else {}
+    without = [m for m in settings.MIDDLEWARE if m != METRICS_MIDDLEWARE]
+
+    # Warm up both stacks, then interleave runs so drift affects both equally
+    results = {'with_metrics': [], 'without_metrics': []}
+    elapsed = {'with_metrics': 0.0, 'without_metrics': 0.0}
+    rounds = 5
+    for round_number in range(rounds + 1):
+        for name, middleware in (('with_metrics', [METRICS_MIDDLEWARE] + without),
+                                 ('without_metrics', without)):
+            with override_settings(MIDDLEWARE=middleware):
+                samples, took = run(args.path, args.requests // rounds, headers)
+            if round_number:
+                results[name].extend(samples)
+                elapsed[name] += took
+
+    report = {name: summarize(samples, elapsed[name]) for name, samples in results.items()}
+    mean = {name: sum(samples) / len(samples) for name, samples in results.items()}
+    overhead_ms = (mean['with_metrics'] - mean['without_metrics']) * 1000
+    report['overhead_ms'] = round(overhead_ms, 4)
+    report['overhead_pct'] = round(overhead_ms / (mean['without_metrics'] * 1000) * 100, 2)
+    report['within_budget'] = report['overhead_pct'] < BUDGET_PCT
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
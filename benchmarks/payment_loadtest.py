@@ -0,0 +1,123 @@
+"""
+Compare sync and async payment creation against a slow gateway.
+
+Start the simulator, then run the API twice against it: once under
+gunicorn sync workers and once under an ASGI server, e.g.
+
+    python -m benchmarks.simulator --latency 2
+    CRYPTOMUS_BASE_URL=http://127.0.0.1:9000/v1 gunicorn config.wsgi -w 4 -b :8000
+    CRYPTOMUS_BASE_URL=http://127.0.0.1:9000/v1 gunicorn config.asgi -w 4 -k uvicorn.workers.UvicornWorker -b :8001
+    python -m benchmarks.payment_loadtest --sync-url http://127.0.0.1:8000 --async-url http://127.0.0.1:8001
+
+While checkouts are in flight the catalog is probed as well, to show
+whether catalog requests queue behind them. The database needs at least
+one active product.
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+
+from .utils import summarize
+
+
+async def login(client: httpx.AsyncClient, phone_number: str) -> str:
+    response = await client.post('/api/v1/accounts/request-otp/', json={'phone_number': phone_number})
+    response.raise_for_status()
+    otp_code = response.json()['otp_code']
+
+    response = await client.post('/api/v1/accounts/verify-otp/', json={
+        'phone_number': phone_number,
+        'otp_code': otp_code,
+    })
+    response.raise_for_status()
+    return response.json()['access']
+
+
+async def create_order(client: httpx.AsyncClient, token: str) -> str:
+    response = await client.get('/api/v1/products/')
+    response.raise_for_status()
+    product_id = response.json()['results'][0]['id']
+
+    response = await client.post(
+        '/api/v1/orders/',
+        json={'telegram_id': '1000000', 'items': [{'product_id': product_id, 'quantity': '1'}]},
+        headers={'Authorization': f'Bearer {token}'}
+    )
+    response.raise_for_status()
+    return response.json()['id']
+
+
+async def run_checkouts(base_url: str, path: str, total: int, concurrency: int, phone_number: str):
+    limits = httpx.Limits(max_connections=concurrency + 10)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as client:
+        token = await login(client, phone_number)
+        order_id = await create_order(client, token)
+        url = path.format(order_id=order_id)
+        headers = {'Authorization': f'Bearer {token}'}
+
+        semaphore = asyncio.Semaphore(concurrency)
+        latencies, catalog_latencies = [], []
+        errors = 0
+        done = asyncio.Event()
+
+        async def checkout():
+            nonlocal errors
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    response = await client.post(url, json={'payment_method': 'crypto'}, headers=headers)
+                    response.raise_for_status()
+                    latencies.append(time.perf_counter() - started)
+                except httpx.HTTPError:
+                    errors += 1
+
+        async def probe_catalog():
+            while not done.is_set():
+                started = time.perf_counter()
+                try:
+                    (await client.get('/api/v1/products/')).raise_for_status()
+                    catalog_latencies.append(time.perf_counter() - started)
+                except httpx.HTTPError:
+                    pass
+                await asyncio.sleep(0.1)
+
+        probe = asyncio.create_task(probe_catalog())
+        started = time.perf_counter()
+        await asyncio.gather(*(checkout() for _ in range(total)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await probe
+
+    return {
+        'checkout': summarize(latencies, elapsed, errors),
+        'catalog_during_checkout': summarize(catalog_latencies, elapsed),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sync vs async payment creation load test')
+    parser.add_argument('--sync-url', default='http://127.0.0.1:8000')
+    parser.add_argument('--async-url', default='http://127.0.0.1:8001')
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=200)
+    parser.add_argument('--phone-number', default='09000000001')
+    args = parser.parse_args()
+
+    report = {
+        'sync': asyncio.run(run_checkouts(
+            args.sync_url, '/api/v1/orders/{order_id}/create_payment/',
+            args.requests, args.concurrency, args.phone_number
+        )),
+        'async': asyncio.run(run_checkouts(
+            args.async_url, '/api/v1/orders/{order_id}/create_payment_async/',
+            args.requests, args.concurrency, args.phone_number
+        )),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""
+Compatibility check and timings for the orjson renderer and parser.
+
+Every payload is rendered by DRF's JSONRenderer and by ORJSONRenderer and
+the bytes must match; every request body is parsed by JSONParser and by
+ORJSONParser and the results (or the error messages) must match. Any
+difference is printed and the script exits non-zero. The payloads are the
+serializer outputs of real pages plus values that need the fallback paths:
+Decimal, UUID, lazy translation strings, aware and naive datetimes, U+2028
+and integers too big for orjson. Needs data from ``generate_synthetic_data``.
+
+    python manage.py generate_synthetic_data --users 1000 --orders 5000
+    python -m benchmarks.renderers --iterations 500 --output renderers.json
+"""
+import argparse
+import datetime
+import io
+import os
+import sys
+import uuid
+from decimal import Decimal
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup()
+
+from django.utils import timezone  # noqa: E402
+from django.utils.translation import gettext_lazy as _  # noqa: E402
+from rest_framework.exceptions import ParseError  # noqa: E402
+from rest_framework.parsers import JSONParser  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+from core.parsers import ORJSONParser  # noqa: E402
+from core.renderers import ORJSONRenderer  # noqa: E402
+from orders.models import Order  # noqa: E402
+from orders.serializers import OrderSerializer  # noqa: E402
+from products.models import Product  # noqa: E402
+from products.serializers import ProductSerializer, ProductListSerializer  # noqa: E402
+from .utils import environment, measure, write_report  # noqa: E402
+
+
+def edge_cases():
+    now = timezone.now()
+    return {
+        'lazy_strings': {'message': _('OTP sent successfully'), 'detail': [_('Verification not found')]},
+        'datetimes': {
+            'utc': now,
+            'utc_whole_second': now.replace(microsecond=0),
+            'local': timezone.localtime(now),
+            'naive': datetime.datetime(2024, 1, 2, 3, 4, 5, 678901),
+            'date': now.date(),
+            'time': datetime.time(12, 30, 15, 250000),
+            'duration': datetime.timedelta(days=1, seconds=5),
+        },
+        'numbers': {'decimal': Decimal('12.50'), 'int': 2 ** 53, 'float': 0.1, 'negative': -3},
+        'uuids': [uuid.uuid4(), {'id': uuid.uuid4()}],
+        'strings': {'unicode': 'سلام دنیا ✓', 'separators': 'a b c', 'quotes': '"\\/\n\t'},
+        'containers': {'tuple': (1, 2), 'set': {3}, 'int_keys': {1: 'a', 2: 'b'}, 'empty': {}},
+        'big_int': {'value': 2 ** 70},
+    }
+
+
+def build_payloads(count):
+    context = {'request': APIRequestFactory().get('/')}
+    products = list(Product.objects.filter(is_active=True).select_related('category')
+                    .prefetch_related('variants')[:count])
+    orders = list(Order.objects.prefetch_related('items__product__category', 'items__product__variants',
+                                                 'items__variant', 'payments')[:count])
+    if not products or not orders:
+        raise SystemExit('No data to benchmark; run generate_synthetic_data first')
+    return {
+        'products.ProductListSerializer': ProductListSerializer(products, many=True, context=context).data,
+        'products.ProductSerializer': ProductSerializer(products, many=True, context=context).data,
+        'orders.OrderSerializer': OrderSerializer(orders, many=True, context=context).data,
+        **{f"edge.{name}": payload for name, payload in edge_cases().items()},
+    }
+
+
+REQUEST_BODIES = {
+    'order': (
+        b'{"telegram_id":"123456789","items":[{"product_id":"5f0c1c56-2f4b-4d8e-9d6a-3f0a1c2b3d4e",'
+        b'"quantity":"2"}]}'
+    ),
+    'unicode': '{"first_name":"علی","note":"a\\u2028b"}'.encode(),
+    'numbers': b'{"small":1,"float":1.5,"exp":1e3,"big":123456789012345678901234567890}',
+    'invalid': b'{"phone_number": ',
+    'nan': b'{"value": NaN}',
+    'empty': b'',
+}
+
+
+def parse(parser, body):
+    try:
+        return parser.parse(io.BytesIO(body), 'application/json', {})
+    except ParseError as e:
+        return f"ParseError: {e.detail}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='orjson renderer and parser compatibility and timings')
+    parser.add_argument('--iterations', type=int, default=500)
+    parser.add_argument('--objects', type=int, default=50, help='Objects per serializer payload (page size)')
+    parser.add_argument('--output', help='Also write the JSON report to this file')
+    args = parser.parse_args()
+
+    stock, fast = JSONRenderer(), ORJSONRenderer()
+    results, mismatches = {}, []
+    for name, payload in build_payloads(args.objects).items():
+        expected, actual = stock.render(payload), fast.render(payload)
+        if expected != actual:
+            mismatches.append(name)
+            print(f"{name}: rendered output differs\n  json:   {expected[:300]!r}\n  orjson: {actual[:300]!r}",
+                  file=sys.stderr)
+            continue
+        before = measure(lambda: stock.render(payload), args.iterations)
+        after = measure(lambda: fast.render(payload), args.iterations)
+        results[f"render.{name}"] = {
+            'bytes': len(expected),
+            'json_mean_ms': before['mean_ms'],
+            'orjson_mean_ms': after['mean_ms'],
+            'speedup': round(before['mean_ms'] / after['mean_ms'], 2) if after['mean_ms'] else None,
+        }
+
+    for name, body in REQUEST_BODIES.items():
+        expected, actual = parse(JSONParser(), body), parse(ORJSONParser(), body)
+        if expected != actual:
+            mismatches.append(f"parse.{name}")
+            print(f"parse.{name}: parsed data differs\n  json:   {expected!r}\n  orjson: {actual!r}",
+                  file=sys.stderr)
+
+    write_report({
+        'benchmark': 'renderers',
+        'environment': environment(),
+        'parameters': vars(args),
+        'results': results,
+        'mismatches': mismatches,
+    }, args.output)
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""
+Micro-benchmarks for every serializer in accounts, products and orders.
+
+Output serializers are timed on objects already loaded with their related
+rows, so the numbers show serializer cost alone. Input serializers are
+timed through ``is_valid()``, including the lookups they do. Needs data from
+``generate_synthetic_data`` and a reachable Redis for the token and OTP
+serializers.
+
+    python manage.py generate_synthetic_data --users 1000 --orders 5000
+    python -m benchmarks.serializers --iterations 200 --output serializers.json
+"""
+import argparse
+import os
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup()
+
+from django.db.models import Prefetch  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+from accounts.models import User  # noqa: E402
+from accounts.otp import get_otp_backend  # noqa: E402
+from accounts.serializers import (  # noqa: E402
+    UserSerializer, PhoneNumberSerializer, OTPVerificationSerializer, TelegramIDSerializer,
+    RedisTokenRefreshSerializer, LogoutSerializer
+)
+from accounts.tokens import RedisRefreshToken  # noqa: E402
+from orders.models import Order, OrderItem, Payment  # noqa: E402
+from orders.serializers import (  # noqa: E402
+    OrderItemSerializer, PaymentSerializer, OrderSerializer, OrderCreateSerializer
+)
+from products.models import Category, Product, ProductVariant  # noqa: E402
+from products.serializers import (  # noqa: E402
+    CategorySerializer, ProductVariantSerializer, ProductSerializer, ProductListSerializer
+)
+from .utils import environment, measure, write_report  # noqa: E402
+
+
+def serialize(serializer_class, instances, context):
+    return lambda: serializer_class(instances, many=True, context=context).data
+
+
+def validate(serializer_class, data=None, context=None):
+    def run(args=None):
+        serializer = serializer_class(data=args if data is None else data, context=context or {})
+        serializer.is_valid(raise_exception=True)
+    return run
+
+
+def build_cases(count):
+    request = APIRequestFactory().get('/')
+    context = {'request': request}
+
+    variants = Prefetch('variants', queryset=ProductVariant.objects.all())
+    products = list(
+        Product.objects.filter(is_active=True).select_related('category').prefetch_related(variants)[:count]
+    )
+    orders = list(
+        Order.objects.prefetch_related(
+            Prefetch('items', queryset=OrderItem.objects.select_related('product__category', 'variant')
+                     .prefetch_related('product__variants')),
+            'payments'
+        )[:count]
+    )
+    if not products or not orders:
+        raise SystemExit('No data to benchmark; run generate_synthetic_data first')
+
+    user = orders[0].user
+    request.user = user
+    items = [item for order in orders for item in order.items.all()][:count]
+    item_data = [
+        {'product_id': str(product.id), 'variant_id': str(product.variants.all()[0].id), 'quantity': '1'}
+        for product in products[:3] if product.variants.all()
+    ]
+
+    def issue_otp():
+        return {'phone_number': user.phone_number, 'otp_code': get_otp_backend().issue(user)}
+
+    def new_refresh_token():
+        return {'refresh': str(RedisRefreshToken.for_user(user))}
+
+    categories = list(Category.objects.all()[:count])
+    all_variants = list(ProductVariant.objects.all()[:count])
+    payments = list(Payment.objects.all()[:count])
+    users = list(User.objects.all()[:count])
+    order_data = {'telegram_id': '123456789', 'items': item_data}
+
+    return {
+        'products.CategorySerializer': (serialize(CategorySerializer, categories, context), None),
+        'products.ProductVariantSerializer': (serialize(ProductVariantSerializer, all_variants, context), None),
+        'products.ProductSerializer': (serialize(ProductSerializer, products, context), None),
+        'products.ProductListSerializer': (serialize(ProductListSerializer, products, context), None),
+        'orders.OrderItemSerializer': (serialize(OrderItemSerializer, items, context), None),
+        'orders.PaymentSerializer': (serialize(PaymentSerializer, payments, context), None),
+        'orders.OrderSerializer': (serialize(OrderSerializer, orders, context), None),
+        'orders.OrderCreateSerializer': (validate(OrderCreateSerializer, order_data, context), None),
+        'accounts.UserSerializer': (serialize(UserSerializer, users, context), None),
+        'accounts.PhoneNumberSerializer': (validate(PhoneNumberSerializer, {'phone_number': '09120000000'}), None),
+        'accounts.OTPVerificationSerializer': (validate(OTPVerificationSerializer), issue_otp),
+        'accounts.TelegramIDSerializer': (validate(TelegramIDSerializer, {'telegram_id': '123456789'}), None),
+        'accounts.RedisTokenRefreshSerializer': (validate(RedisTokenRefreshSerializer), new_refresh_token),
+        'accounts.LogoutSerializer': (validate(LogoutSerializer), new_refresh_token),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serializer micro-benchmarks')
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--objects', type=int, default=50, help='Objects per serializer call (page size)')
+    parser.add_argument('--only', help='Run only cases whose name contains this string')
+    parser.add_argument('--output', help='Also write the JSON report to this file')
+    args = parser.parse_args()
+
+    results = {}
+    for name, (func, setup) in build_cases(args.objects).items():
+        if args.only and args.only not in name:
+            continue
+        results[name] = measure(func, args.iterations, setup)
+
+    write_report({
+        'benchmark': 'serializers',
+        'environment': environment(),
+        'parameters': vars(args),
+        'results': results,
+    }, args.output)
+
+
+if __name__ == '__main__':
+    main()
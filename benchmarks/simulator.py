@@ -0,0 +1,210 @@
+"""
+Local simulator for the Cryptomus and Telegram Bot APIs.
+
+Cryptomus:
+    POST /v1/payment        create a payment, then deliver a signed webhook
+                            to ``url_callback`` after ``--callback-delay``
+    POST /v1/payment/info   current status of a payment by order id
+
+Telegram:
+    POST /bot<token>/sendMessage
+    POST /bot<token>/getMe
+
+Latency, jitter and error rates are configurable per service, e.g.
+
+    python -m benchmarks.simulator --port 9000 --latency 0.3 --error-rate 0.01 --callback-delay 2
+
+and point the API at it with
+
+    CRYPTOMUS_BASE_URL=http://127.0.0.1:9000/v1
+    TELEGRAM_API_URL=http://127.0.0.1:9000
+    CRYPTOMUS_API_KEY=<same value as --api-key>
+"""
+import argparse
+import asyncio
+import json
+import random
+import uuid
+
+import httpx
+
+from core.services.cryptomus import sign_webhook_payload
+
+
+class Simulator:
+    """
+    Minimal asyncio HTTP/1.1 server that answers like Cryptomus and Telegram.
+    """
+
+    def __init__(self, api_key='', latency=0.0, jitter=0.0, error_rate=0.0, callback_delay=1.0,
+                 callback_status='paid', telegram_latency=0.0, telegram_error_rate=0.0):
+        self.api_key = api_key
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.callback_delay = callback_delay
+        self.callback_status = callback_status
+        self.telegram_latency = telegram_latency
+        self.telegram_error_rate = telegram_error_rate
+        self.payments = {}
+        self.messages_sent = 0
+        self.http = None
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode().split(' ', 2)
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, value = line.decode().split(':', 1)
+                    headers[name.strip().lower()] = value.strip()
+
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+                payload = json.loads(body or b'{}')
+
+                status, data = await self.route(method, path.split('?', 1)[0], payload)
+
+                response = json.dumps(data).encode()
+                writer.write(
+                    f"HTTP/1.1 {status}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(response)}\r\n\r\n".encode() + response
+                )
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _delay(self, latency):
+        if latency or self.jitter:
+            await asyncio.sleep(max(0.0, latency + random.uniform(-self.jitter, self.jitter)))
+
+    async def route(self, method, path, payload):
+        if method != 'POST':
+            return '405 Method Not Allowed', {'ok': False}
+        if path.startswith('/bot'):
+            return await self.telegram(path.rsplit('/', 1)[-1], payload)
+        if path == '/v1/payment':
+            return await self.create_payment(payload)
+        if path == '/v1/payment/info':
+            return await self.payment_info(payload)
+        return '404 Not Found', {'state': 1, 'message': 'Not found'}
+
+    async def create_payment(self, payload):
+        await self._delay(self.latency)
+        if random.random() < self.error_rate:
+            return '500 Internal Server Error', {'state': 1, 'message': 'Simulated gateway error'}
+
+        payment = {
+            'uuid': str(uuid.uuid4()),
+            'order_id': payload.get('order_id'),
+            'amount': payload.get('amount'),
+            'currency': payload.get('currency'),
+            'payment_status': 'check',
+            'is_final': False,
+        }
+        payment['url'] = f"https://pay.example.test/{payment['uuid']}"
+        self.payments[payment['order_id']] = payment
+
+        if payload.get('url_callback'):
+            asyncio.create_task(self.deliver_webhook(payment, payload['url_callback']))
+        return '200 OK', {'state': 0, 'result': payment}
+
+    async def payment_info(self, payload):
+        await self._delay(self.latency)
+        if random.random() < self.error_rate:
+            return '500 Internal Server Error', {'state': 1, 'message': 'Simulated gateway error'}
+
+        payment = self.payments.get(payload.get('order_id'))
+        if payment is None:
+            return '404 Not Found', {'state': 1, 'message': 'Payment not found'}
+        return '200 OK', {'state': 0, 'result': payment}
+
+    async def deliver_webhook(self, payment, url_callback):
+        await asyncio.sleep(self.callback_delay)
+        payment.update(payment_status=self.callback_status, is_final=True, txid=uuid.uuid4().hex)
+
+        data = {
+            'type': 'payment',
+            'uuid': payment['uuid'],
+            'order_id': payment['order_id'],
+            'amount': payment['amount'],
+            'payment_amount': payment['amount'],
+            'currency': payment['currency'],
+            'status': payment['payment_status'],
+            'is_final': True,
+            'txid': payment['txid'],
+        }
+        data['sign'] = sign_webhook_payload(data, self.api_key)
+
+        if self.http is None:
+            self.http = httpx.AsyncClient(timeout=30)
+        try:
+            await self.http.post(url_callback, json=data)
+        except httpx.HTTPError:
+            pass
+
+    async def telegram(self, api_method, payload):
+        await self._delay(self.telegram_latency)
+        if random.random() < self.telegram_error_rate:
+            return '429 Too Many Requests', {
+                'ok': False,
+                'error_code': 429,
+                'description': 'Too Many Requests: retry after 1',
+                'parameters': {'retry_after': 1},
+            }
+
+        if api_method == 'getMe':
+            return '200 OK', {'ok': True, 'result': {'id': 1, 'is_bot': True, 'username': 'foxyhub_sim_bot'}}
+        if api_method == 'sendMessage':
+            self.messages_sent += 1
+            return '200 OK', {'ok': True, 'result': {
+                'message_id': self.messages_sent,
+                'chat': {'id': payload.get('chat_id')},
+                'text': payload.get('text'),
+            }}
+        return '404 Not Found', {'ok': False, 'error_code': 404, 'description': 'Not Found'}
+
+    async def serve(self, host: str, port: int):
+        server = await asyncio.start_server(self.handle, host, port, backlog=4096)
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Cryptomus and Telegram API simulator')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9000)
+    parser.add_argument('--api-key', default='', help='must match CRYPTOMUS_API_KEY to sign webhooks')
+    parser.add_argument('--latency', type=float, default=0.0, help='gateway response delay in seconds')
+    parser.add_argument('--jitter', type=float, default=0.0, help='+/- random jitter in seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of gateway calls that fail')
+    parser.add_argument('--callback-delay', type=float, default=1.0, help='seconds until the webhook')
+    parser.add_argument('--callback-status', default='paid')
+    parser.add_argument('--telegram-latency', type=float, default=0.0)
+    parser.add_argument('--telegram-error-rate', type=float, default=0.0, help='fraction of 429 responses')
+    args = parser.parse_args()
+
+    simulator = Simulator(
+        api_key=args.api_key,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        callback_delay=args.callback_delay,
+        callback_status=args.callback_status,
+        telegram_latency=args.telegram_latency,
+        telegram_error_rate=args.telegram_error_rate,
+    )
+    asyncio.run(simulator.serve(args.host, args.port))
+
+
+if __name__ == '__main__':
+    main()
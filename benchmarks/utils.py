@@ -0,0 +1,108 @@
+import json
+import math
+import platform
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of ``samples``.
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(samples: List[float], elapsed: float, errors: int = 0) -> Dict[str, float]:
+    """
+    Summarize latency samples (seconds) collected over ``elapsed`` seconds.
+    """
+    return {
+        'count': len(samples),
+        'errors': errors,
+        'throughput_rps': round(len(samples) / elapsed, 2) if elapsed else 0.0,
+        'p50_ms': round(percentile(samples, 50) * 1000, 2),
+        'p95_ms': round(percentile(samples, 95) * 1000, 2),
+        'p99_ms': round(percentile(samples, 99) * 1000, 2),
+    }
+
+
+def measure(func: Callable[..., Any], iterations: int, setup: Callable[[], Any] = None) -> Dict[str, Any]:
+    """
+    Time ``func`` and report latency, database queries and memory allocations.
+
+    ``setup`` runs untimed before every call and its result is passed to
+    ``func``. Queries and allocations are taken from one extra call, so the
+    tracing does not distort the timings.
+    """
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    def call():
+        if setup is None:
+            return func
+        args = setup()
+        return lambda: func(args)
+
+    call()()  # warm up caches and lazy imports
+    samples = []
+    for _ in range(iterations):
+        run = call()
+        started = time.perf_counter()
+        run()
+        samples.append(time.perf_counter() - started)
+
+    run = call()
+    tracemalloc.start()
+    with CaptureQueriesContext(connection) as queries:
+        run()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Throughput counts only the measured calls, not the untimed setup
+    report = summarize(samples, sum(samples))
+    report['mean_ms'] = round(sum(samples) / len(samples) * 1000, 4) if samples else 0.0
+    report['queries'] = len(queries)
+    report['alloc_peak_kb'] = round(peak / 1024, 1)
+    report['alloc_retained_kb'] = round(current / 1024, 1)
+    return report
+
+
+def environment() -> Dict[str, Any]:
+    """
+    Describe the code and environment a benchmark ran against.
+    """
+    import django
+    from django.db import connection
+
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'commit': commit,
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+        'host': platform.node(),
+    }
+
+
+def write_report(report: Dict[str, Any], output: str = None):
+    """
+    Print the report as JSON and, with ``output``, also save it for later comparison.
+    """
+    data = json.dumps(report, indent=2, default=str)
+    print(data)
+    if output:
+        with open(output, 'w') as f:
+            f.write(data)
@@ -0,0 +1,158 @@
+"""
+Insert throughput and primary key index size for uuid4 and UUIDv7 keys.
+
+For each generator a scratch table shaped like our high-insert tables
+(UUID primary key, creation time, a short payload) is filled in batches,
+the way orders and OTPs accumulate. The report gives insert throughput
+over the whole run and over its first and last tenth (random keys slow
+down once the index outgrows memory), the final size of the primary key
+index, and how often reading rows in key order goes back in time. Run it
+against the real Postgres host with tens of millions of rows; SQLite works
+for a quick check but only reports index sizes when built with dbstat.
+
+    python -m benchmarks.uuid_keys --rows 20000000 --output uuid_keys.json
+"""
+import argparse
+import os
+import time
+import uuid
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup()
+
+from django.db import DatabaseError, connection, models  # noqa: E402
+
+from core.ids import uuid7  # noqa: E402
+from .utils import environment, summarize, write_report  # noqa: E402
+
+GENERATORS = {
+    'uuid4': uuid.uuid4,
+    'uuid7': uuid7,
+}
+COLUMNS = ('id', 'created_ns', 'payload')
+
+
+def create_table(table):
+    quote = connection.ops.quote_name
+    drop_table(table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TABLE {quote(table)} ({quote('id')} {models.UUIDField().db_type(connection)} PRIMARY KEY, "
+            f"{quote('created_ns')} bigint NOT NULL, {quote('payload')} varchar(64) NOT NULL)"
+        )
+
+
+def drop_table(table):
+    with connection.cursor() as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {connection.ops.quote_name(table)}")
+
+
+def insert_rows(table, generate, rows, batch_size):
+    field = models.UUIDField()
+    quote = connection.ops.quote_name
+    placeholders = f"({', '.join(['%s'] * len(COLUMNS))})"
+    prefix = f"INSERT INTO {quote(table)} ({', '.join(map(quote, COLUMNS))}) VALUES "
+
+    samples = []
+    with connection.cursor() as cursor:
+        for start in range(0, rows, batch_size):
+            count = min(batch_size, rows - start)
+            params = []
+            for i in range(count):
+                params += [field.get_db_prep_value(generate(), connection), time.time_ns(), f"row {start + i}"]
+            started = time.perf_counter()
+            cursor.execute(prefix + ', '.join([placeholders] * count), params)
+            samples.append((count, time.perf_counter() - started))
+    return samples
+
+
+def index_size(table):
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(
+                "SELECT pg_relation_size(indexrelid) FROM pg_index WHERE indrelid = %s::regclass AND indisprimary",
+                [table]
+            )
+        elif connection.vendor == 'sqlite':
+            try:
+                cursor.execute(
+                    "SELECT SUM(pgsize) FROM dbstat WHERE name IN "
+                    "(SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = %s)",
+                    [table]
+                )
+            except DatabaseError:
+                return None
+        else:
+            return None
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def time_inversions(table):
+    """
+    Count rows whose creation time is earlier than the row before them in key order.
+    """
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT SUM(CASE WHEN created_ns < previous THEN 1 ELSE 0 END) FROM ("
+            f"SELECT {quote('created_ns')}, LAG({quote('created_ns')}) OVER (ORDER BY {quote('id')}) AS previous "
+            f"FROM {quote(table)}) AS ordered"
+        )
+        return cursor.fetchone()[0] or 0
+
+
+def rows_per_second(samples):
+    rows = sum(count for count, _ in samples)
+    elapsed = sum(seconds for _, seconds in samples)
+    return round(rows / elapsed) if elapsed else None
+
+
+def run(name, rows, batch_size, keep):
+    table = f"bench_{name}_keys"
+    create_table(table)
+    try:
+        samples = insert_rows(table, GENERATORS[name], rows, batch_size)
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(f"ANALYZE {connection.ops.quote_name(table)}")
+        tenth = max(1, len(samples) // 10)
+        report = summarize([seconds for _, seconds in samples], sum(seconds for _, seconds in samples))
+        report.update({
+            'rows': rows,
+            'rows_per_s': rows_per_second(samples),
+            'rows_per_s_first_10pct': rows_per_second(samples[:tenth]),
+            'rows_per_s_last_10pct': rows_per_second(samples[-tenth:]),
+            'pk_index_bytes': index_size(table),
+            'key_order_time_inversions': time_inversions(table),
+        })
+        return report
+    finally:
+        if not keep:
+            drop_table(table)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='uuid4 and UUIDv7 primary key insert benchmark')
+    parser.add_argument('--rows', type=int, default=20_000_000, help='Rows inserted per generator')
+    parser.add_argument('--batch-size', type=int, default=1000, help='Rows per INSERT statement')
+    parser.add_argument('--generators', nargs='+', choices=sorted(GENERATORS), default=sorted(GENERATORS))
+    parser.add_argument('--keep', action='store_true', help='Keep the scratch tables for inspection')
+    parser.add_argument('--output', help='Also write the JSON report to this file')
+    args = parser.parse_args()
+
+    batch_size = min(args.batch_size, connection.ops.bulk_batch_size(COLUMNS, range(args.batch_size)))
+    results = {name: run(name, args.rows, batch_size, args.keep) for name in args.generators}
+    write_report({
+        'benchmark': 'uuid_keys',
+        'environment': environment(),
+        'database': {'vendor': connection.vendor, 'host': connection.settings_dict.get('HOST')},
+        'parameters': {**vars(args), 'batch_size': batch_size},
+        'results': results,
+    }, args.output)
+
+
+if __name__ == '__main__':
+    main()
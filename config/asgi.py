@@ -7,6 +7,8 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+# Async views only pay off, and only keep their connection pools, on an event loop that outlives requests
+os.environ.setdefault('ASYNC_VIEWS_ENABLED', 'True')
 
 application = get_asgi_application()
 
@@ -2,6 +2,8 @@ import os
 from datetime import timedelta
 from pathlib import Path
 
+from kombu import Queue
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -20,6 +22,7 @@ INSTALLED_APPS = [
     'django.contrib.contenttypes',
     'django.contrib.sessions',
     'django.contrib.messages',
+    'whitenoise.runserver_nostatic',
     'django.contrib.staticfiles',
     
     # Third party apps
@@ -37,7 +40,12 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.metrics.MetricsMiddleware',
+    'core.profiling.ProfilingMiddleware',
+    'core.db.ReplicaPinningMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'core.compression.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -76,9 +84,40 @@ DATABASES = {
         'PASSWORD': os.environ.get('DB_PASSWORD', 'postgres'),
         'HOST': os.environ.get('DB_HOST', 'localhost'),
         'PORT': os.environ.get('DB_PORT', '5432'),
+        # Seconds a connection is reused across requests (and Celery tasks); 0 closes it after each one
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+        # Check a reused connection before the first query of each request so a dropped one is replaced
+        'CONN_HEALTH_CHECKS': os.environ.get('DB_CONN_HEALTH_CHECKS', 'True') == 'True',
+        # PgBouncer in transaction mode cannot keep server-side cursors (iterator()) across transactions
+        'DISABLE_SERVER_SIDE_CURSORS': os.environ.get('DB_PGBOUNCER', 'False') == 'True',
+        'OPTIONS': {
+            'connect_timeout': int(os.environ.get('DB_CONNECT_TIMEOUT', 5)),
+        },
     }
 }
 
+# Read replicas, e.g. DB_REPLICA_HOSTS=replica-a:5432,replica-b:5432 and DB_REPLICA_WEIGHTS=3,1;
+# they share the primary's name and credentials. core.db.ReplicaRouter decides what reads from them.
+DATABASE_REPLICAS = {}
+_replica_hosts = [host for host in os.environ.get('DB_REPLICA_HOSTS', '').split(',') if host]
+_replica_weights = [int(weight) for weight in os.environ.get('DB_REPLICA_WEIGHTS', '').split(',') if weight]
+for _index, _host in enumerate(_replica_hosts, start=1):
+    _hostname, _, _port = _host.partition(':')
+    DATABASES[f'replica{_index}'] = {
+        **DATABASES['default'],
+        'HOST': _hostname,
+        'PORT': _port or DATABASES['default']['PORT'],
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS[f'replica{_index}'] = _replica_weights[_index - 1] if len(_replica_weights) >= _index else 1
+DATABASE_ROUTERS = ['core.db.ReplicaRouter']
+# Apps whose reads go to the replicas; anything else can opt in with core.db.using_replica()
+DATABASE_REPLICA_APPS = ['products']
+DATABASE_REPLICA_CHECK_INTERVAL = int(os.environ.get('DB_REPLICA_CHECK_INTERVAL', 10))
+# Clients read from the primary for this long after a request of theirs wrote
+DATABASE_REPLICA_PIN_SECONDS = int(os.environ.get('DB_REPLICA_PIN_SECONDS', 15))
+DATABASE_REPLICA_PIN_COOKIE = 'db_primary'
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -111,27 +150,68 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# collectstatic writes hashed names plus .br/.gz copies that WhiteNoise serves
+# with far-future caching; uploads get the same treatment from HashedMediaStorage
+STORAGES = {
+    'default': {
+        'BACKEND': 'core.storage.HashedMediaStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage',
+    },
+}
+WHITENOISE_MAX_AGE = 0 if DEBUG else 3600  # unhashed names only; hashed ones are always immutable
+
+# Serve MEDIA_URL from Django; turn off when nginx or a CDN serves MEDIA_ROOT
+SERVE_MEDIA = os.environ.get('SERVE_MEDIA', 'True') == 'True'
+
+# API responses smaller than this (bytes) are not worth compressing
+COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', 1024))
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
+    # Proxies in front of the app that append to X-Forwarded-For; throttles take the client IP
+    # from that many hops back. 0 ignores the header, which clients can set to anything.
+    'NUM_PROXIES': int(os.environ.get('NUM_PROXIES', 0)),
+    # Token-bucket rates for core.throttling, keyed '<scope>_<identity>'
+    'DEFAULT_THROTTLE_RATES': {
+        'otp_request_phone': os.environ.get('THROTTLE_OTP_REQUEST_PHONE', '3/min'),
+        'otp_request_ip': os.environ.get('THROTTLE_OTP_REQUEST_IP', '20/min'),
+        'otp_request_subnet': os.environ.get('THROTTLE_OTP_REQUEST_SUBNET', '100/min'),
+        'otp_verify_phone': os.environ.get('THROTTLE_OTP_VERIFY_PHONE', '10/min'),
+        'otp_verify_ip': os.environ.get('THROTTLE_OTP_VERIFY_IP', '30/min'),
+        'otp_verify_subnet': os.environ.get('THROTTLE_OTP_VERIFY_SUBNET', '150/min'),
+    },
 }
 
 # JWT settings
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
-    'ROTATE_REFRESH_TOKENS': False,
+    # Rotation and revocation are backed by Redis (accounts.tokens), not token_blacklist
+    'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
+    'TOKEN_REFRESH_SERIALIZER': 'accounts.serializers.RedisTokenRefreshSerializer',
     'UPDATE_LAST_LOGIN': False,
     'ALGORITHM': 'HS256',
     'SIGNING_KEY': SECRET_KEY,
@@ -150,6 +230,28 @@ SIMPLE_JWT = {
     'SLIDING_TOKEN_REFRESH_LIFETIME': timedelta(days=1),
 }
 
+# Authenticated user cache (accounts.authentication.CachedJWTAuthentication)
+AUTH_USER_CACHE_TTL = int(os.environ.get('AUTH_USER_CACHE_TTL', 300))
+AUTH_USER_LOCAL_CACHE_SIZE = int(os.environ.get('AUTH_USER_LOCAL_CACHE_SIZE', 10000))
+AUTH_USER_LOCAL_CACHE_TTL = int(os.environ.get('AUTH_USER_LOCAL_CACHE_TTL', 60))
+
+# Catalog cache (products.cache); other processes see an invalidation after at most the local TTL
+CATALOG_CACHE_TTL = int(os.environ.get('CATALOG_CACHE_TTL', 300))
+CATALOG_LOCAL_CACHE_SIZE = int(os.environ.get('CATALOG_LOCAL_CACHE_SIZE', 100))
+CATALOG_LOCAL_CACHE_TTL = int(os.environ.get('CATALOG_LOCAL_CACHE_TTL', 5))
+
+# API schema settings
+# Built by `manage.py build_openapi_schema` and served from memory by core.views.schema_document_view;
+# CODE_VERSION (e.g. the git commit) stamps it, defaulting to a fingerprint of the sources
+CODE_VERSION = os.environ.get('CODE_VERSION', '')
+OPENAPI_SCHEMA_DIR = os.environ.get('OPENAPI_SCHEMA_DIR', BASE_DIR / 'openapi')
+SWAGGER_SETTINGS = {
+    'SPEC_URL': ('schema-json', {'format': '.json'}),
+}
+REDOC_SETTINGS = {
+    'SPEC_URL': ('schema-json', {'format': '.json'}),
+}
+
 # CORS settings
 CORS_ALLOW_ALL_ORIGINS = DEBUG
 CORS_ALLOWED_ORIGINS = [
@@ -157,21 +259,171 @@ CORS_ALLOWED_ORIGINS = [
     "http://127.0.0.1:3000",
 ]
 
+# Redis settings
+REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+
+# Cache settings
+# Shared by every app through core.cache; connections are pooled per process.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('CACHE_URL', REDIS_URL),
+        'KEY_PREFIX': 'foxyhub',
+        'TIMEOUT': int(os.environ.get('CACHE_DEFAULT_TIMEOUT', 300)),
+        'OPTIONS': {
+            'max_connections': int(os.environ.get('CACHE_MAX_CONNECTIONS', 50)),
+            'socket_connect_timeout': 1,
+            'socket_timeout': 1,
+            'retry_on_timeout': True,
+        },
+    }
+}
+
+# Metrics settings
+# /metrics requires 'Authorization: Bearer <token>'; without a token it is served only when DEBUG
+METRICS_AUTH_TOKEN = os.environ.get('METRICS_AUTH_TOKEN', '')
+
+# Profiling settings
+# Requests are profiled when they carry a token from profiles/token/ or are sampled.
+PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', 'True') == 'True'
+PROFILING_ENGINE = os.environ.get('PROFILING_ENGINE', 'cprofile')  # 'cprofile' or 'pyinstrument'
+PROFILING_SAMPLE_RATE = float(os.environ.get('PROFILING_SAMPLE_RATE', 0))
+PROFILING_TOKEN_MAX_AGE = int(os.environ.get('PROFILING_TOKEN_MAX_AGE', 3600))
+PROFILING_RESULT_TTL = int(os.environ.get('PROFILING_RESULT_TTL', 86400))
+PROFILING_SLOW_QUERY_MS = float(os.environ.get('PROFILING_SLOW_QUERY_MS', 200))  # 0 disables the slow-query log
+
+# Health check settings
+HEALTH_CHECK_INTERVAL = float(os.environ.get('HEALTH_CHECK_INTERVAL', 5))
+HEALTH_CHECK_QUEUES = os.environ.get(
+    'HEALTH_CHECK_QUEUES', 'auth,payments,fulfillment,notifications,outbox,maintenance'
+).split(',')
+HEALTH_MAX_QUEUE_DEPTH = int(os.environ.get('HEALTH_MAX_QUEUE_DEPTH', 0))  # 0 disables the limit
+
 # Celery settings
-CELERY_BROKER_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
-CELERY_RESULT_BACKEND = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+CELERY_BROKER_URL = REDIS_URL
+CELERY_RESULT_BACKEND = REDIS_URL
 CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
+# Results are only stored for tasks that ask for them, and not kept for long
+CELERY_TASK_IGNORE_RESULT = True
+CELERY_RESULT_EXPIRES = 60 * 60
+# One queue per subsystem so a backlog in one cannot delay another; each has its own workers
+# (see docker-compose.yml). Unrouted tasks go to maintenance.
+CELERY_TASK_QUEUES = [
+    Queue(name) for name in ('auth', 'payments', 'fulfillment', 'notifications', 'outbox', 'maintenance')
+]
+CELERY_TASK_DEFAULT_QUEUE = 'maintenance'
+# Priorities within a queue (core.tasks.PRIORITY_*): on Redis 0 is served first
+CELERY_TASK_DEFAULT_PRIORITY = 5
+CELERY_TASK_ROUTES = {
+    'accounts.tasks.verify_telegram_id': {'queue': 'auth', 'priority': 0},
+    'orders.tasks.reconcile_pending_payments': {'queue': 'payments'},
+    'orders.tasks.fulfill_*': {'queue': 'fulfillment'},
+    'orders.tasks.notify_*': {'queue': 'notifications'},
+    'core.tasks.drain_telegram_queue': {'queue': 'notifications'},
+    'core.tasks.relay_outbox': {'queue': 'outbox'},
+    'orders.tasks.record_order_analytics': {'queue': 'maintenance', 'priority': 9},
+    'core.tasks.purge_outbox': {'queue': 'maintenance', 'priority': 9},
+    'accounts.tasks.flush_otp_audit': {'queue': 'maintenance', 'priority': 9},
+}
+CELERY_BROKER_TRANSPORT_OPTIONS = {
+    'priority_steps': list(range(10)),
+    'sep': ':',
+    # Late-acked tasks are redelivered if not acked within this time, so keep it above the longest task
+    'visibility_timeout': int(os.environ.get('CELERY_VISIBILITY_TIMEOUT', 60 * 60)),
+}
+# Workers take one task at a time unless their queue's command line says otherwise
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+CELERY_BEAT_SCHEDULE = {
+    'reconcile-pending-payments': {
+        'task': 'orders.tasks.reconcile_pending_payments',
+        'schedule': int(os.environ.get('PAYMENT_RECONCILE_INTERVAL_SECONDS', 60)),
+    },
+    'flush-otp-audit': {
+        'task': 'accounts.tasks.flush_otp_audit',
+        'schedule': 30,
+    },
+    'drain-telegram-queue': {
+        'task': 'core.tasks.drain_telegram_queue',
+        'schedule': int(os.environ.get('TELEGRAM_DISPATCH_DRAIN_SECONDS', 5)),
+    },
+    'relay-outbox': {
+        'task': 'core.tasks.relay_outbox',
+        'schedule': int(os.environ.get('OUTBOX_RELAY_INTERVAL_SECONDS', 5)),
+    },
+    'purge-outbox': {
+        'task': 'core.tasks.purge_outbox',
+        'schedule': 60 * 60,
+    },
+}
+
+# Transactional outbox (core.outbox): consumer tasks of each event topic
+OUTBOX_CONSUMERS = {
+    'order.created': ['orders.tasks.record_order_analytics'],
+    'order.status_changed': [
+        'orders.tasks.fulfill_order', 'orders.tasks.notify_order_status', 'orders.tasks.record_order_analytics'
+    ],
+    'payment.status_changed': ['orders.tasks.record_order_analytics'],
+}
+# Queue the relay as soon as a transaction with events commits, not only on its periodic run
+OUTBOX_RELAY_ON_COMMIT = os.environ.get('OUTBOX_RELAY_ON_COMMIT', 'True') == 'True'
+OUTBOX_RELAY_BATCH_SIZE = int(os.environ.get('OUTBOX_RELAY_BATCH_SIZE', 500))
+OUTBOX_RELAY_MAX_PER_RUN = int(os.environ.get('OUTBOX_RELAY_MAX_PER_RUN', 50000))
+# Events that fail to relay this many times stay unpublished and are no longer tried
+OUTBOX_RELAY_MAX_ATTEMPTS = int(os.environ.get('OUTBOX_RELAY_MAX_ATTEMPTS', 10))
+# A consumer's claim on an event expires after this long, in case its worker died
+OUTBOX_CLAIM_TIMEOUT = int(os.environ.get('OUTBOX_CLAIM_TIMEOUT', 5 * 60))
+OUTBOX_DEDUP_TTL = int(os.environ.get('OUTBOX_DEDUP_TTL', 7 * 24 * 60 * 60))
+OUTBOX_CONSUMER_MAX_RETRIES = int(os.environ.get('OUTBOX_CONSUMER_MAX_RETRIES', 8))
+OUTBOX_RETENTION_SECONDS = int(os.environ.get('OUTBOX_RETENTION_SECONDS', 7 * 24 * 60 * 60))
 
 # OTP settings
 OTP_EXPIRY_MINUTES = int(os.environ.get('OTP_EXPIRY_MINUTES', 5))
+OTP_BACKEND = os.environ.get('OTP_BACKEND', 'accounts.otp.RedisOTPBackend')
+OTP_MAX_ATTEMPTS = int(os.environ.get('OTP_MAX_ATTEMPTS', 5))
+# Record issued/used OTPs (without codes) in the OTP table, written in batches
+OTP_AUDIT_ENABLED = os.environ.get('OTP_AUDIT_ENABLED', 'True') == 'True'
+OTP_AUDIT_BATCH_SIZE = int(os.environ.get('OTP_AUDIT_BATCH_SIZE', 1000))
 
 # Cryptomus settings
+CRYPTOMUS_BASE_URL = os.environ.get('CRYPTOMUS_BASE_URL', 'https://api.cryptomus.com/v1')
 CRYPTOMUS_API_KEY = os.environ.get('CRYPTOMUS_API_KEY', '')
 CRYPTOMUS_MERCHANT_ID = os.environ.get('CRYPTOMUS_MERCHANT_ID', '')
+CRYPTOMUS_ASYNC_MAX_CONNECTIONS = int(os.environ.get('CRYPTOMUS_ASYNC_MAX_CONNECTIONS', 200))
+# Mount the async views (e.g. create_payment_async); config.asgi turns this on
+ASYNC_VIEWS_ENABLED = os.environ.get('ASYNC_VIEWS_ENABLED', 'False') == 'True'
+
+# Payment reconciliation settings
+PAYMENT_RECONCILE_PAGE_SIZE = int(os.environ.get('PAYMENT_RECONCILE_PAGE_SIZE', 500))
+PAYMENT_RECONCILE_MAX_PER_RUN = int(os.environ.get('PAYMENT_RECONCILE_MAX_PER_RUN', 50000))
+PAYMENT_RECONCILE_CONCURRENCY = int(os.environ.get('PAYMENT_RECONCILE_CONCURRENCY', 16))
+PAYMENT_RECONCILE_RATE_LIMIT = float(os.environ.get('PAYMENT_RECONCILE_RATE_LIMIT', 20))  # requests per second
+# Wall-time cap of one run; the next run picks up the rest. It stays below the broker's
+# visibility timeout so a late-acked run is not redelivered while it is still going.
+PAYMENT_RECONCILE_MAX_SECONDS = min(
+    int(os.environ.get('PAYMENT_RECONCILE_MAX_SECONDS', 15 * 60)),
+    CELERY_BROKER_TRANSPORT_OPTIONS['visibility_timeout'] - 5 * 60
+)
+# (payment age in seconds, polling interval in seconds); older payments stop being polled
+PAYMENT_RECONCILE_BACKOFF = [
+    (15 * 60, 60),
+    (60 * 60, 5 * 60),
+    (24 * 60 * 60, 30 * 60),
+    (7 * 24 * 60 * 60, 6 * 60 * 60),
+]
 
 # Telegram settings
+TELEGRAM_API_URL = os.environ.get('TELEGRAM_API_URL', 'https://api.telegram.org')
 TELEGRAM_BOT_TOKEN = os.environ.get('TELEGRAM_BOT_TOKEN', '')
+TELEGRAM_VERIFICATION_TTL = int(os.environ.get('TELEGRAM_VERIFICATION_TTL', 60 * 60))
+# Repeated verification requests for the same ID within this window are coalesced
+TELEGRAM_VERIFICATION_COALESCE_SECONDS = int(os.environ.get('TELEGRAM_VERIFICATION_COALESCE_SECONDS', 60))
+# Bot API limits enforced by core.services.telegram.TelegramDispatchQueue
+TELEGRAM_GLOBAL_RATE_LIMIT = float(os.environ.get('TELEGRAM_GLOBAL_RATE_LIMIT', 30))  # messages per second
+TELEGRAM_CHAT_INTERVAL_MS = int(os.environ.get('TELEGRAM_CHAT_INTERVAL_MS', 1000))
+TELEGRAM_DISPATCH_BATCH_SIZE = int(os.environ.get('TELEGRAM_DISPATCH_BATCH_SIZE', 100))
+TELEGRAM_DISPATCH_DRAIN_SECONDS = int(os.environ.get('TELEGRAM_DISPATCH_DRAIN_SECONDS', 5))
+TELEGRAM_DISPATCH_MAX_ATTEMPTS = int(os.environ.get('TELEGRAM_DISPATCH_MAX_ATTEMPTS', 5))
 
@@ -0,0 +1,25 @@
+"""
+Settings for the test suite; runs without Postgres or Redis.
+
+    python -m django test --settings=config.test_settings
+"""
+from .settings import *  # noqa: F401,F403
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    }
+}
+DATABASE_REPLICAS = {}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+PROFILING_ENABLED = False
+OUTBOX_RELAY_ON_COMMIT = False
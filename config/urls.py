@@ -1,37 +1,37 @@
+import re
+
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.conf import settings
-from django.conf.urls.static import static
 from rest_framework import permissions
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
+from drf_yasg.views import get_schema_view, UI_RENDERERS
+
+from core.schema import API_INFO
+from core.views import media_view, metrics_view, schema_document_view
 
 schema_view = get_schema_view(
-   openapi.Info(
-      title="FoxyHub API",
-      default_version='v1',
-      description="API documentation for FoxyHub",
-      terms_of_service="https://www.foxyhub.com/terms/",
-      contact=openapi.Contact(email="contact@foxyhub.com"),
-      license=openapi.License(name="BSD License"),
-   ),
+   API_INFO,
    public=True,
    permission_classes=(permissions.AllowAny,),
 )
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('metrics', metrics_view, name='metrics'),
     path('api/v1/', include('core.urls')),
     path('api/v1/accounts/', include('accounts.urls')),
     path('api/v1/products/', include('products.urls')),
     path('api/v1/orders/', include('orders.urls')),
     
-    # Swagger documentation
-    path('swagger<format>/', schema_view.without_ui(cache_timeout=0), name='schema-json'),
-    path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
-    path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
+    # Swagger documentation; the UIs load the precomputed schema from schema-json
+    # (SPEC_URL), so their own views only render the page and never introspect
+    path('swagger<format>/', schema_document_view, name='schema-json'),
+    path('swagger/', schema_view.as_view(renderer_classes=UI_RENDERERS['swagger']), name='schema-swagger-ui'),
+    path('redoc/', schema_view.as_view(renderer_classes=UI_RENDERERS['redoc']), name='schema-redoc'),
 ]
 
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+if settings.SERVE_MEDIA:
+    urlpatterns += [
+        re_path(r'^%s(?P<path>.*)$' % re.escape(settings.MEDIA_URL.lstrip('/')), media_view, name='media'),
+    ]
 
@@ -4,4 +4,9 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+    
+    def ready(self):
+        from . import db, metrics
+        metrics.connect_celery_signals()
+        db.connect_celery_signals()
 
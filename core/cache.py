@@ -0,0 +1,212 @@
+import logging
+import math
+import random
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+from django.core.cache import caches
+
+from core.metrics import record_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class LocalLRUCache:
+    """
+    Small thread-safe LRU cache with per-entry expiry, local to the process.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.data = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self.lock:
+            entry = self.data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self.data[key]
+                return default
+            self.data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self.lock:
+            self.data[key] = (time.monotonic() + self.ttl, value)
+            self.data.move_to_end(key)
+            while len(self.data) > self.maxsize:
+                self.data.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.data.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.data.clear()
+
+
+class NamespacedCache:
+    """
+    Cache for one namespace of keys on top of a Django cache backend.
+
+    Entries are stamped with the namespace's current version, which is read
+    together with the entry in one ``get_many`` round trip, so ``invalidate``
+    drops the whole namespace with a single INCR. ``get_or_set`` recomputes a
+    missing value once per cluster: the first caller takes a short lock and
+    the others wait for its result. Values are also refreshed before they
+    expire, with a probability that grows as expiry nears and with how long
+    the value took to compute (XFetch), so hot keys rarely miss at all.
+
+    With ``local_maxsize`` set, values are also kept in a per-process LRU
+    for ``local_ttl`` seconds. Local copies skip Redis entirely but may be
+    that much out of date in other processes after an invalidation.
+    """
+    LOCK_TIMEOUT = 10
+    LOCK_POLL_INTERVAL = 0.05
+
+    def __init__(self, namespace: str, timeout: Optional[int] = 300, alias: str = 'default',
+                 local_maxsize: int = 0, local_ttl: float = 1.0, beta: float = 1.0):
+        self.namespace = namespace
+        self.timeout = timeout
+        self.alias = alias
+        self.beta = beta
+        self.local = LocalLRUCache(local_maxsize, local_ttl) if local_maxsize else None
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def _version_key(self) -> str:
+        return f"ns:{self.namespace}:version"
+
+    def _key(self, key) -> str:
+        return f"{self.namespace}:{key}"
+
+    def _lock_key(self, key, version: int) -> str:
+        return f"lock:{self._key(key)}:v{version}"
+
+    def _init_version(self) -> int:
+        self.cache.add(self._version_key(), 1, timeout=None)
+        return self.cache.get(self._version_key(), 1)
+
+    def get_version(self) -> int:
+        version = self.cache.get(self._version_key())
+        return self._init_version() if version is None else version
+
+    def invalidate(self) -> int:
+        """
+        Drop every key in the namespace and return the new version.
+        """
+        if self.local:
+            self.local.clear()
+        try:
+            return self.cache.incr(self._version_key())
+        except ValueError:
+            # Version key was evicted; any version we pick now is new to readers
+            self.cache.add(self._version_key(), 1, timeout=None)
+            return self.cache.incr(self._version_key())
+
+    def _fetch(self, key):
+        """
+        Read the namespace version and the entry for ``key`` in one round trip.
+
+        Entries written under an older version count as missing.
+        """
+        version_key, cache_key = self._version_key(), self._key(key)
+        found = self.cache.get_many([version_key, cache_key])
+        version = found.get(version_key)
+        if version is None:
+            version = self._init_version()
+        entry = found.get(cache_key, _MISSING)
+        if entry is not _MISSING and entry[3] != version:
+            entry = _MISSING
+        return version, entry
+
+    def _get_entry(self, key):
+        """
+        Return ``(version, entry)``; the version is None for local hits.
+        """
+        if self.local:
+            entry = self.local.get(key, _MISSING)
+            if entry is not _MISSING:
+                record_cache_lookup(self.namespace, 'local_hit')
+                return None, entry
+        version, entry = self._fetch(key)
+        if entry is _MISSING:
+            record_cache_lookup(self.namespace, 'miss')
+            return version, entry
+        record_cache_lookup(self.namespace, 'hit')
+        if self.local:
+            self.local.set(key, entry)
+        return version, entry
+
+    def _set_entry(self, key, value, timeout, delta: float = 0.0, version: int = None):
+        timeout = self.timeout if timeout is None else timeout
+        expires_at = time.time() + timeout if timeout else None
+        entry = (value, delta, expires_at, version or self.get_version())
+        self.cache.set(self._key(key), entry, timeout)
+        if self.local:
+            self.local.set(key, entry)
+
+    def get(self, key, default=None):
+        _, entry = self._get_entry(key)
+        return default if entry is _MISSING else entry[0]
+
+    def set(self, key, value, timeout: Optional[int] = None):
+        self._set_entry(key, value, timeout)
+
+    def delete(self, key):
+        if self.local:
+            self.local.delete(key)
+        self.cache.delete(self._key(key))
+
+    def _should_refresh(self, delta: float, expires_at: Optional[float]) -> bool:
+        if not expires_at or not delta:
+            return False
+        return time.time() - delta * self.beta * math.log(1.0 - random.random()) >= expires_at
+
+    def get_or_set(self, key, compute: Callable[[], Any], timeout: Optional[int] = None):
+        """
+        Return the cached value, computing and storing it when missing or about to expire.
+        """
+        version, entry = self._get_entry(key)
+        if entry is not _MISSING and not self._should_refresh(entry[1], entry[2]):
+            return entry[0]
+
+        if version is None:
+            version = self.get_version()
+        lock_key = self._lock_key(key, version)
+        if not self.cache.add(lock_key, 1, self.LOCK_TIMEOUT):
+            if entry is not _MISSING:
+                # Someone else is refreshing; the current value is still good
+                return entry[0]
+            value = self._wait_for(key, version)
+            if value is not _MISSING:
+                return value
+            logger.warning(f"Timed out waiting for cache key {self._key(key)}, computing it")
+
+        try:
+            started = time.monotonic()
+            value = compute()
+            self._set_entry(key, value, timeout, time.monotonic() - started, version)
+        finally:
+            self.cache.delete(lock_key)
+        return value
+
+    def _wait_for(self, key, version: int):
+        deadline = time.monotonic() + self.LOCK_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(self.LOCK_POLL_INTERVAL)
+            entry = self.cache.get(self._key(key), _MISSING)
+            if entry is not _MISSING and entry[3] >= version:
+                return entry[0]
+        return _MISSING
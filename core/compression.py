@@ -0,0 +1,76 @@
+import gzip
+import re
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Textual API payloads; HTML is left out because admin pages carry CSRF tokens (BREACH)
+COMPRESSIBLE_TYPES = (
+    'application/json', 'application/openapi+json', 'application/yaml',
+    'application/javascript', 'application/xml', 'image/svg+xml', 'text/plain', 'text/css', 'text/csv',
+)
+BROTLI_QUALITY = 5  # fast enough per response; static files are compressed harder at build time
+GZIP_LEVEL = 6
+
+_encoding_re = re.compile(r'\s*([^\s;,]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?')
+
+
+def accepts_encoding(accept_encoding: str, encoding: str) -> bool:
+    """
+    Whether an Accept-Encoding header allows ``encoding`` (q=0 refuses it).
+    """
+    for part in accept_encoding.split(','):
+        match = _encoding_re.match(part)
+        if match and match.group(1).lower() in (encoding, '*'):
+            try:
+                return float(match.group(2) or 1) > 0
+            except ValueError:
+                return False
+    return False
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compress API responses with Brotli or gzip, whichever the client accepts.
+
+    Responses smaller than ``COMPRESSION_MIN_SIZE``, streaming or
+    already-encoded responses, non-textual content types and responses
+    marked ``no-transform`` are passed through untouched. Static files never
+    get here; WhiteNoise serves them precompressed.
+    """
+
+    def process_response(self, request, response):
+        if response.streaming or response.has_header('Content-Encoding'):
+            return response
+        if len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+        content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type not in COMPRESSIBLE_TYPES or 'no-transform' in response.get('Cache-Control', ''):
+            return response
+
+        # The representation depends on Accept-Encoding whether or not this client gets it compressed
+        patch_vary_headers(response, ('Accept-Encoding',))
+        accept_encoding = request.headers.get('Accept-Encoding', '')
+        if brotli is not None and accepts_encoding(accept_encoding, 'br'):
+            encoding, compressed = 'br', brotli.compress(response.content, quality=BROTLI_QUALITY)
+        elif accepts_encoding(accept_encoding, 'gzip'):
+            encoding, compressed = 'gzip', gzip.compress(response.content, compresslevel=GZIP_LEVEL, mtime=0)
+        else:
+            return response
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response.headers['Content-Length'] = str(len(compressed))
+        response.headers['Content-Encoding'] = encoding
+        # The ETag was computed on the uncompressed body
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        return response
@@ -0,0 +1,225 @@
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class RoutingState:
+    """
+    Replica routing state of one request or task.
+    """
+
+    def __init__(self, pinned: bool = False):
+        self.pinned = pinned
+        self.wrote = False
+        self.force_replica = False
+
+
+_state: ContextVar[Optional[RoutingState]] = ContextVar('db_routing_state', default=None)
+
+
+class ReplicaHealth:
+    """
+    Per-process record of which replicas answered their last check.
+
+    A replica is checked at most once every ``DATABASE_REPLICA_CHECK_INTERVAL``
+    seconds; one that fails is skipped until its next check succeeds.
+    """
+
+    def __init__(self):
+        self.checked_at = {}
+        self.healthy = {}
+        self.lock = threading.Lock()
+
+    def is_healthy(self, alias: str) -> bool:
+        now = time.monotonic()
+        with self.lock:
+            due = now - self.checked_at.get(alias, float('-inf')) >= settings.DATABASE_REPLICA_CHECK_INTERVAL
+            if due:
+                # Claim the check so concurrent threads keep using the last result meanwhile
+                self.checked_at[alias] = now
+        if due:
+            healthy = self.check(alias)
+            if healthy != self.healthy.get(alias, True):
+                log = logger.info if healthy else logger.warning
+                log(f"Database replica {alias} is {'healthy' if healthy else 'unreachable'}")
+            self.healthy[alias] = healthy
+        return self.healthy.get(alias, True)
+
+    @staticmethod
+    def check(alias: str) -> bool:
+        connection = connections[alias]
+        try:
+            connection.ensure_connection()
+            return connection.is_usable()
+        except DatabaseError:
+            return False
+
+
+health = ReplicaHealth()
+
+
+def choose_replica() -> str:
+    """
+    Pick a healthy replica by weight, or the primary when none is.
+    """
+    replicas = settings.DATABASE_REPLICAS
+    healthy = [alias for alias in replicas if health.is_healthy(alias)]
+    if not healthy:
+        return DEFAULT_DB_ALIAS
+    return random.choices(healthy, weights=[replicas[alias] for alias in healthy])[0]
+
+
+class ReplicaRouter:
+    """
+    Send reads of ``DATABASE_REPLICA_APPS`` models (and every read inside
+    ``using_replica()``) to the replicas in ``DATABASE_REPLICAS``.
+
+    Everything else, all writes, reads inside ``transaction.atomic``, reads
+    in requests with an unsafe method and reads after the request or task
+    has written (see ``ReplicaPinningMiddleware``) use the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        if not settings.DATABASE_REPLICAS:
+            return DEFAULT_DB_ALIAS
+        state = _state.get()
+        if state is not None and (state.pinned or state.wrote):
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        if (state is not None and state.force_replica) or model._meta.app_label in settings.DATABASE_REPLICA_APPS:
+            return choose_replica()
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas mirror the primary, so objects read from either can be related
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+@contextmanager
+def routing_state(pinned: bool = False):
+    token = _state.set(RoutingState(pinned))
+    try:
+        yield _state.get()
+    finally:
+        _state.reset(token)
+
+
+@contextmanager
+def using_replica():
+    """
+    Read every model from the replicas inside the block, e.g. for reports
+    and exports that tolerate replication lag. Transactions still use the
+    primary.
+    """
+    state = _state.get()
+    if state is None:
+        with routing_state() as state:
+            state.force_replica = True
+            yield
+        return
+    previous, state.force_replica = state.force_replica, True
+    try:
+        yield
+    finally:
+        state.force_replica = previous
+
+
+@contextmanager
+def pin_to_primary():
+    """
+    Read everything from the primary inside the block.
+    """
+    state = _state.get()
+    if state is None:
+        with routing_state(pinned=True):
+            yield
+        return
+    previous, state.pinned = state.pinned, True
+    try:
+        yield
+    finally:
+        state.pinned = previous
+
+
+class ReplicaPinningMiddleware:
+    """
+    Keep a client on the primary for ``DATABASE_REPLICA_PIN_SECONDS`` after
+    one of its requests wrote, so it reads its own writes despite
+    replication lag. The pin is a cookie.
+
+    Requests with an unsafe method read from the primary throughout, so
+    what they validate before writing (prices, stock, order status) is
+    never a lagging copy.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        with routing_state(pinned=self.reads_primary(request)) as state:
+            response = self.get_response(request)
+        return self.pin(request, response, state)
+
+    async def __acall__(self, request):
+        # ORM calls made through sync_to_async copy this context, so they share the state
+        with routing_state(pinned=self.reads_primary(request)) as state:
+            response = await self.get_response(request)
+        return self.pin(request, response, state)
+
+    @staticmethod
+    def reads_primary(request) -> bool:
+        return request.method not in SAFE_METHODS or settings.DATABASE_REPLICA_PIN_COOKIE in request.COOKIES
+
+    @staticmethod
+    def pin(request, response, state: RoutingState):
+        if state.wrote:
+            response.set_cookie(
+                settings.DATABASE_REPLICA_PIN_COOKIE, '1', max_age=settings.DATABASE_REPLICA_PIN_SECONDS,
+                httponly=True, samesite='Lax', secure=request.is_secure()
+            )
+        return response
+
+
+def task_started(**kwargs):
+    # Each task routes like a request; state must not leak between tasks on a worker thread
+    _state.set(RoutingState())
+
+
+def task_finished(**kwargs):
+    _state.set(None)
+
+
+def connect_celery_signals():
+    from celery.signals import task_postrun, task_prerun
+
+    task_prerun.connect(task_started, weak=False)
+    task_postrun.connect(task_finished, weak=False)
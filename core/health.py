@@ -0,0 +1,125 @@
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+from core.services.redis import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+
+def check_database() -> Dict[str, Any]:
+    connection = connections['default']
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+    except Exception:
+        # Reconnect on the next probe instead of reusing a broken connection
+        connection.close()
+        raise
+    return {}
+
+
+def check_redis() -> Dict[str, Any]:
+    get_redis_client().ping()
+    return {}
+
+
+def check_broker() -> Dict[str, Any]:
+    from config.celery import app
+
+    depths = {}
+    with app.connection_for_read() as conn:
+        conn.ensure_connection(max_retries=0)
+        channel = conn.default_channel
+        for queue in settings.HEALTH_CHECK_QUEUES:
+            try:
+                depths[queue] = channel.queue_declare(queue=queue, passive=True).message_count
+            except conn.channel_errors:
+                # Queue has not been declared yet
+                depths[queue] = 0
+                channel = conn.channel()
+    return {'queues': depths}
+
+
+PROBES = {
+    'database': check_database,
+    'redis': check_redis,
+    'broker': check_broker,
+}
+
+
+class HealthMonitor:
+    """
+    Probes the service's dependencies in the background and caches the result.
+
+    One daemon thread per process runs every probe each ``interval`` seconds,
+    so readiness checks only read the latest report no matter how often the
+    load balancer calls. A report that stops being refreshed counts as
+    failed.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.report = None
+        self.lock = threading.Lock()
+        self.pid = None
+
+    def probe(self) -> Dict[str, Any]:
+        checks = {}
+        for name, probe in PROBES.items():
+            started = time.monotonic()
+            try:
+                result = {'ok': True, **probe()}
+            except Exception as e:
+                logger.warning(f"Health check '{name}' failed: {e}")
+                result = {'ok': False, 'error': str(e)}
+            result['latency_ms'] = round((time.monotonic() - started) * 1000, 2)
+            checks[name] = result
+
+        max_depth = settings.HEALTH_MAX_QUEUE_DEPTH
+        broker = checks['broker']
+        if broker['ok'] and max_depth and any(depth > max_depth for depth in broker['queues'].values()):
+            broker['ok'] = False
+            broker['error'] = 'Queue depth above limit'
+
+        return {
+            'status': 'ok' if all(check['ok'] for check in checks.values()) else 'fail',
+            'checked_at': timezone.now().isoformat(),
+            'checks': checks,
+            'monotonic': time.monotonic(),
+        }
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self.report = self.probe()
+
+    def _ensure_started(self):
+        # Threads do not survive fork, so start one in each worker process
+        if self.pid == os.getpid():
+            return
+        with self.lock:
+            if self.pid == os.getpid():
+                return
+            self.report = self.probe()
+            threading.Thread(target=self._run, name='health-monitor', daemon=True).start()
+            self.pid = os.getpid()
+
+    def get_report(self) -> Dict[str, Any]:
+        self._ensure_started()
+        report = dict(self.report)
+        age = time.monotonic() - report.pop('monotonic')
+        if age > self.interval * 3:
+            report['status'] = 'fail'
+            report['error'] = f"Health report is stale ({age:.0f}s old)"
+        return report
+
+
+monitor = HealthMonitor(settings.HEALTH_CHECK_INTERVAL)
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from core.schema import encode_schema, generate_schema, get_code_version, read_manifest, write_schema
+
+
+class Command(BaseCommand):
+    help = 'Generate the OpenAPI schema once and store it as JSON and YAML for the schema views'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Regenerate even if the code version is unchanged')
+
+    def handle(self, *args, **options):
+        code_version = get_code_version()
+        manifest = read_manifest()
+        if not options['force'] and manifest and manifest.get('code_version') == code_version:
+            self.stdout.write(f"OpenAPI schema is up to date for code version {code_version}")
+            return
+
+        documents = encode_schema(generate_schema())
+        write_schema(documents, code_version)
+        sizes = ', '.join(f"{fmt} {len(content)} bytes" for fmt, content in documents.items())
+        self.stdout.write(self.style.SUCCESS(f"Wrote OpenAPI schema for code version {code_version} ({sizes})"))
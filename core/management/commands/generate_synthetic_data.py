@@ -0,0 +1,213 @@
+import random
+import time
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import User, OTP
+from core.ids import make_uuid7
+from orders.models import Order, OrderItem, Payment
+from products.models import Category, Product, ProductVariant
+
+ORDER_STATUSES = [
+    (Order.OrderStatus.COMPLETED, 60),
+    (Order.OrderStatus.PENDING, 20),
+    (Order.OrderStatus.PAID, 5),
+    (Order.OrderStatus.PROCESSING, 5),
+    (Order.OrderStatus.FAILED, 7),
+    (Order.OrderStatus.CANCELLED, 3),
+]
+
+PAYMENT_STATUS_FOR_ORDER = {
+    Order.OrderStatus.COMPLETED: Payment.PaymentStatus.COMPLETED,
+    Order.OrderStatus.PAID: Payment.PaymentStatus.COMPLETED,
+    Order.OrderStatus.PROCESSING: Payment.PaymentStatus.COMPLETED,
+    Order.OrderStatus.PENDING: Payment.PaymentStatus.PENDING,
+    Order.OrderStatus.FAILED: Payment.PaymentStatus.FAILED,
+    Order.OrderStatus.CANCELLED: Payment.PaymentStatus.FAILED,
+}
+
+VARIANT_MONTHS = [1, 3, 6, 12]
+
+
+class Command(BaseCommand):
+    help = 'Generate reproducible synthetic users, catalog and orders for benchmarking'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--otps-per-user', type=int, default=2)
+        parser.add_argument('--categories', type=int, default=10)
+        parser.add_argument('--products', type=int, default=200)
+        parser.add_argument('--variants-per-product', type=int, default=4)
+        parser.add_argument('--orders', type=int, default=5000)
+        parser.add_argument('--max-items-per-order', type=int, default=3)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=42, help='Same seed, same data (time-ordered ids aside)')
+        parser.add_argument('--prefix', default='bench', help='Prefix for category and product slugs')
+        parser.add_argument('--phone-prefix', default='0999', help='Prefix for user phone numbers')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.prefix = options['prefix']
+        self.phone_prefix = options['phone_prefix']
+        self.now = timezone.now()
+
+        user_ids = self.create_users(options['users'], options['otps_per_user'])
+        catalog = self.create_catalog(
+            options['categories'], options['products'], options['variants_per_product']
+        )
+        self.create_orders(options['orders'], options['max_items_per_order'], user_ids, catalog)
+
+    def key(self) -> uuid.UUID:
+        # Time-ordered like the default of the models that use core.ids.uuid7
+        return make_uuid7(time.time_ns(), self.rng.getrandbits(62))
+
+    def uuid(self) -> uuid.UUID:
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def price(self, low: int, high: int) -> Decimal:
+        return Decimal(self.rng.randint(low * 100, high * 100)) / 100
+
+    def insert(self, model, objects):
+        model.objects.bulk_create(objects, batch_size=self.batch_size)
+
+    def create_users(self, count, otps_per_user):
+        user_ids = []
+        for start in range(0, count, self.batch_size):
+            users, otps = [], []
+            for i in range(start, min(start + self.batch_size, count)):
+                user = User(
+                    id=self.key(),
+                    phone_number=f"{self.phone_prefix}{i:08d}",
+                    password='!',
+                    telegram_id=str(self.rng.randint(10 ** 8, 10 ** 10)) if self.rng.random() < 0.7 else None,
+                    is_verified=self.rng.random() < 0.9,
+                )
+                users.append(user)
+                for _ in range(otps_per_user):
+                    otps.append(OTP(
+                        id=self.key(),
+                        user_id=user.id,
+                        code=f"{self.rng.randrange(10 ** 6):06d}",
+                        is_used=self.rng.random() < 0.8,
+                        expires_at=self.now - timedelta(minutes=self.rng.randint(0, 60 * 24 * 30)),
+                    ))
+            with transaction.atomic():
+                self.insert(User, users)
+                self.insert(OTP, otps)
+            user_ids.extend(user.id for user in users)
+        self.stdout.write(f"Created {count} users and {count * otps_per_user} OTPs")
+        return user_ids
+
+    def create_catalog(self, category_count, product_count, variants_per_product):
+        categories = [
+            Category(
+                id=self.uuid(),
+                name=f"Category {i}",
+                slug=f"{self.prefix}-category-{i}",
+                description=f"Synthetic category {i}",
+            )
+            for i in range(category_count)
+        ]
+        products, variants = [], []
+        product_types = [choice for choice, _ in Product.ProductType.choices]
+        for i in range(product_count):
+            price = self.price(1, 100)
+            product = Product(
+                id=self.uuid(),
+                name=f"Product {i}",
+                slug=f"{self.prefix}-product-{i}",
+                description=f"Synthetic product {i}. " * self.rng.randint(1, 20),
+                price=price,
+                discount_price=(price * Decimal('0.8')).quantize(Decimal('0.01')) if self.rng.random() < 0.3 else None,
+                category_id=self.rng.choice(categories).id,
+                product_type=self.rng.choice(product_types),
+                is_active=self.rng.random() < 0.95,
+            )
+            products.append(product)
+            for months in VARIANT_MONTHS[:variants_per_product]:
+                variant_price = price * months
+                variants.append(ProductVariant(
+                    id=self.uuid(),
+                    product_id=product.id,
+                    name=f"{months} month{'s' if months > 1 else ''}",
+                    price=variant_price,
+                    discount_price=(variant_price * Decimal('0.9')).quantize(Decimal('0.01'))
+                    if self.rng.random() < 0.3 else None,
+                    duration_months=months,
+                ))
+
+        with transaction.atomic():
+            self.insert(Category, categories)
+            self.insert(Product, products)
+            self.insert(ProductVariant, variants)
+
+        variants_by_product = {}
+        for variant in variants:
+            variants_by_product.setdefault(variant.product_id, []).append(variant)
+        self.stdout.write(
+            f"Created {len(categories)} categories, {len(products)} products and {len(variants)} variants"
+        )
+        return [(product, variants_by_product.get(product.id, [])) for product in products if product.is_active]
+
+    def create_orders(self, count, max_items, user_ids, catalog):
+        if not user_ids or not catalog:
+            return
+        statuses = [status for status, _ in ORDER_STATUSES]
+        weights = [weight for _, weight in ORDER_STATUSES]
+
+        item_count = payment_count = 0
+        for start in range(0, count, self.batch_size):
+            orders, items, payments = [], [], []
+            for _ in range(start, min(start + self.batch_size, count)):
+                order = Order(
+                    id=self.key(),
+                    user_id=self.rng.choice(user_ids),
+                    status=self.rng.choices(statuses, weights)[0],
+                    total_amount=Decimal('0'),
+                    telegram_id=str(self.rng.randint(10 ** 8, 10 ** 10)),
+                )
+                for _ in range(self.rng.randint(1, max_items)):
+                    product, variants = self.rng.choice(catalog)
+                    variant = self.rng.choice(variants) if variants else None
+                    price = (variant or product).current_price
+                    quantity = self.rng.randint(1, 3)
+                    items.append(OrderItem(
+                        id=self.key(),
+                        order_id=order.id,
+                        product_id=product.id,
+                        variant_id=variant.id if variant else None,
+                        quantity=quantity,
+                        price=price,
+                    ))
+                    order.total_amount += price * quantity
+                orders.append(order)
+
+                payment_status = PAYMENT_STATUS_FOR_ORDER[order.status]
+                payments.append(Payment(
+                    id=self.key(),
+                    order_id=order.id,
+                    amount=order.total_amount,
+                    payment_method=Payment.PaymentMethod.CRYPTO,
+                    status=payment_status,
+                    transaction_id=self.uuid().hex,
+                    gateway_uuid=self.uuid(),
+                    next_check_at=self.now if payment_status == Payment.PaymentStatus.PENDING else None,
+                ))
+
+            with transaction.atomic():
+                self.insert(Order, orders)
+                self.insert(OrderItem, items)
+                self.insert(Payment, payments)
+            item_count += len(items)
+            payment_count += len(payments)
+            self.stdout.write(f"Created {start + len(orders)}/{count} orders")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {count} orders, {item_count} order items and {payment_count} payments"
+        ))
@@ -0,0 +1,307 @@
+import logging
+import os
+import time
+from contextlib import ExitStack, contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db import connections
+import redis
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Histogram, multiprocess, start_http_server
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+logger = logging.getLogger(__name__)
+
+# In gunicorn and Celery prefork workers, set PROMETHEUS_MULTIPROC_DIR so
+# every process writes its samples to a shared directory (see core.views.metrics_view).
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds',
+    'HTTP request latency by view and action.',
+    ['route', 'method', 'status'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+REQUEST_DB_QUERIES = Histogram(
+    'http_request_db_queries',
+    'Database queries executed per request.',
+    ['route'],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250),
+)
+REQUEST_DB_DURATION = Histogram(
+    'http_request_db_duration_seconds',
+    'Time spent in database queries per request.',
+    ['route'],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+CACHE_REQUESTS = Counter(
+    'cache_requests_total',
+    'Cache lookups by cache and result (local_hit, hit or miss).',
+    ['cache', 'result'],
+)
+EXTERNAL_LATENCY = Histogram(
+    'external_request_duration_seconds',
+    'Latency of calls to external services.',
+    ['service', 'endpoint'],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+EXTERNAL_REQUESTS = Counter(
+    'external_requests_total',
+    'Calls to external services by outcome (ok or error).',
+    ['service', 'endpoint', 'outcome'],
+)
+TASK_DURATION = Histogram(
+    'celery_task_duration_seconds',
+    'Celery task runtime.',
+    ['task', 'state'],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0),
+)
+TASK_QUEUE_WAIT = Histogram(
+    'celery_task_queue_wait_seconds',
+    'Time between publishing a Celery task and a worker starting it.',
+    ['task'],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0),
+)
+OUTBOX_EVENTS = Counter(
+    'outbox_events_total',
+    'Outbox events by topic and stage (written, relayed, relay_failed or dead_lettered).',
+    ['topic', 'stage'],
+)
+OUTBOX_RELAY_LAG = Histogram(
+    'outbox_relay_lag_seconds',
+    'Time between writing an outbox event and handing it to its consumers.',
+    ['topic'],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0),
+)
+OUTBOX_CONSUMED = Counter(
+    'outbox_consumed_total',
+    'Outbox events handled by consumers, by outcome (processed, duplicate, retried or failed).',
+    ['consumer', 'outcome'],
+)
+TELEGRAM_SEND_LATENCY = Histogram(
+    'telegram_send_duration_seconds',
+    'Time taken by one Bot API send from the dispatch queue.',
+    ['priority'],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+TELEGRAM_QUEUE_WAIT = Histogram(
+    'telegram_queue_wait_seconds',
+    'Time between queueing a Telegram message and delivering it.',
+    ['priority'],
+    buckets=(0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0),
+)
+ORDER_EVENTS = Counter(
+    'order_events_total',
+    'Order and payment events by topic and new status.',
+    ['topic', 'status'],
+)
+ORDER_PAID_AMOUNT = Counter(
+    'order_paid_amount_total',
+    'Total amount of completed payments.',
+)
+
+PUBLISHED_AT_HEADER = 'published_at'
+
+
+def get_route_name(view_func, method: str) -> str:
+    """
+    Name a view for metric labels, e.g. ``OrderViewSet.list``.
+    """
+    cls = getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None)
+    if cls is None:
+        return f"{view_func.__module__}.{view_func.__name__}"
+    actions = getattr(view_func, 'actions', None)
+    if actions:
+        return f"{cls.__name__}.{actions.get(method.lower(), method.lower())}"
+    return cls.__name__
+
+
+class QueryStats:
+    """
+    Database execute wrapper counting queries and the time spent on them.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - started
+
+
+class MetricsMiddleware:
+    """
+    Record latency and database usage for every request.
+
+    Queries are counted on the request's own connections, so ORM calls an
+    async view makes through ``sync_to_async`` are not included in its
+    query metrics.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        stats = QueryStats()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(stats))
+            response = self.get_response(request)
+        self.observe(request, response, time.perf_counter() - started, stats)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        self.observe(request, response, time.perf_counter() - started, None)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.metrics_route = get_route_name(view_func, request.method)
+
+    @staticmethod
+    def observe(request, response, duration: float, stats):
+        route = getattr(request, 'metrics_route', 'unmatched')
+        REQUEST_LATENCY.labels(route, request.method, response.status_code).observe(duration)
+        if stats is not None:
+            REQUEST_DB_QUERIES.labels(route).observe(stats.count)
+            REQUEST_DB_DURATION.labels(route).observe(stats.duration)
+
+
+class ExternalCall:
+    def __init__(self):
+        self.failed = False
+
+    def fail(self):
+        self.failed = True
+
+
+@contextmanager
+def track_external_call(service: str, endpoint: str):
+    """
+    Time a call to an external service. Exceptions, or ``call.fail()``, count as errors.
+    """
+    call = ExternalCall()
+    started = time.perf_counter()
+    try:
+        yield call
+    except Exception:
+        call.fail()
+        raise
+    finally:
+        EXTERNAL_LATENCY.labels(service, endpoint).observe(time.perf_counter() - started)
+        EXTERNAL_REQUESTS.labels(service, endpoint, 'error' if call.failed else 'ok').inc()
+
+
+def record_cache_lookup(cache: str, result: str):
+    CACHE_REQUESTS.labels(cache, result).inc()
+
+
+_task_started = {}
+
+
+def task_published(headers=None, **kwargs):
+    if headers is not None:
+        headers[PUBLISHED_AT_HEADER] = time.time()
+
+
+def task_started(task_id=None, task=None, **kwargs):
+    now = time.time()
+    _task_started[task_id] = time.perf_counter()
+    published_at = task.request.get(PUBLISHED_AT_HEADER)
+    if published_at:
+        TASK_QUEUE_WAIT.labels(task.name).observe(max(0.0, now - published_at))
+
+
+def task_finished(task_id=None, task=None, state=None, **kwargs):
+    started = _task_started.pop(task_id, None)
+    if started is not None:
+        TASK_DURATION.labels(task.name, state or 'UNKNOWN').observe(time.perf_counter() - started)
+
+
+class TelegramQueueCollector:
+    """
+    Read the Telegram dispatch queue from Redis at scrape time.
+
+    The queue is shared by every process, so it is exported from its own
+    registry by the web app only (see ``core.views.metrics_view``) rather
+    than once per worker.
+    """
+
+    def collect(self):
+        from core.services.telegram import TelegramDispatchQueue
+
+        try:
+            stats = TelegramDispatchQueue().stats()
+        except redis.RedisError as e:
+            logger.warning(f"Could not read Telegram queue stats: {e}")
+            return
+
+        depth = GaugeMetricFamily(
+            'telegram_queue_depth', 'Messages waiting in the Telegram dispatch queue.', labels=['priority']
+        )
+        ready = GaugeMetricFamily(
+            'telegram_queue_ready', 'Queued Telegram messages that are due to be sent.', labels=['priority']
+        )
+        processing = GaugeMetricFamily(
+            'telegram_queue_processing', 'Telegram messages claimed by a drainer and not yet acknowledged.',
+            labels=['priority']
+        )
+        for priority, count in stats['depth'].items():
+            depth.add_metric([priority], count)
+        for priority, count in stats['ready'].items():
+            ready.add_metric([priority], count)
+        for priority, count in stats['processing'].items():
+            processing.add_metric([priority], count)
+        yield depth
+        yield ready
+        yield processing
+
+        messages = CounterMetricFamily(
+            'telegram_messages', 'Telegram messages by outcome (sent, failed or rate_limited).', labels=['outcome']
+        )
+        for outcome in ('sent', 'failed', 'rate_limited'):
+            messages.add_metric([outcome], stats[outcome])
+        yield messages
+
+
+QUEUE_REGISTRY = CollectorRegistry()
+QUEUE_REGISTRY.register(TelegramQueueCollector())
+
+
+def get_registry():
+    """
+    Return the registry to export, merging every process in multiprocess mode.
+    """
+    if not os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def start_worker_metrics_server(**kwargs):
+    # Celery workers serve no HTTP, so expose their metrics on a port of their own
+    port = os.environ.get('CELERY_METRICS_PORT')
+    if port:
+        start_http_server(int(port), registry=get_registry())
+
+
+def connect_celery_signals():
+    from celery.signals import before_task_publish, task_postrun, task_prerun, worker_ready
+
+    before_task_publish.connect(task_published, weak=False)
+    task_prerun.connect(task_started, weak=False)
+    task_postrun.connect(task_finished, weak=False)
+    worker_ready.connect(start_worker_metrics_server, weak=False)
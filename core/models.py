@@ -1,5 +1,7 @@
 from django.db import models
 
+from .ids import uuid7
+
 
 class TimeStampedModel(models.Model):
     """
@@ -12,3 +14,27 @@ class TimeStampedModel(models.Model):
     class Meta:
         abstract = True
 
+
+class OutboxEvent(TimeStampedModel):
+    """
+    Domain event written in the same transaction as the change it
+    describes, and handed to its Celery consumers by ``core.outbox.relay_events``.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
+    topic = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    published_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        verbose_name = 'Outbox Event'
+        verbose_name_plural = 'Outbox Events'
+        indexes = [
+            # The relay only ever scans unpublished events, oldest first
+            models.Index(fields=['id'], condition=models.Q(published_at__isnull=True), name='outbox_pending_idx'),
+            models.Index(fields=['published_at'], name='outbox_published_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.topic} {self.id}"
@@ -0,0 +1,205 @@
+import logging
+import threading
+from datetime import timedelta
+from typing import Any, Dict
+
+from celery import current_app, shared_task
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from kombu.exceptions import OperationalError
+
+from .metrics import OUTBOX_CONSUMED, OUTBOX_EVENTS, OUTBOX_RELAY_LAG
+from .models import OutboxEvent
+from .services.redis import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+CLAIM_PROCESSING = b'processing'
+CLAIM_DONE = b'done'
+
+# Errors meaning the broker is unreachable, so no other event can be queued either
+BROKER_ERRORS = (OperationalError, OSError)
+
+_local = threading.local()
+
+
+def publish(topic: str, payload: Dict[str, Any]) -> OutboxEvent:
+    """
+    Record an event for the consumers of ``topic`` (``OUTBOX_CONSUMERS``).
+
+    Call it inside the transaction that makes the change, so the event is
+    committed or rolled back with it. The relay is nudged once the
+    transaction commits; its periodic run picks up anything the nudge misses.
+    """
+    event = OutboxEvent.objects.create(topic=topic, payload=payload)
+    transaction.on_commit(lambda: OUTBOX_EVENTS.labels(topic, 'written').inc())
+    if settings.OUTBOX_RELAY_ON_COMMIT:
+        nudge = getattr(_local, 'nudge', None)
+        if nudge is None or nudge.sent:
+            nudge = _local.nudge = RelayNudge()
+        # Runs immediately when not in a transaction, and is dropped if the event is rolled back
+        transaction.on_commit(nudge.send)
+    return event
+
+
+class RelayNudge:
+    """
+    One request for a relay run, shared by the events published until it is sent.
+
+    Each event registers its own on_commit callback, so the nudge survives
+    as long as any of them commits; the first callback to run sends it and
+    the rest do nothing, so a transaction with many events queues one run.
+    """
+
+    def __init__(self):
+        self.sent = False
+
+    def send(self):
+        if not self.sent:
+            self.sent = True
+            schedule_relay()
+
+
+def schedule_relay():
+    from .tasks import PRIORITY_HIGH, relay_outbox
+
+    try:
+        relay_outbox.apply_async(priority=PRIORITY_HIGH)
+    except Exception as e:
+        # The events are safe in the table; the periodic relay run sends them
+        logger.warning(f"Could not schedule the outbox relay: {e}")
+
+
+def relay_events(batch_size: int = None, max_events: int = None) -> Dict[str, int]:
+    """
+    Hand pending events to their consumers, oldest first; returns counters for the run.
+
+    Each batch is locked with ``SELECT ... FOR UPDATE SKIP LOCKED``, so
+    several relays can run at once without sending an event twice. An event
+    is marked published once the tasks of all its consumers are queued. An
+    event that fails to queue stays pending and is skipped for the rest of
+    the run; after ``OUTBOX_RELAY_MAX_ATTEMPTS`` failures it is dead-lettered
+    (left unpublished and no longer tried, until its ``attempts`` is reset).
+    Only an unreachable broker stops the run. A crash between queueing and
+    commit sends events again, which consumers ignore (see ``outbox_consumer``).
+    """
+    batch_size = batch_size or settings.OUTBOX_RELAY_BATCH_SIZE
+    max_events = max_events or settings.OUTBOX_RELAY_MAX_PER_RUN
+    stats = {'relayed': 0, 'failed': 0}
+    failed_ids = set()
+
+    while stats['relayed'] < max_events:
+        fetched, relayed, failed, broker_down = _relay_batch(
+            min(batch_size, max_events - stats['relayed']), failed_ids
+        )
+        stats['relayed'] += len(relayed)
+        stats['failed'] += len(failed)
+        failed_ids.update(event.pk for event in failed)
+        if broker_down or fetched < batch_size:
+            break
+    return stats
+
+
+def _relay_batch(batch_size: int, skip_ids=()):
+    relayed, failed, broker_down = [], [], False
+    with transaction.atomic():
+        events = list(
+            OutboxEvent.objects.select_for_update(skip_locked=True)
+            .filter(published_at__isnull=True, attempts__lt=settings.OUTBOX_RELAY_MAX_ATTEMPTS)
+            .exclude(pk__in=skip_ids)
+            .order_by('id')[:batch_size]
+        )
+        for event in events:
+            try:
+                for task_name in settings.OUTBOX_CONSUMERS.get(event.topic, ()):
+                    current_app.send_task(task_name, args=(str(event.id), event.topic, event.payload))
+            except BROKER_ERRORS as e:
+                failed.append((event, e))
+                broker_down = True
+                break
+            except Exception as e:
+                # Only this event is affected; the rest of the batch goes ahead
+                failed.append((event, e))
+                continue
+            relayed.append(event)
+
+        now = timezone.now()
+        if relayed:
+            OutboxEvent.objects.filter(pk__in=[event.pk for event in relayed]).update(
+                published_at=now, updated_at=now
+            )
+        for event, error in failed:
+            OutboxEvent.objects.filter(pk=event.pk).update(
+                attempts=F('attempts') + 1, last_error=str(error)[:1000], updated_at=now
+            )
+
+    for event in relayed:
+        OUTBOX_EVENTS.labels(event.topic, 'relayed').inc()
+        OUTBOX_RELAY_LAG.labels(event.topic).observe(max(0.0, (now - event.created_at).total_seconds()))
+    for event, error in failed:
+        OUTBOX_EVENTS.labels(event.topic, 'relay_failed').inc()
+        if event.attempts + 1 >= settings.OUTBOX_RELAY_MAX_ATTEMPTS:
+            OUTBOX_EVENTS.labels(event.topic, 'dead_lettered').inc()
+            logger.error(
+                f"Giving up on outbox event {event.id} ({event.topic}) after {event.attempts + 1} attempts: {error}"
+            )
+        else:
+            logger.error(f"Could not relay outbox event {event.id} ({event.topic}): {error}")
+    return len(events), relayed, [event for event, _ in failed], broker_down
+
+
+def purge_published_events(batch_size: int = 1000) -> int:
+    """
+    Delete events published more than ``OUTBOX_RETENTION_SECONDS`` ago.
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.OUTBOX_RETENTION_SECONDS)
+    deleted = 0
+    while True:
+        ids = list(OutboxEvent.objects.filter(published_at__lt=cutoff).values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        deleted += OutboxEvent.objects.filter(pk__in=ids).delete()[0]
+
+
+def outbox_consumer(**task_options):
+    """
+    Make ``func(event_id, topic, payload)`` a Celery task that handles each
+    outbox event once.
+
+    The relay delivers at least once, so every consumer claims the event id
+    in Redis before running and records it as done afterwards. A repeat of a
+    finished event is dropped. A repeat of one still being handled is retried
+    once the claim expires, in case the worker holding it died. Failures
+    release the claim and are retried with backoff, up to
+    ``OUTBOX_CONSUMER_MAX_RETRIES`` times.
+    """
+    def decorator(func):
+        name = f"{func.__module__}.{func.__name__}"
+
+        def run(self, event_id, topic, payload):
+            client = get_redis_client()
+            key = f"outbox:consumed:{name}:{event_id}"
+            if not client.set(key, CLAIM_PROCESSING, nx=True, ex=settings.OUTBOX_CLAIM_TIMEOUT):
+                if client.get(key) == CLAIM_DONE:
+                    OUTBOX_CONSUMED.labels(name, 'duplicate').inc()
+                    return
+                OUTBOX_CONSUMED.labels(name, 'retried').inc()
+                raise self.retry(countdown=settings.OUTBOX_CLAIM_TIMEOUT)
+
+            try:
+                func(event_id, topic, payload)
+            except Exception as e:
+                client.delete(key)
+                OUTBOX_CONSUMED.labels(name, 'failed' if self.request.retries >= self.max_retries else 'retried').inc()
+                raise self.retry(exc=e, countdown=2 ** self.request.retries)
+            client.set(key, CLAIM_DONE, ex=settings.OUTBOX_DEDUP_TTL)
+            OUTBOX_CONSUMED.labels(name, 'processed').inc()
+
+        run.__doc__ = func.__doc__
+        return shared_task(
+            name=name, bind=True, ignore_result=True, acks_late=True, reject_on_worker_lost=True,
+            max_retries=settings.OUTBOX_CONSUMER_MAX_RETRIES, **task_options
+        )(run)
+    return decorator
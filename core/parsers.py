@@ -0,0 +1,37 @@
+import io
+import re
+
+import orjson
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+
+from core.renderers import ORJSONRenderer
+
+# orjson silently turns integers beyond 64 bits into floats; any run of 20
+# digits could be one (strings included, which only costs the fast path)
+LONG_NUMBER = re.compile(rb'\d{20}')
+
+
+class ORJSONParser(JSONParser):
+    """
+    Drop-in JSONParser that parses UTF-8 bodies with orjson.
+
+    Bodies orjson rejects or may misread (invalid JSON, integers beyond 64
+    bits) and other encodings go through JSONParser, so data and error
+    messages stay the same.
+    """
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read()
+        if LONG_NUMBER.search(body):
+            return super().parse(io.BytesIO(body), media_type, parser_context)
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            return super().parse(io.BytesIO(body), media_type, parser_context)
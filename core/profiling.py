@@ -0,0 +1,243 @@
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import random
+import time
+import traceback
+import uuid
+from collections import Counter
+from contextlib import ExitStack
+from typing import Any, Dict, List, Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core import signing
+from django.db import connections
+from django.utils import timezone
+
+from core.metrics import get_route_name
+from core.services.redis import get_redis_client
+
+try:
+    from pyinstrument import Profiler as PyinstrumentProfiler
+except ImportError:
+    PyinstrumentProfiler = None
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = 'X-Profile-Token'
+PROFILE_QUERY_PARAM = '_profile'
+PROFILE_INDEX_KEY = 'profile:index'
+PROFILE_INDEX_SIZE = 100
+SIGNING_SALT = 'core.profiling'
+
+_signer = signing.TimestampSigner(salt=SIGNING_SALT)
+
+
+def make_profile_token() -> str:
+    """
+    Return a token that enables profiling for requests carrying it, until it expires.
+    """
+    return _signer.sign(uuid.uuid4().hex)
+
+
+def is_valid_token(token: str) -> bool:
+    try:
+        _signer.unsign(token, max_age=settings.PROFILING_TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return False
+    return True
+
+
+def profile_key(profile_id: str) -> str:
+    return f"profile:{profile_id}"
+
+
+def get_profile(profile_id: str) -> Optional[Dict[str, Any]]:
+    data = get_redis_client().get(profile_key(profile_id))
+    return json.loads(data) if data is not None else None
+
+
+def list_profiles() -> List[Dict[str, Any]]:
+    """
+    Return summaries of the most recent stored profiles, newest first.
+    """
+    client = get_redis_client()
+    ids = [profile_id.decode() for profile_id in client.lrange(PROFILE_INDEX_KEY, 0, -1)]
+    if not ids:
+        return []
+    summaries = []
+    for profile_id, data in zip(ids, client.mget([profile_key(profile_id) for profile_id in ids])):
+        if data is None:
+            continue
+        profile = json.loads(data)
+        profile.pop('profile')
+        profile.pop('queries')
+        summaries.append(profile)
+    return summaries
+
+
+# Frames that wrap every query and say nothing about where it came from
+_WRAPPER_FILES = ('core/metrics.py', 'core/profiling.py')
+
+
+def _query_origin() -> Optional[str]:
+    """
+    Return the innermost frame of our own code that led to the current query,
+    or the innermost library frame outside the ORM when the query comes from
+    library code called by middleware (e.g. DRF pagination).
+    """
+    base_dir = str(settings.BASE_DIR)
+    fallback = None
+    for frame in reversed(traceback.extract_stack()[:-3]):
+        filename = frame.filename
+        if filename.endswith(_WRAPPER_FILES) or f"django{os.sep}db{os.sep}" in filename:
+            continue
+        if filename.startswith(base_dir) and 'site-packages' not in filename:
+            return f"{filename[len(base_dir) + 1:]}:{frame.lineno} in {frame.name}"
+        if fallback is None:
+            fallback = f"{filename}:{frame.lineno} in {frame.name}"
+    return fallback
+
+
+class QueryRecorder:
+    """
+    Database execute wrapper that logs slow queries and can record every query.
+    """
+
+    def __init__(self, request, record: bool):
+        self.request = request
+        self.record = record
+        self.queries = []
+        self.slow_ms = settings.PROFILING_SLOW_QUERY_MS
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            if self.record:
+                self.queries.append({
+                    'sql': sql,
+                    'duration_ms': round(duration_ms, 3),
+                    'database': context['connection'].alias,
+                    'origin': _query_origin(),
+                })
+            if self.slow_ms and duration_ms >= self.slow_ms:
+                route = getattr(self.request, 'metrics_route', None) or self.request.path
+                logger.warning(f"Slow query ({duration_ms:.1f} ms) in {route}: {sql}")
+
+
+class ProfilingMiddleware:
+    """
+    Profile individual requests on demand and log slow queries for all of them.
+
+    A request is profiled when it carries a token from
+    ``make_profile_token`` in the ``X-Profile-Token`` header or the
+    ``_profile`` query parameter, or when it is picked by
+    ``PROFILING_SAMPLE_RATE``. Its call profile and every SQL query (timing,
+    the line of our code that issued it, duplicates) are stored in Redis for
+    ``PROFILING_RESULT_TTL`` seconds, and the id is returned in the
+    ``X-Profile-Id`` response header. Profiles are read back through the
+    staff-only ``profiles/`` endpoints.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            # Async views are not profiled; their ORM work runs on other threads
+            return self.get_response(request)
+
+        profiling = self.should_profile(request)
+        recorder = QueryRecorder(request, record=profiling)
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            if not profiling:
+                return self.get_response(request)
+
+            profiler = self.start_profiler()
+            started = time.perf_counter()
+            try:
+                response = self.get_response(request)
+            finally:
+                duration = time.perf_counter() - started
+                profile = self.stop_profiler(profiler)
+
+        try:
+            response['X-Profile-Id'] = self.store(request, response, duration, profile, recorder.queries)
+        except Exception as e:
+            logger.error(f"Could not store profile for {request.path}: {e}")
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not hasattr(request, 'metrics_route'):
+            request.metrics_route = get_route_name(view_func, request.method)
+
+    @staticmethod
+    def should_profile(request) -> bool:
+        if not settings.PROFILING_ENABLED:
+            return False
+        token = request.headers.get(PROFILE_HEADER) or request.GET.get(PROFILE_QUERY_PARAM)
+        if token:
+            return is_valid_token(token)
+        rate = settings.PROFILING_SAMPLE_RATE
+        return bool(rate) and random.random() < rate
+
+    @staticmethod
+    def start_profiler():
+        if settings.PROFILING_ENGINE == 'pyinstrument' and PyinstrumentProfiler is not None:
+            profiler = PyinstrumentProfiler()
+            profiler.start()
+            return profiler
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler
+
+    @staticmethod
+    def stop_profiler(profiler) -> str:
+        if isinstance(profiler, cProfile.Profile):
+            profiler.disable()
+            output = io.StringIO()
+            pstats.Stats(profiler, stream=output).sort_stats('cumulative').print_stats(50)
+            return output.getvalue()
+        profiler.stop()
+        return profiler.output_text(unicode=True, color=False)
+
+    @staticmethod
+    def store(request, response, duration: float, profile: str, queries: List[Dict[str, Any]]) -> str:
+        profile_id = uuid.uuid4().hex
+        counts = Counter(query['sql'] for query in queries)
+        data = {
+            'id': profile_id,
+            'created_at': timezone.now().isoformat(),
+            'method': request.method,
+            'path': request.path,
+            'route': getattr(request, 'metrics_route', None),
+            'status': response.status_code,
+            'duration_ms': round(duration * 1000, 2),
+            'query_count': len(queries),
+            'query_time_ms': round(sum(query['duration_ms'] for query in queries), 3),
+            'duplicate_queries': [
+                {'sql': sql, 'count': count} for sql, count in counts.most_common() if count > 1
+            ],
+            'queries': queries,
+            'profile': profile,
+        }
+
+        pipe = get_redis_client().pipeline()
+        pipe.set(profile_key(profile_id), json.dumps(data), ex=settings.PROFILING_RESULT_TTL)
+        pipe.lpush(PROFILE_INDEX_KEY, profile_id)
+        pipe.ltrim(PROFILE_INDEX_KEY, 0, PROFILE_INDEX_SIZE - 1)
+        pipe.execute()
+        return profile_id
@@ -0,0 +1,56 @@
+import logging
+
+import orjson
+from rest_framework.utils import encoders
+from rest_framework.renderers import JSONRenderer
+
+logger = logging.getLogger(__name__)
+
+# Dates and times go through DRF's encoder so they keep its format
+# (milliseconds, 'Z' for UTC) instead of orjson's
+ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+_encoder = encoders.JSONEncoder()
+
+
+def orjson_default(obj):
+    """
+    Encode what orjson does not handle natively (Decimal, lazy translation
+    strings, dates and times, querysets...) the same way DRF's encoder does.
+    """
+    return _encoder.default(obj)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Drop-in JSONRenderer that serializes with orjson.
+
+    Output is byte-identical to JSONRenderer for compact, non-ASCII-escaped
+    responses (DRF's defaults). Indented output (browsable API,
+    ``; indent=`` media types), non-default JSON settings and anything orjson
+    fails on (such as integers beyond 64 bits) are handed to JSONRenderer
+    instead.
+
+    Two kinds of floats differ, since catching them would mean walking every
+    response. NaN and infinity render as ``null``, where JSONRenderer's
+    strict mode raises ``ValueError`` and turns the response into a 500
+    (with ``STRICT_JSON`` off, JSONRenderer renders them as before). Some
+    floats below 1e-4 are spelled differently, e.g. ``0.000015`` for
+    ``1.5e-05``, with the same value.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if (self.ensure_ascii or not self.compact or not self.strict
+                or self.get_indent(accepted_media_type, renderer_context or {}) is not None):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=orjson_default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError as e:
+            logger.debug(f"orjson could not render the response, using JSONRenderer: {e}")
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Same escaping as JSONRenderer so the output stays a strict javascript subset
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
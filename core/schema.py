@@ -0,0 +1,119 @@
+import hashlib
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from django.apps import apps
+from django.conf import settings
+from drf_yasg import openapi
+from drf_yasg.codecs import OpenAPICodecJson, OpenAPICodecYaml
+from drf_yasg.generators import OpenAPISchemaGenerator
+
+logger = logging.getLogger(__name__)
+
+API_INFO = openapi.Info(
+    title="FoxyHub API",
+    default_version='v1',
+    description="API documentation for FoxyHub",
+    terms_of_service="https://www.foxyhub.com/terms/",
+    contact=openapi.Contact(email="contact@foxyhub.com"),
+    license=openapi.License(name="BSD License"),
+)
+
+CODECS = {
+    '.json': OpenAPICodecJson,
+    '.yaml': OpenAPICodecYaml,
+}
+MEDIA_TYPES = {
+    '.json': 'application/json',
+    '.yaml': 'application/yaml',
+}
+MANIFEST_NAME = 'manifest.json'
+
+_code_version = None
+_documents: Dict[str, Tuple[bytes, str]] = {}
+_lock = threading.Lock()
+
+
+def get_code_version() -> str:
+    """
+    Return ``CODE_VERSION`` or, when it is not set, a fingerprint of our Python sources.
+    """
+    global _code_version
+    if settings.CODE_VERSION:
+        return settings.CODE_VERSION
+    if _code_version is None:
+        base_dir = Path(settings.BASE_DIR)
+        roots = {Path(config.path) for config in apps.get_app_configs()}
+        roots.add(base_dir / settings.ROOT_URLCONF.split('.')[0])
+        digest = hashlib.sha256()
+        for root in sorted(root for root in roots if root.is_relative_to(base_dir)):
+            for path in sorted(root.rglob('*.py')):
+                digest.update(str(path.relative_to(base_dir)).encode())
+                digest.update(path.read_bytes())
+        _code_version = digest.hexdigest()[:16]
+    return _code_version
+
+
+def generate_schema() -> openapi.Swagger:
+    """
+    Introspect every public endpoint; slow, so only done at build time or as a fallback.
+    """
+    return OpenAPISchemaGenerator(API_INFO).get_schema(request=None, public=True)
+
+
+def encode_schema(schema: openapi.Swagger) -> Dict[str, bytes]:
+    return {fmt: codec(validators=[]).encode(schema) for fmt, codec in CODECS.items()}
+
+
+def schema_path(fmt: str) -> Path:
+    return Path(settings.OPENAPI_SCHEMA_DIR) / f"openapi{fmt}"
+
+
+def read_manifest() -> Optional[Dict[str, str]]:
+    try:
+        return json.loads((Path(settings.OPENAPI_SCHEMA_DIR) / MANIFEST_NAME).read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def write_schema(documents: Dict[str, bytes], code_version: str):
+    schema_dir = Path(settings.OPENAPI_SCHEMA_DIR)
+    schema_dir.mkdir(parents=True, exist_ok=True)
+    for fmt, content in documents.items():
+        schema_path(fmt).write_bytes(content)
+    (schema_dir / MANIFEST_NAME).write_text(json.dumps({'code_version': code_version}))
+
+
+def _load_documents() -> Dict[str, Tuple[bytes, str]]:
+    code_version = get_code_version()
+    manifest = read_manifest()
+    documents = None
+    if manifest and manifest.get('code_version') == code_version:
+        try:
+            documents = {fmt: schema_path(fmt).read_bytes() for fmt in CODECS}
+        except OSError as e:
+            logger.warning(f"Could not read the precomputed OpenAPI schema: {e}")
+    if documents is None:
+        logger.warning(
+            f"No precomputed OpenAPI schema for code version {code_version}; "
+            f"generating it in-process (run build_openapi_schema at build time)"
+        )
+        documents = encode_schema(generate_schema())
+    return {
+        fmt: (content, f"{code_version}-{hashlib.sha256(content).hexdigest()[:16]}")
+        for fmt, content in documents.items()
+    }
+
+
+def get_schema_document(fmt: str) -> Tuple[bytes, str]:
+    """
+    Return the encoded schema and its ETag, loaded once per process.
+    """
+    if not _documents:
+        with _lock:
+            if not _documents:
+                _documents.update(_load_documents())
+    return _documents[fmt]
@@ -1,22 +1,42 @@
+import asyncio
+import base64
 import hashlib
+import hmac
 import json
 import uuid
-from typing import Dict, Any
+import weakref
+from typing import Dict, Any, Tuple
 
+import httpx
 import requests
 from django.conf import settings
 
+from core.metrics import track_external_call
+
+
+def sign_webhook_payload(data: Dict[str, Any], api_key: str) -> str:
+    """
+    Compute the signature Cryptomus attaches to webhook payloads.
+
+    Cryptomus signs the PHP ``json_encode`` form of the payload, which is
+    compact and escapes forward slashes.
+    """
+    encoded = json.dumps(data, separators=(',', ':')).replace('/', '\\/').encode()
+    return hashlib.md5(base64.b64encode(encoded) + api_key.encode()).hexdigest()
+
 
 class CryptomusClient:
     """
     Client for interacting with the Cryptomus payment gateway API.
     """
-    BASE_URL = "https://api.cryptomus.com/v1"
-    
+    TIMEOUT = 10
+
     def __init__(self):
+        self.base_url = settings.CRYPTOMUS_BASE_URL
         self.merchant_id = settings.CRYPTOMUS_MERCHANT_ID
         self.api_key = settings.CRYPTOMUS_API_KEY
-        
+        self.session = requests.Session()
+
     def _generate_sign(self, payload: Dict[str, Any]) -> str:
         """
         Generate signature for Cryptomus API requests.
@@ -26,7 +46,7 @@ class CryptomusClient:
             base64.b64encode(encoded_payload) + self.api_key.encode()
         ).hexdigest()
         return sign
-    
+
     def _get_headers(self, payload: Dict[str, Any]) -> Dict[str, str]:
         """
         Generate headers for Cryptomus API requests.
@@ -37,15 +57,36 @@ class CryptomusClient:
             'sign': sign,
             'Content-Type': 'application/json'
         }
-    
-    def create_payment(self, amount: float, currency: str, order_id: str, 
-                       description: str, callback_url: str) -> Dict[str, Any]:
+
+    def verify_webhook(self, data: Dict[str, Any]) -> bool:
         """
-        Create a new payment in Cryptomus.
+        Verify the signature of a webhook payload received from Cryptomus.
+        """
+        payload = dict(data)
+        sign = payload.pop('sign', None)
+        if not sign:
+            return False
+        return hmac.compare_digest(sign, sign_webhook_payload(payload, self.api_key))
+
+    def _prepare_request(self, payload: Dict[str, Any]) -> Tuple[bytes, Dict[str, str]]:
         """
-        endpoint = f"{self.BASE_URL}/payment"
-        
-        payload = {
+        Return the request body and headers, signed over the exact bytes sent.
+        """
+        return json.dumps(payload).encode(), self._get_headers(payload)
+
+    def _post(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        body, headers = self._prepare_request(payload)
+        with track_external_call('cryptomus', path):
+            response = self.session.post(
+                f"{self.base_url}{path}", data=body, headers=headers, timeout=self.TIMEOUT
+            )
+            response.raise_for_status()
+            return response.json()
+
+    @staticmethod
+    def _payment_payload(amount: float, currency: str, order_id: str,
+                         description: str, callback_url: str) -> Dict[str, Any]:
+        return {
             'amount': str(amount),
             'currency': currency,
             'order_id': order_id,
@@ -53,28 +94,69 @@ class CryptomusClient:
             'url_callback': callback_url,
             'is_payment_multiple': False,
         }
-        
-        headers = self._get_headers(payload)
-        
-        response = requests.post(endpoint, json=payload, headers=headers)
-        response.raise_for_status()
-        
-        return response.json()
-    
+
+    def create_payment(self, amount: float, currency: str, order_id: str,
+                       description: str, callback_url: str) -> Dict[str, Any]:
+        """
+        Create a new payment in Cryptomus.
+        """
+        payload = self._payment_payload(amount, currency, order_id, description, callback_url)
+        return self._post('/payment', payload)
+
     def get_payment_status(self, order_id: str) -> Dict[str, Any]:
         """
         Get the status of a payment by order ID.
         """
-        endpoint = f"{self.BASE_URL}/payment/info"
-        
-        payload = {
-            'order_id': order_id
-        }
-        
-        headers = self._get_headers(payload)
-        
-        response = requests.post(endpoint, json=payload, headers=headers)
-        response.raise_for_status()
-        
-        return response.json()
+        return self._post('/payment/info', {'order_id': order_id})
+
+
+class AsyncCryptomusClient(CryptomusClient):
+    """
+    Asyncio client for the Cryptomus API, for use from async (ASGI) views.
 
+    Instances share one ``httpx.AsyncClient`` per event loop, so connections
+    to the gateway are pooled across the requests a loop handles. Pooled
+    connections belong to the loop that opened them; a client is dropped
+    with its loop, such as the short-lived loops ``async_to_sync`` runs.
+    """
+    _clients = weakref.WeakKeyDictionary()
+
+    def __init__(self):
+        self.base_url = settings.CRYPTOMUS_BASE_URL
+        self.merchant_id = settings.CRYPTOMUS_MERCHANT_ID
+        self.api_key = settings.CRYPTOMUS_API_KEY
+
+    @classmethod
+    def _get_http(cls) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = cls._clients.get(loop)
+        if client is None:
+            client = cls._clients[loop] = httpx.AsyncClient(
+                timeout=cls.TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=settings.CRYPTOMUS_ASYNC_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.CRYPTOMUS_ASYNC_MAX_CONNECTIONS
+                )
+            )
+        return client
+
+    async def _post(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        body, headers = self._prepare_request(payload)
+        with track_external_call('cryptomus', path):
+            response = await self._get_http().post(f"{self.base_url}{path}", content=body, headers=headers)
+            response.raise_for_status()
+            return response.json()
+
+    async def create_payment(self, amount: float, currency: str, order_id: str,
+                             description: str, callback_url: str) -> Dict[str, Any]:
+        """
+        Create a new payment in Cryptomus.
+        """
+        payload = self._payment_payload(amount, currency, order_id, description, callback_url)
+        return await self._post('/payment', payload)
+
+    async def get_payment_status(self, order_id: str) -> Dict[str, Any]:
+        """
+        Get the status of a payment by order ID.
+        """
+        return await self._post('/payment/info', {'order_id': order_id})
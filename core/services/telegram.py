@@ -1,20 +1,39 @@
+import json
 import logging
+import time
+import uuid
 import requests
 from typing import Dict, Any, Optional
 
 from django.conf import settings
 
+from core.metrics import TELEGRAM_QUEUE_WAIT, TELEGRAM_SEND_LATENCY, track_external_call
+from core.ratelimit import RateLimiter
+from core.services.redis import get_redis_client
+
 logger = logging.getLogger(__name__)
 
+# Move a due message from its queue to the processing set, if it is still queued.
+CLAIM_SCRIPT = """
+if redis.call('ZREM', KEYS[1], ARGV[1]) == 1 then
+    redis.call('ZADD', KEYS[2], ARGV[2], ARGV[1])
+    return 1
+end
+return 0
+"""
+
 
 class TelegramClient:
     """
     Client for interacting with Telegram services.
     """
     
+    TIMEOUT = 10
+    
     def __init__(self):
         self.bot_token = settings.TELEGRAM_BOT_TOKEN
-        self.api_url = f"https://api.telegram.org/bot{self.bot_token}"
+        self.api_url = f"{settings.TELEGRAM_API_URL}/bot{self.bot_token}"
+        self.session = requests.Session()
     
     def send_message(self, chat_id: int, text: str) -> Dict[str, Any]:
         """
@@ -28,9 +47,15 @@ class TelegramClient:
         }
         
         try:
-            response = requests.post(endpoint, json=payload)
-            response.raise_for_status()
-            return response.json()
+            with track_external_call('telegram', 'sendMessage') as call:
+                response = self.session.post(endpoint, json=payload, timeout=self.TIMEOUT)
+                if 400 <= response.status_code < 500:
+                    # Flood control (429) carries parameters.retry_after; other
+                    # client errors, e.g. a chat that blocked the bot, carry error_code
+                    call.fail()
+                    return response.json()
+                response.raise_for_status()
+                return response.json()
         except requests.exceptions.RequestException as e:
             logger.error(f"Error sending Telegram message: {e}")
             return {'ok': False, 'error': str(e)}
@@ -50,6 +75,231 @@ class TelegramClient:
             return False
 
 
+class TelegramDispatchQueue:
+    """
+    Redis-backed outbound message queue that respects Bot API limits.
+
+    Messages wait in one sorted set per priority, scored by the time they
+    become sendable. ``drain`` sends transactional messages before
+    broadcasts. It keeps to the global limit (``TELEGRAM_GLOBAL_RATE_LIMIT``
+    messages per second) and sends at most one message per chat per
+    ``TELEGRAM_CHAT_INTERVAL_MS``. On a 429 it waits ``retry_after`` before
+    sending anything else. Only one drainer runs at a time, which keeps the
+    global limit exact.
+
+    A claimed message moves to a processing set and leaves it only once its
+    send has been handled, so delivery is at least once: messages a crashed
+    drainer left behind are queued again by the next ``drain``. Client
+    errors that cannot succeed on retry (``PERMANENT_ERROR_CODES``) are
+    dropped on the first failure.
+    """
+    PRIORITY_TRANSACTIONAL = 'transactional'
+    PRIORITY_BROADCAST = 'broadcast'
+    PRIORITIES = (PRIORITY_TRANSACTIONAL, PRIORITY_BROADCAST)
+    PERMANENT_ERROR_CODES = (400, 403)
+    
+    LOCK_KEY = 'telegram:dispatch:lock'
+    METRICS_KEY = 'telegram:dispatch:metrics'
+    
+    def __init__(self):
+        self.redis = get_redis_client()
+        self.claim_script = self.redis.register_script(CLAIM_SCRIPT)
+    
+    @staticmethod
+    def _queue_key(priority: str) -> str:
+        return f"telegram:dispatch:queue:{priority}"
+    
+    @staticmethod
+    def _processing_key(priority: str) -> str:
+        return f"telegram:dispatch:processing:{priority}"
+    
+    @staticmethod
+    def _chat_key(chat_id) -> str:
+        return f"telegram:dispatch:chat:{chat_id}"
+    
+    @staticmethod
+    def _now_ms() -> int:
+        return int(time.time() * 1000)
+    
+    def enqueue(self, chat_id, text: str, priority: str = PRIORITY_TRANSACTIONAL):
+        """
+        Queue a message for delivery.
+        """
+        self.enqueue_many([(chat_id, text)], priority)
+    
+    def enqueue_many(self, messages, priority: str = PRIORITY_TRANSACTIONAL):
+        """
+        Queue several ``(chat_id, text)`` messages in one round trip.
+        """
+        now = self._now_ms()
+        members = {
+            json.dumps({
+                'id': uuid.uuid4().hex,
+                'chat_id': chat_id,
+                'text': text,
+                'enqueued_at': now,
+                'attempts': 0,
+            }): now
+            for chat_id, text in messages
+        }
+        if not members:
+            return
+        self.redis.zadd(self._queue_key(priority), members)
+        
+        if priority == self.PRIORITY_TRANSACTIONAL:
+            # Don't leave transactional messages waiting for the next beat
+            from core.tasks import PRIORITY_HIGH, drain_telegram_queue
+            drain_telegram_queue.apply_async(priority=PRIORITY_HIGH)
+    
+    def _claim(self, priority: str, member) -> bool:
+        keys = [self._queue_key(priority), self._processing_key(priority)]
+        return bool(self.claim_script(keys=keys, args=[member, self._now_ms()]))
+    
+    def _recover(self):
+        # Only one drainer holds the lock, so anything still processing was cut short
+        now = self._now_ms()
+        for priority in self.PRIORITIES:
+            members = self.redis.zrange(self._processing_key(priority), 0, -1)
+            if not members:
+                continue
+            logger.warning(f"Requeueing {len(members)} unacknowledged {priority} Telegram messages")
+            pipe = self.redis.pipeline()
+            pipe.zadd(self._queue_key(priority), {member: now for member in members})
+            pipe.zrem(self._processing_key(priority), *members)
+            pipe.execute()
+    
+    def _next_batch(self, size: int):
+        now = self._now_ms()
+        for priority in self.PRIORITIES:
+            members = self.redis.zrangebyscore(self._queue_key(priority), '-inf', now, start=0, num=size)
+            if members:
+                return priority, members
+        return None, []
+    
+    def drain(self, max_seconds: float = None) -> Dict[str, int]:
+        """
+        Send due messages for up to ``max_seconds``; returns counters for the run.
+        """
+        max_seconds = max_seconds or settings.TELEGRAM_DISPATCH_DRAIN_SECONDS
+        stats = {'sent': 0, 'failed': 0, 'deferred': 0, 'rate_limited': 0}
+        
+        lock = self.redis.lock(self.LOCK_KEY, timeout=max_seconds + 30)
+        if not lock.acquire(blocking=False):
+            return stats
+        
+        try:
+            self._recover()
+            client = TelegramClient()
+            limiter = RateLimiter(settings.TELEGRAM_GLOBAL_RATE_LIMIT)
+            deadline = time.monotonic() + max_seconds
+            
+            while time.monotonic() < deadline:
+                priority, members = self._next_batch(settings.TELEGRAM_DISPATCH_BATCH_SIZE)
+                if not members:
+                    break
+                
+                for member in members:
+                    if time.monotonic() >= deadline:
+                        break
+                    if not self._claim(priority, member):
+                        continue
+                    message = json.loads(member)
+                    
+                    # One message per chat per interval
+                    if not self.redis.set(self._chat_key(message['chat_id']), 1,
+                                          px=settings.TELEGRAM_CHAT_INTERVAL_MS, nx=True):
+                        wait_ms = max(self.redis.pttl(self._chat_key(message['chat_id'])), 1)
+                        pipe = self.redis.pipeline()
+                        pipe.zrem(self._processing_key(priority), member)
+                        pipe.zadd(self._queue_key(priority), {member: self._now_ms() + wait_ms})
+                        pipe.execute()
+                        stats['deferred'] += 1
+                        continue
+                    
+                    limiter.acquire()
+                    retry_after = self._send(client, priority, member, message, stats)
+                    if retry_after:
+                        # Global flood control: stop sending until it lifts
+                        if time.monotonic() + retry_after >= deadline:
+                            return stats
+                        time.sleep(retry_after)
+        finally:
+            lock.release()
+        
+        return stats
+    
+    def _send(self, client: TelegramClient, priority: str, member, message: Dict[str, Any],
+              stats: Dict[str, int]) -> Optional[int]:
+        started = time.monotonic()
+        result = client.send_message(chat_id=message['chat_id'], text=message['text'])
+        latency_ms = (time.monotonic() - started) * 1000
+        TELEGRAM_SEND_LATENCY.labels(priority).observe(latency_ms / 1000)
+        
+        # Acknowledge the claim in the same transaction that records the outcome
+        pipe = self.redis.pipeline()
+        pipe.zrem(self._processing_key(priority), member)
+        pipe.hincrbyfloat(self.METRICS_KEY, 'send_latency_ms_sum', latency_ms)
+        pipe.hincrby(self.METRICS_KEY, 'send_count', 1)
+        
+        if result.get('ok'):
+            stats['sent'] += 1
+            pipe.hincrby(self.METRICS_KEY, 'sent', 1)
+            queue_wait_ms = self._now_ms() - message['enqueued_at']
+            TELEGRAM_QUEUE_WAIT.labels(priority).observe(queue_wait_ms / 1000)
+            pipe.hincrbyfloat(self.METRICS_KEY, 'queue_wait_ms_sum', queue_wait_ms)
+            pipe.execute()
+            return None
+        
+        retry_after = (result.get('parameters') or {}).get('retry_after')
+        message['attempts'] += 1
+        if result.get('error_code') in self.PERMANENT_ERROR_CODES:
+            stats['failed'] += 1
+            pipe.hincrby(self.METRICS_KEY, 'failed', 1)
+            logger.warning(
+                f"Dropping Telegram message to {message['chat_id']}: {result.get('description')}"
+            )
+        elif retry_after:
+            stats['rate_limited'] += 1
+            pipe.hincrby(self.METRICS_KEY, 'rate_limited', 1)
+            pipe.zadd(self._queue_key(priority), {json.dumps(message): self._now_ms() + retry_after * 1000})
+        elif message['attempts'] < settings.TELEGRAM_DISPATCH_MAX_ATTEMPTS:
+            backoff_ms = 1000 * 2 ** message['attempts']
+            pipe.zadd(self._queue_key(priority), {json.dumps(message): self._now_ms() + backoff_ms})
+        else:
+            stats['failed'] += 1
+            pipe.hincrby(self.METRICS_KEY, 'failed', 1)
+            logger.error(f"Dropping Telegram message to {message['chat_id']} after {message['attempts']} attempts")
+        pipe.execute()
+        return retry_after
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return queue depth per priority and delivery metrics.
+        """
+        now = self._now_ms()
+        pipe = self.redis.pipeline()
+        for priority in self.PRIORITIES:
+            pipe.zcard(self._queue_key(priority))
+            pipe.zcount(self._queue_key(priority), '-inf', now)
+            pipe.zcard(self._processing_key(priority))
+        pipe.hgetall(self.METRICS_KEY)
+        results = pipe.execute()
+        
+        metrics = {key.decode(): float(value) for key, value in results[-1].items()}
+        send_count = metrics.get('send_count', 0)
+        sent = metrics.get('sent', 0)
+        return {
+            'depth': {priority: results[i * 3] for i, priority in enumerate(self.PRIORITIES)},
+            'ready': {priority: results[i * 3 + 1] for i, priority in enumerate(self.PRIORITIES)},
+            'processing': {priority: results[i * 3 + 2] for i, priority in enumerate(self.PRIORITIES)},
+            'sent': int(sent),
+            'failed': int(metrics.get('failed', 0)),
+            'rate_limited': int(metrics.get('rate_limited', 0)),
+            'avg_send_latency_ms': metrics.get('send_latency_ms_sum', 0) / send_count if send_count else 0.0,
+            'avg_queue_wait_ms': metrics.get('queue_wait_ms_sum', 0) / sent if sent else 0.0,
+        }
+
+
 class TelegramPremiumService:
     """
     Service for handling Telegram Premium purchases.
@@ -0,0 +1,54 @@
+import hashlib
+import os
+import re
+
+from django.core.files.storage import FileSystemStorage
+from whitenoise.compress import Compressor
+
+# Names written by HashedMediaStorage: <name>.<12 hex digits>.<ext>
+HASHED_NAME_RE = re.compile(r'\.[0-9a-f]{12}\.[^./]+$')
+COMPRESSED_SUFFIXES = ('.br', '.gz')
+
+
+def is_hashed_name(name: str) -> bool:
+    return bool(HASHED_NAME_RE.search(name))
+
+
+class HashedMediaStorage(FileSystemStorage):
+    """
+    File storage for uploads that names each file after a hash of its
+    content, like ManifestStaticFilesStorage does for static files.
+
+    A name never changes content, so media URLs can be cached forever, and
+    re-uploading the same file reuses it. Compressible files (SVG, JSON,
+    text...) also get Brotli and gzip siblings for ``core.views.media_view``;
+    already-compressed formats such as JPEG and PNG are left alone.
+    """
+    compressor = Compressor(quiet=True)
+    hash_length = len('.0123456789ab')
+
+    def get_available_name(self, name, max_length=None):
+        # Leave room for the hash _save adds
+        return super().get_available_name(name, max_length - self.hash_length if max_length else None)
+
+    def _save(self, name, content):
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+        root, ext = os.path.splitext(name)
+        name = f"{root}.{digest.hexdigest()[:12]}{ext}"
+        if self.exists(name):
+            return name
+
+        name = super()._save(name, content)
+        path = self.path(name)
+        if self.compressor.should_compress(path):
+            for _ in self.compressor.compress(path):
+                pass
+        return name
+
+    def delete(self, name):
+        super().delete(name)
+        for suffix in COMPRESSED_SUFFIXES:
+            super().delete(name + suffix)
@@ -0,0 +1,36 @@
+from celery import shared_task
+
+from core.outbox import purge_published_events, relay_events
+from core.services.telegram import TelegramDispatchQueue
+
+# Task priorities within a queue (CELERY_TASK_DEFAULT_PRIORITY is PRIORITY_NORMAL); Redis serves 0 first
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 5
+PRIORITY_LOW = 9
+
+
+# Safe to run twice: drain() holds a lock. A message leaves Redis only once its send is
+# handled, so a drain killed mid-send is finished by the next one (possibly sending it again)
+@shared_task(ignore_result=True, acks_late=True, reject_on_worker_lost=True)
+def drain_telegram_queue():
+    """
+    Deliver queued Telegram messages within Bot API rate limits.
+    """
+    TelegramDispatchQueue().drain()
+
+
+# Safe to run twice: batches are claimed with SKIP LOCKED and consumers ignore repeated events
+@shared_task(ignore_result=True, acks_late=True, reject_on_worker_lost=True)
+def relay_outbox():
+    """
+    Hand pending outbox events to their consumers.
+    """
+    relay_events()
+
+
+@shared_task(ignore_result=True, acks_late=True, reject_on_worker_lost=True)
+def purge_outbox():
+    """
+    Delete outbox events that were published long ago.
+    """
+    purge_published_events()
@@ -0,0 +1,109 @@
+import threading
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from core.cache import NamespacedCache
+
+
+class NamespacedCacheTests(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.ns = NamespacedCache('test', timeout=60)
+
+    def test_get_reads_version_and_value_in_one_call(self):
+        self.ns.set('key', 'value')
+        stored = cache.get_many([self.ns._version_key(), self.ns._key('key')])
+        with mock.patch.object(cache, 'get', side_effect=AssertionError('extra round trip')):
+            with mock.patch.object(cache, 'get_many', return_value=stored) as get_many:
+                self.assertEqual(self.ns.get('key'), 'value')
+        get_many.assert_called_once()
+
+    def test_invalidate_bumps_the_version_and_hides_old_values(self):
+        self.ns.set('key', 'value')
+        version = self.ns.get_version()
+
+        self.assertEqual(self.ns.invalidate(), version + 1)
+        self.assertIsNone(self.ns.get('key'))
+        self.assertEqual(self.ns.get_or_set('key', lambda: 'new'), 'new')
+        self.assertEqual(self.ns.get('key'), 'new')
+
+    def test_invalidate_recovers_from_an_evicted_version(self):
+        self.ns.set('key', 'value')
+        cache.delete(self.ns._version_key())
+
+        self.ns.invalidate()
+        self.assertIsNone(self.ns.get('key'))
+
+    def test_namespaces_are_independent(self):
+        other = NamespacedCache('other', timeout=60)
+        self.ns.set('key', 'value')
+        other.set('key', 'other value')
+
+        other.invalidate()
+        self.assertEqual(self.ns.get('key'), 'value')
+        self.assertIsNone(other.get('key'))
+
+    def test_local_copies_are_dropped_on_invalidate(self):
+        ns = NamespacedCache('local', timeout=60, local_maxsize=10, local_ttl=60)
+        ns.set('key', 'value')
+        with mock.patch.object(cache, 'get_many', side_effect=AssertionError('not served locally')):
+            self.assertEqual(ns.get('key'), 'value')
+
+        ns.invalidate()
+        self.assertIsNone(ns.get('key'))
+
+    def test_get_or_set_computes_once_for_concurrent_callers(self):
+        calls = []
+        started = threading.Event()
+
+        def compute():
+            calls.append(1)
+            started.set()
+            time.sleep(0.2)
+            return 'value'
+
+        results = []
+        first = threading.Thread(target=lambda: results.append(self.ns.get_or_set('key', compute)))
+        first.start()
+        started.wait()
+        others = [
+            threading.Thread(target=lambda: results.append(self.ns.get_or_set('key', compute)))
+            for _ in range(4)
+        ]
+        for thread in others:
+            thread.start()
+        for thread in [first] + others:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ['value'] * 5)
+
+    def test_get_or_set_refreshes_early_near_expiry(self):
+        with mock.patch('core.cache.time.monotonic', side_effect=[0.0, 2.0]):
+            self.ns.get_or_set('key', lambda: 'old')
+
+        # With 2 s of compute time, an entry 1 s from expiry refreshes when random() is high...
+        with mock.patch('core.cache.time.time', return_value=time.time() + 59):
+            with mock.patch('core.cache.random.random', return_value=0.9):
+                self.assertEqual(self.ns.get_or_set('key', lambda: 'new'), 'new')
+
+    def test_get_or_set_keeps_the_value_far_from_expiry(self):
+        with mock.patch('core.cache.time.monotonic', side_effect=[0.0, 2.0]):
+            self.ns.get_or_set('key', lambda: 'old')
+
+        # ...but not with most of its lifetime left
+        with mock.patch('core.cache.random.random', return_value=0.9):
+            self.assertEqual(self.ns.get_or_set('key', lambda: 'new'), 'old')
+
+    def test_concurrent_refresh_serves_the_current_value(self):
+        with mock.patch('core.cache.time.monotonic', side_effect=[0.0, 2.0]):
+            self.ns.get_or_set('key', lambda: 'old')
+        cache.add(self.ns._lock_key('key', self.ns.get_version()), 1)
+
+        with mock.patch('core.cache.time.time', return_value=time.time() + 59):
+            with mock.patch('core.cache.random.random', return_value=0.9):
+                self.assertEqual(self.ns.get_or_set('key', lambda: 'new'), 'old')
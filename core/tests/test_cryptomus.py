@@ -0,0 +1,19 @@
+import asyncio
+
+from django.test import SimpleTestCase
+
+from core.services.cryptomus import AsyncCryptomusClient
+
+
+class AsyncClientPoolTests(SimpleTestCase):
+
+    async def get_clients(self):
+        return AsyncCryptomusClient._get_http(), AsyncCryptomusClient._get_http()
+
+    def test_one_client_per_event_loop(self):
+        first, again = asyncio.run(self.get_clients())
+        self.assertIs(first, again)
+
+        # A new loop, as async_to_sync makes per request under WSGI, must not reuse the old pool
+        second, _ = asyncio.run(self.get_clients())
+        self.assertIsNot(second, first)
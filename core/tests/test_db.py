@@ -0,0 +1,61 @@
+from unittest import mock
+
+from django.db import DEFAULT_DB_ALIAS
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TransactionTestCase, override_settings
+
+from core.db import ReplicaPinningMiddleware, ReplicaRouter
+from products.cache import catalog_cache
+from products.models import Category, Product
+from products.views import CategoryViewSet
+
+
+@override_settings(DATABASE_REPLICAS={'replica1': 1})
+@mock.patch('core.db.choose_replica', return_value='replica1')
+class ReplicaPinningTests(SimpleTestCase):
+    factory = RequestFactory()
+
+    def read_alias(self, request):
+        aliases = []
+
+        def view(request):
+            aliases.append(ReplicaRouter().db_for_read(Product))
+            return HttpResponse()
+
+        ReplicaPinningMiddleware(view)(request)
+        return aliases[0]
+
+    def test_safe_requests_read_from_replicas(self, choose_replica):
+        self.assertEqual(self.read_alias(self.factory.get('/')), 'replica1')
+        self.assertEqual(self.read_alias(self.factory.head('/')), 'replica1')
+
+    def test_unsafe_requests_read_from_the_primary(self, choose_replica):
+        # e.g. checkout validates products and variants before it writes the order
+        for method in ('post', 'put', 'patch', 'delete'):
+            self.assertEqual(self.read_alias(getattr(self.factory, method)('/')), DEFAULT_DB_ALIAS)
+
+    @override_settings(DATABASE_REPLICA_PIN_COOKIE='db_primary')
+    def test_pinned_clients_read_from_the_primary(self, choose_replica):
+        request = self.factory.get('/')
+        request.COOKIES['db_primary'] = '1'
+        self.assertEqual(self.read_alias(request), DEFAULT_DB_ALIAS)
+
+
+@override_settings(DATABASE_REPLICAS={'replica1': 1})
+@mock.patch('core.db.choose_replica', return_value='replica1')
+class CatalogCacheRoutingTests(TransactionTestCase):
+    # Not TestCase: reads inside its transaction always go to the primary
+    factory = RequestFactory()
+
+    def setUp(self):
+        catalog_cache.invalidate()
+        Category.objects.create(name='Telegram', slug='telegram')
+
+    def test_cached_listing_is_computed_on_the_primary(self, choose_replica):
+        # A listing cached from a lagging replica right after invalidation would outlive the change
+        view = ReplicaPinningMiddleware(CategoryViewSet.as_view({'get': 'list'}))
+        response = view(self.factory.get('/api/products/categories/'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([category['name'] for category in response.data['results']], ['Telegram'])
+        choose_replica.assert_not_called()
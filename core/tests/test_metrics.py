@@ -0,0 +1,53 @@
+from unittest import mock
+
+import redis
+from django.test import SimpleTestCase, override_settings
+from prometheus_client import generate_latest
+
+from core.metrics import QUEUE_REGISTRY
+
+STATS = {
+    'depth': {'transactional': 3, 'broadcast': 40},
+    'ready': {'transactional': 1, 'broadcast': 40},
+    'processing': {'transactional': 0, 'broadcast': 1},
+    'sent': 7,
+    'failed': 1,
+    'rate_limited': 2,
+    'avg_send_latency_ms': 120.0,
+    'avg_queue_wait_ms': 900.0,
+}
+
+
+class TelegramQueueCollectorTests(SimpleTestCase):
+
+    def test_reads_queue_at_scrape_time(self):
+        with mock.patch('core.services.telegram.TelegramDispatchQueue.__init__', return_value=None), \
+                mock.patch('core.services.telegram.TelegramDispatchQueue.stats', return_value=STATS):
+            body = generate_latest(QUEUE_REGISTRY).decode()
+
+        self.assertIn('telegram_queue_depth{priority="broadcast"} 40.0', body)
+        self.assertIn('telegram_queue_ready{priority="transactional"} 1.0', body)
+        self.assertIn('telegram_messages_total{outcome="sent"} 7.0', body)
+
+    def test_scrape_survives_redis_outage(self):
+        with mock.patch('core.services.telegram.TelegramDispatchQueue.__init__', return_value=None), \
+                mock.patch('core.services.telegram.TelegramDispatchQueue.stats',
+                           side_effect=redis.ConnectionError('down')):
+            body = generate_latest(QUEUE_REGISTRY).decode()
+
+        self.assertNotIn('telegram_queue_depth', body)
+
+
+class MetricsViewAuthTests(SimpleTestCase):
+
+    @override_settings(DEBUG=False, METRICS_AUTH_TOKEN='')
+    def test_refused_without_token_outside_debug(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+
+    @override_settings(DEBUG=False, METRICS_AUTH_TOKEN='secret')
+    def test_requires_bearer_token(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+        with mock.patch('core.services.telegram.TelegramDispatchQueue.__init__', return_value=None), \
+                mock.patch('core.services.telegram.TelegramDispatchQueue.stats', side_effect=redis.ConnectionError):
+            response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,47 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from kombu.exceptions import OperationalError
+
+from core import outbox
+from core.models import OutboxEvent
+
+CONSUMERS = {'test.event': ['tests.consume']}
+
+
+@override_settings(OUTBOX_CONSUMERS=CONSUMERS, OUTBOX_RELAY_MAX_ATTEMPTS=2)
+class RelayEventsTests(TestCase):
+
+    def setUp(self):
+        self.events = [OutboxEvent.objects.create(topic='test.event', payload={'n': n}) for n in range(3)]
+        self.poison = self.events[0]
+
+    def send_task(self, name, args=(), **kwargs):
+        if args[2]['n'] == 0:
+            raise ValueError('cannot serialize')
+
+    def test_failing_event_does_not_block_the_rest(self):
+        with mock.patch.object(outbox.current_app, 'send_task', side_effect=self.send_task):
+            stats = outbox.relay_events(batch_size=2)
+
+        self.assertEqual(stats, {'relayed': 2, 'failed': 1})
+        self.poison.refresh_from_db()
+        self.assertIsNone(self.poison.published_at)
+        self.assertEqual(self.poison.attempts, 1)
+
+    def test_event_is_dead_lettered_after_max_attempts(self):
+        with mock.patch.object(outbox.current_app, 'send_task', side_effect=self.send_task) as send_task:
+            for _ in range(3):
+                outbox.relay_events()
+
+        self.poison.refresh_from_db()
+        self.assertEqual(self.poison.attempts, 2)
+        poison_sends = [call for call in send_task.call_args_list if call.kwargs['args'][2]['n'] == 0]
+        self.assertEqual(len(poison_sends), 2)
+
+    def test_unreachable_broker_stops_the_run(self):
+        with mock.patch.object(outbox.current_app, 'send_task', side_effect=OperationalError('down')) as send_task:
+            stats = outbox.relay_events()
+
+        self.assertEqual(stats, {'relayed': 0, 'failed': 1})
+        self.assertEqual(send_task.call_count, 1)
@@ -0,0 +1,140 @@
+import datetime
+import decimal
+import io
+import uuid
+
+from django.test import SimpleTestCase
+from django.utils import timezone, translation
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from core.parsers import ORJSONParser
+from core.renderers import ORJSONRenderer
+
+TEHRAN = datetime.timezone(datetime.timedelta(hours=3, minutes=30))
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    """
+    ORJSONRenderer must render the same bytes as JSONRenderer.
+    """
+
+    def assertSameBytes(self, data, media_type=None, renderer=ORJSONRenderer, reference=JSONRenderer):
+        self.assertEqual(renderer().render(data, media_type), reference().render(data, media_type))
+
+    def test_basic_types(self):
+        self.assertSameBytes({
+            'string': 'text', 'int': 42, 'float': 0.1, 'negative': -1.5e-3, 'bool': True, 'none': None,
+            'list': [1, 'two', [3.0]], 'nested': {'a': {'b': []}}, 1: 'int key',
+        })
+
+    def test_decimal_and_uuid(self):
+        self.assertSameBytes({
+            'price': decimal.Decimal('1234567.89'),
+            'zero': decimal.Decimal('0.00'),
+            'id': uuid.UUID('0190a3c2-7b1e-7c3d-9f00-123456789abc'),
+        })
+
+    def test_lazy_translations(self):
+        for language in ('en', 'fa'):
+            with translation.override(language):
+                self.assertSameBytes({'message': _('OTP sent successfully'), 'detail': _('Verification not found')})
+
+    def test_dates_and_times(self):
+        self.assertSameBytes({
+            'utc': datetime.datetime(2024, 3, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+            'tehran': datetime.datetime(2024, 3, 1, 12, 30, tzinfo=TEHRAN),
+            'now': timezone.now(),
+            'naive': datetime.datetime(2024, 3, 1, 12, 30),
+            'date': datetime.date(2024, 3, 1),
+            'time': datetime.time(23, 59, 59, 999),
+            'duration': datetime.timedelta(hours=1, seconds=1.5),
+        })
+
+    def test_non_ascii_and_line_separators(self):
+        self.assertSameBytes({'fa': 'سفارش شما تکمیل شد 🦊', 'separators': 'a\u2028b\u2029c', 'escapes': '"\\\n\t'})
+
+    def test_large_integers(self):
+        self.assertSameBytes({'big': 2 ** 64, 'negative': -(2 ** 70), 'max': 2 ** 63 - 1})
+
+    def test_none_renders_empty_body(self):
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+    def test_ensure_ascii_falls_back(self):
+        class ASCIIRenderer(ORJSONRenderer):
+            ensure_ascii = True
+
+        class ASCIIReference(JSONRenderer):
+            ensure_ascii = True
+
+        self.assertSameBytes({'fa': 'سلام'}, renderer=ASCIIRenderer, reference=ASCIIReference)
+
+    def test_indent_falls_back(self):
+        self.assertSameBytes({'a': [1, 2], 'b': 'سلام'}, 'application/json; indent=4')
+
+    def test_nan_renders_as_null(self):
+        data = {'nan': float('nan'), 'inf': float('inf'), 'ninf': float('-inf')}
+        self.assertEqual(ORJSONRenderer().render(data), b'{"nan":null,"inf":null,"ninf":null}')
+        with self.assertRaises(ValueError):
+            JSONRenderer().render(data)
+
+    def test_small_floats_keep_their_value(self):
+        data = [1.5e-05, 1e-07, 5e-324]
+        self.assertEqual(ORJSONRenderer().render(data), b'[0.000015,1e-7,5e-324]')
+        self.assertEqual(JSONParser().parse(io.BytesIO(ORJSONRenderer().render(data))), data)
+
+    def test_nan_without_strict_json_falls_back(self):
+        class LenientRenderer(ORJSONRenderer):
+            strict = False
+
+        class LenientReference(JSONRenderer):
+            strict = False
+
+        self.assertSameBytes({'nan': float('nan')}, renderer=LenientRenderer, reference=LenientReference)
+
+
+class ORJSONParserTests(SimpleTestCase):
+    """
+    ORJSONParser must return the same data, and raise the same errors, as JSONParser.
+    """
+
+    def parse(self, parser, body, encoding='utf-8'):
+        return parser().parse(io.BytesIO(body), 'application/json', {'encoding': encoding})
+
+    def assertSameData(self, body, encoding='utf-8'):
+        self.assertEqual(self.parse(ORJSONParser, body, encoding), self.parse(JSONParser, body, encoding))
+
+    def assertSameError(self, body):
+        with self.assertRaises(ParseError) as expected:
+            self.parse(JSONParser, body)
+        with self.assertRaises(ParseError) as raised:
+            self.parse(ORJSONParser, body)
+        self.assertEqual(str(raised.exception), str(expected.exception))
+
+    def test_basic_types(self):
+        self.assertSameData(
+            b'{"phone_number": "+989120000000", "items": [{"quantity": 2, "price": 9.99}], "ok": true, "x": null}'
+        )
+
+    def test_non_ascii_and_line_separators(self):
+        self.assertSameData('{"fa": "سلام 🦊", "sep": "a\u2028b", "esc": "\\u2029\\n"}'.encode())
+
+    def test_large_integers(self):
+        body = b'{"big": 123456789012345678901234567890, "max": 18446744073709551615, "neg": -99999999999999999999}'
+        self.assertSameData(body)
+        self.assertEqual(self.parse(ORJSONParser, body)['big'], 123456789012345678901234567890)
+
+    def test_other_encodings(self):
+        self.assertSameData('{"name": "café"}'.encode('latin-1'), encoding='latin-1')
+
+    def test_invalid_json(self):
+        self.assertSameError(b'{"phone_number": ')
+        self.assertSameError(b'')
+        self.assertSameError(b'\xff\xfe')
+
+    def test_nan_is_rejected(self):
+        # Strict JSON has no NaN or Infinity; both parsers refuse them
+        self.assertSameError(b'{"amount": NaN}')
+        self.assertSameError(b'[Infinity]')
@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.test import SimpleTestCase, override_settings
+from rest_framework.parsers import JSONParser
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from core.throttling import OTPRequestThrottle
+
+
+def rest_framework_settings(**overrides):
+    return override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, **overrides})
+
+
+class ClientAddressTests(SimpleTestCase):
+    factory = APIRequestFactory()
+
+    def buckets(self, forwarded_for, remote_addr='10.0.0.1'):
+        request = Request(self.factory.post(
+            '/', {'phone_number': '+989120000000'}, format='json',
+            HTTP_X_FORWARDED_FOR=forwarded_for, REMOTE_ADDR=remote_addr
+        ), parsers=[JSONParser()])
+        return dict(
+            (key.split(':')[2], key) for key, _ in OTPRequestThrottle().get_buckets(request, None)
+        )
+
+    @rest_framework_settings(NUM_PROXIES=0)
+    def test_forwarded_for_is_ignored_without_proxies(self):
+        buckets = self.buckets('198.51.100.7')
+        self.assertEqual(buckets['ip'], 'throttle:otp_request:ip:10.0.0.1')
+        self.assertEqual(buckets['subnet'], 'throttle:otp_request:subnet:10.0.0.0/24')
+
+    def test_rotating_forwarded_for_keeps_the_same_buckets(self):
+        # With the project's settings, a client cannot pick its own buckets
+        self.assertEqual(self.buckets('198.51.100.7'), self.buckets('203.0.113.9, 192.0.2.1'))
+
+    @rest_framework_settings(NUM_PROXIES=1)
+    def test_client_address_is_taken_from_the_trusted_proxy(self):
+        # Only the last hop was added by our proxy; anything before it came from the client
+        buckets = self.buckets('203.0.113.9, 198.51.100.7')
+        self.assertEqual(buckets['ip'], 'throttle:otp_request:ip:198.51.100.7')
+        self.assertEqual(self.buckets('192.0.2.1, 198.51.100.7'), buckets)
@@ -0,0 +1,147 @@
+import ipaddress
+import logging
+from typing import List, Optional, Tuple
+
+import redis
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+from core.services.redis import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# Token buckets for every key, checked and charged in one round trip.
+# ARGV holds (capacity, tokens per millisecond) pairs, one per key. A request
+# is allowed only if every bucket has a token; otherwise nothing is charged
+# and the script returns the milliseconds until the emptiest bucket refills.
+TOKEN_BUCKET_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local wait = 0
+local tokens = {}
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[i * 2 - 1])
+    local rate = tonumber(ARGV[i * 2])
+    local state = redis.call('HMGET', key, 'tokens', 'ts')
+    local available = tonumber(state[1]) or capacity
+    local updated = tonumber(state[2]) or now
+    available = math.min(capacity, available + math.max(0, now - updated) * rate)
+    if available < 1 then
+        wait = math.max(wait, math.ceil((1 - available) / rate))
+    end
+    tokens[i] = available
+end
+if wait > 0 then
+    return wait
+end
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[i * 2 - 1])
+    local rate = tonumber(ARGV[i * 2])
+    redis.call('HSET', key, 'tokens', tokens[i] - 1, 'ts', now)
+    redis.call('PEXPIRE', key, math.ceil(capacity / rate))
+end
+return 0
+"""
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate: str) -> Tuple[int, float]:
+    """
+    Parse a DRF-style rate such as ``'5/min'`` into (capacity, tokens per millisecond).
+    """
+    num, period = rate.split('/')
+    capacity = int(num)
+    return capacity, capacity / (PERIODS[period[0]] * 1000)
+
+
+class RedisTokenBucketThrottle(BaseThrottle):
+    """
+    Token-bucket throttle that checks several identities at once.
+
+    Subclasses set ``scope`` and list the identities to throttle on; each
+    identity ``<name>`` takes its rate from ``DEFAULT_THROTTLE_RATES`` under
+    ``<scope>_<name>``. All buckets are evaluated by a single Lua call. If
+    Redis is unavailable the request is let through.
+    """
+    scope = None
+    identities = ('ip',)
+
+    _script = None
+
+    def __init__(self):
+        self.wait_seconds = None
+
+    @classmethod
+    def get_script(cls):
+        if RedisTokenBucketThrottle._script is None:
+            RedisTokenBucketThrottle._script = get_redis_client().register_script(TOKEN_BUCKET_SCRIPT)
+        return RedisTokenBucketThrottle._script
+
+    def get_identity(self, name: str, request, view) -> Optional[str]:
+        if name == 'ip':
+            return self.get_ident(request)
+        if name == 'subnet':
+            return self.get_subnet(request)
+        raise NotImplementedError(f"Unknown throttle identity '{name}'")
+
+    def get_subnet(self, request) -> Optional[str]:
+        try:
+            address = ipaddress.ip_address(self.get_ident(request))
+        except ValueError:
+            return None
+        prefix = 24 if address.version == 4 else 64
+        return str(ipaddress.ip_network(f"{address}/{prefix}", strict=False))
+
+    def get_buckets(self, request, view) -> List[Tuple[str, str]]:
+        buckets = []
+        for name in self.identities:
+            rate = api_settings.DEFAULT_THROTTLE_RATES.get(f"{self.scope}_{name}")
+            identity = self.get_identity(name, request, view)
+            if rate and identity:
+                buckets.append((f"throttle:{self.scope}:{name}:{identity}", rate))
+        return buckets
+
+    def allow_request(self, request, view):
+        buckets = self.get_buckets(request, view)
+        if not buckets:
+            return True
+
+        args = []
+        for _, rate in buckets:
+            args.extend(parse_rate(rate))
+
+        try:
+            wait_ms = self.get_script()(keys=[key for key, _ in buckets], args=args)
+        except redis.RedisError as e:
+            logger.warning(f"Throttle check skipped, Redis unavailable: {e}")
+            return True
+
+        if wait_ms:
+            self.wait_seconds = wait_ms / 1000
+            return False
+        return True
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class PhoneNumberThrottle(RedisTokenBucketThrottle):
+    """
+    Throttle by the submitted phone number, client IP and client subnet.
+    """
+    identities = ('phone', 'ip', 'subnet')
+
+    def get_identity(self, name, request, view):
+        if name == 'phone':
+            data = request.data if hasattr(request.data, 'get') else {}
+            return str(data.get('phone_number') or '').strip() or None
+        return super().get_identity(name, request, view)
+
+
+class OTPRequestThrottle(PhoneNumberThrottle):
+    scope = 'otp_request'
+
+
+class OTPVerifyThrottle(PhoneNumberThrottle):
+    scope = 'otp_verify'
@@ -1,12 +1,20 @@
 from django.urls import path
 from rest_framework_simplejwt.views import TokenRefreshView
 
-from .views import HealthCheckView
+from .views import (
+    HealthCheckView, LivenessView, ReadinessView,
+    ProfileTokenView, ProfileListView, ProfileDetailView
+)
 
 app_name = 'core'
 
 urlpatterns = [
     path('health/', HealthCheckView.as_view(), name='health-check'),
+    path('health/live/', LivenessView.as_view(), name='health-live'),
+    path('health/ready/', ReadinessView.as_view(), name='health-ready'),
+    path('profiles/', ProfileListView.as_view(), name='profile-list'),
+    path('profiles/token/', ProfileTokenView.as_view(), name='profile-token'),
+    path('profiles/<str:profile_id>/', ProfileDetailView.as_view(), name='profile-detail'),
     path('token/refresh/', TokenRefreshView.as_view(), name='token-refresh'),
 ]
 
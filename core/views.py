@@ -1,8 +1,26 @@
+import hmac
+
+from django.conf import settings
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.views.decorators.http import condition, require_safe
+from django.views.static import serve
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from rest_framework.exceptions import NotFound
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAdminUser
 from rest_framework import status
 
+from .compression import accepts_encoding
+from .health import monitor
+from .metrics import QUEUE_REGISTRY, get_registry
+from .profiling import PROFILE_HEADER, get_profile, list_profiles, make_profile_token
+from .schema import MEDIA_TYPES, get_schema_document
+from .storage import is_hashed_name
+
+MEDIA_MAX_AGE = 365 * 24 * 60 * 60
+
 
 class HealthCheckView(APIView):
     """
@@ -16,3 +34,129 @@ class HealthCheckView(APIView):
             status=status.HTTP_200_OK
         )
 
+
+class LivenessView(APIView):
+    """
+    Liveness probe; succeeds as long as the process can serve requests.
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        return Response({"status": "ok"}, status=status.HTTP_200_OK)
+
+
+class ReadinessView(APIView):
+    """
+    Readiness probe reporting the database, Redis and Celery broker.
+
+    Dependency checks run in the background (see ``core.health``), so this
+    only returns the latest cached report.
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        report = monitor.get_report()
+        return Response(
+            report,
+            status=status.HTTP_200_OK if report['status'] == 'ok' else status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+
+
+def metrics_view(request):
+    """
+    Expose Prometheus metrics behind ``METRICS_AUTH_TOKEN``; only DEBUG
+    serves them without a token.
+    """
+    token = settings.METRICS_AUTH_TOKEN
+    if not token:
+        if not settings.DEBUG:
+            return HttpResponseForbidden()
+    elif not hmac.compare_digest(request.headers.get('Authorization', ''), f"Bearer {token}"):
+        return HttpResponseForbidden()
+    body = generate_latest(get_registry()) + generate_latest(QUEUE_REGISTRY)
+    return HttpResponse(body, content_type=CONTENT_TYPE_LATEST)
+
+
+def _schema_etag(request, format):
+    return get_schema_document(format)[1] if format in MEDIA_TYPES else None
+
+
+@require_safe
+@condition(etag_func=_schema_etag)
+def schema_document_view(request, format):
+    """
+    Serve the precomputed OpenAPI schema (``build_openapi_schema``) from memory.
+    """
+    if format not in MEDIA_TYPES:
+        raise Http404
+    response = HttpResponse(get_schema_document(format)[0], content_type=MEDIA_TYPES[format])
+    # Clients revalidate with If-None-Match and get a 304 until the code version changes
+    patch_cache_control(response, public=True, no_cache=True)
+    return response
+
+
+@require_safe
+def media_view(request, path):
+    """
+    Serve uploaded media, using the Brotli or gzip variant written by
+    ``HashedMediaStorage`` when the client accepts it. Hashed names never
+    change content, so they are cached as immutable.
+    """
+    response = None
+    if is_hashed_name(path):
+        accept_encoding = request.headers.get('Accept-Encoding', '')
+        for suffix, encoding in (('.br', 'br'), ('.gz', 'gzip')):
+            if not accepts_encoding(accept_encoding, encoding):
+                continue
+            try:
+                # serve() sets Content-Encoding from the suffix
+                response = serve(request, path + suffix, document_root=settings.MEDIA_ROOT)
+                break
+            except Http404:
+                continue
+    if response is None:
+        response = serve(request, path, document_root=settings.MEDIA_ROOT)
+
+    patch_vary_headers(response, ('Accept-Encoding',))
+    if is_hashed_name(path):
+        patch_cache_control(response, public=True, max_age=MEDIA_MAX_AGE, immutable=True)
+    return response
+
+
+class ProfileTokenView(APIView):
+    """
+    Issue a token that enables request profiling (staff only).
+    """
+    permission_classes = [IsAdminUser]
+
+    def post(self, request):
+        return Response({
+            "token": make_profile_token(),
+            "header": PROFILE_HEADER,
+            "expires_in": settings.PROFILING_TOKEN_MAX_AGE,
+        })
+
+
+class ProfileListView(APIView):
+    """
+    List recently captured request profiles (staff only).
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(list_profiles())
+
+
+class ProfileDetailView(APIView):
+    """
+    Return a captured request profile with its queries (staff only).
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, profile_id):
+        profile = get_profile(profile_id)
+        if profile is None:
+            raise NotFound("Profile not found or expired")
+        return Response(profile)
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Order, OrderItem, Payment
+from .models import Order, OrderItem, Payment, PaymentPayload
 
 
 class OrderItemInline(admin.TabularInline):
@@ -25,11 +25,19 @@ class OrderAdmin(admin.ModelAdmin):
     date_hierarchy = 'created_at'
 
 
+class PaymentPayloadInline(admin.TabularInline):
+    model = PaymentPayload
+    extra = 0
+    readonly_fields = ('kind', 'data', 'created_at')
+    can_delete = False
+
+
 @admin.register(Payment)
 class PaymentAdmin(admin.ModelAdmin):
-    list_display = ('id', 'order', 'amount', 'payment_method', 'status', 'created_at')
+    list_display = ('id', 'order', 'amount', 'payment_method', 'status', 'next_check_at', 'created_at')
     list_filter = ('payment_method', 'status', 'created_at')
-    search_fields = ('order__user__phone_number', 'transaction_id')
+    search_fields = ('order__user__phone_number', 'transaction_id', 'gateway_uuid')
     readonly_fields = ('id', 'created_at', 'updated_at')
+    inlines = [PaymentPayloadInline]
     date_hierarchy = 'created_at'
 
@@ -0,0 +1,113 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions, status
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+from .models import Order, Payment
+from .serializers import PaymentSerializer
+from .services import create_gateway_payment
+from core.services.cryptomus import AsyncCryptomusClient
+
+
+def _response(data, status_code=status.HTTP_200_OK):
+    return JsonResponse(
+        data,
+        status=status_code,
+        encoder=JSONEncoder,
+        json_dumps_params={'separators': (',', ':'), 'ensure_ascii': False}
+    )
+
+
+def _authenticate(request):
+    """
+    Run the configured DRF authentication classes against a plain Django request.
+    """
+    for authentication_class in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+        result = authentication_class().authenticate(request)
+        if result is not None:
+            return result[0]
+    return None
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class CreatePaymentAsyncView(View):
+    """
+    Async counterpart of ``OrderViewSet.create_payment``.
+
+    Served under ASGI, a checkout waiting on a slow gateway only holds a
+    coroutine, not a worker thread. The response matches the sync action.
+    """
+    http_method_names = ['post']
+
+    async def post(self, request, pk):
+        try:
+            user = await sync_to_async(_authenticate)(request)
+        except exceptions.AuthenticationFailed as e:
+            return _response({"detail": e.detail}, status.HTTP_401_UNAUTHORIZED)
+        if user is None:
+            return _response(
+                {"detail": "Authentication credentials were not provided."},
+                status.HTTP_401_UNAUTHORIZED
+            )
+
+        try:
+            order = await Order.objects.aget(pk=pk, user=user)
+        except Order.DoesNotExist:
+            return _response({"detail": "Not found."}, status.HTTP_404_NOT_FOUND)
+
+        # Check if order is already paid
+        if order.status != Order.OrderStatus.PENDING:
+            return _response(
+                {"detail": "Cannot create payment for non-pending order."},
+                status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            data = json.loads(request.body or b'{}')
+        except ValueError:
+            return _response({"detail": "JSON parse error."}, status.HTTP_400_BAD_REQUEST)
+
+        # Get payment method from request
+        payment_method = data.get('payment_method')
+        if not payment_method:
+            return _response(
+                {"detail": "Payment method is required."},
+                status.HTTP_400_BAD_REQUEST
+            )
+
+        if payment_method != Payment.PaymentMethod.CRYPTO:
+            return _response(
+                {"detail": "Unsupported payment method."},
+                status.HTTP_400_BAD_REQUEST
+            )
+
+        cryptomus_client = AsyncCryptomusClient()
+        callback_url = request.build_absolute_uri('/api/v1/orders/webhook/')
+
+        try:
+            payment_data = await cryptomus_client.create_payment(
+                amount=float(order.total_amount),
+                currency='USD',
+                order_id=str(order.id),
+                description=f"Payment for order {order.id}",
+                callback_url=callback_url
+            )
+
+            # Create payment record
+            payment = await sync_to_async(create_gateway_payment)(order, payment_data)
+        except Exception as e:
+            return _response(
+                {"detail": f"Error creating payment: {str(e)}"},
+                status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+        return _response({
+            "payment": PaymentSerializer(payment).data,
+            "payment_url": payment_data.get('result', {}).get('url')
+        })
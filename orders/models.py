@@ -1,7 +1,8 @@
-import uuid
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from core.ids import uuid7
 from core.models import TimeStampedModel
 from accounts.models import User
 from products.models import Product, ProductVariant
@@ -20,7 +21,7 @@ class Order(TimeStampedModel):
         CANCELLED = 'cancelled', _('Cancelled')
         REFUNDED = 'refunded', _('Refunded')
     
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='orders')
     status = models.CharField(max_length=20, choices=OrderStatus.choices, default=OrderStatus.PENDING)
     total_amount = models.DecimalField(max_digits=10, decimal_places=2)
@@ -40,7 +41,7 @@ class OrderItem(TimeStampedModel):
     """
     Order item model.
     """
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name='items')
     product = models.ForeignKey(Product, on_delete=models.CASCADE)
     variant = models.ForeignKey(ProductVariant, on_delete=models.CASCADE, null=True, blank=True)
@@ -74,18 +75,49 @@ class Payment(TimeStampedModel):
         FAILED = 'failed', _('Failed')
         REFUNDED = 'refunded', _('Refunded')
     
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name='payments')
     amount = models.DecimalField(max_digits=10, decimal_places=2)
     payment_method = models.CharField(max_length=20, choices=PaymentMethod.choices)
     status = models.CharField(max_length=20, choices=PaymentStatus.choices, default=PaymentStatus.PENDING)
-    transaction_id = models.CharField(max_length=255, blank=True, null=True)
-    payment_details = models.JSONField(default=dict, blank=True)
+    # Gateway references, extracted from provider payloads at write time
+    transaction_id = models.CharField(max_length=255, blank=True, null=True, db_index=True)
+    gateway_uuid = models.UUIDField(blank=True, null=True, db_index=True)
+    
+    # Reconciliation schedule for payments still pending at the gateway
+    last_checked_at = models.DateTimeField(null=True, blank=True)
+    next_check_at = models.DateTimeField(default=timezone.now, null=True, blank=True)
+    check_count = models.PositiveIntegerField(default=0)
     
     class Meta:
         verbose_name = _('Payment')
         verbose_name_plural = _('Payments')
+        indexes = [
+            models.Index(fields=['status', 'next_check_at'], name='payment_reconcile_idx'),
+        ]
     
     def __str__(self):
         return f"Payment {self.id} - Order {self.order.id}"
 
+
+class PaymentPayload(TimeStampedModel):
+    """
+    Raw payment gateway payload, kept apart from the payment row.
+    """
+    class PayloadKind(models.TextChoices):
+        CREATE = 'create', _('Create response')
+        STATUS = 'status', _('Status response')
+        WEBHOOK = 'webhook', _('Webhook')
+    
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
+    payment = models.ForeignKey(Payment, on_delete=models.CASCADE, related_name='payloads')
+    kind = models.CharField(max_length=20, choices=PayloadKind.choices)
+    data = models.JSONField(default=dict, blank=True)
+    
+    class Meta:
+        verbose_name = _('Payment Payload')
+        verbose_name_plural = _('Payment Payloads')
+        ordering = ['created_at']
+    
+    def __str__(self):
+        return f"{self.get_kind_display()} - Payment {self.payment_id}"
@@ -0,0 +1,80 @@
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import translation
+from django.utils.translation import gettext_lazy as _
+
+from .models import Order
+from core.db import pin_to_primary
+from core.services.telegram import TelegramDispatchQueue
+
+STATUS_TEMPLATES = {
+    Order.OrderStatus.PAID: _(
+        "🦊 <b>FoxyHub</b>\n\nPayment received for order <code>{order_id}</code> "
+        "({total_amount}). We are processing it now."
+    ),
+    Order.OrderStatus.COMPLETED: _(
+        "🦊 <b>FoxyHub</b>\n\nYour order <code>{order_id}</code> has been completed."
+    ),
+    Order.OrderStatus.FAILED: _(
+        "🦊 <b>FoxyHub</b>\n\nYour order <code>{order_id}</code> could not be completed. "
+        "Please contact support."
+    ),
+}
+
+@lru_cache(maxsize=None)
+def get_status_template(status: str, locale: str) -> str:
+    """
+    Return the translated message template for a status, rendered once per locale.
+    """
+    with translation.override(locale):
+        return str(STATUS_TEMPLATES[status])
+
+
+def render_status_message(order, locale: str) -> str:
+    return get_status_template(order.status, locale).format(
+        order_id=order.id,
+        total_amount=order.total_amount
+    )
+
+
+def notify_status_change(order):
+    """
+    Queue a Telegram notification for the order's new status.
+
+    The message is rendered in the active language and handed to the
+    dispatch queue once the surrounding transaction commits; a change rolled
+    back with its transaction or savepoint sends nothing. If the order moves
+    on again before the commit, only its latest status is sent, so an order
+    that is paid and completed in the same transaction produces a single
+    message.
+
+    Outside a transaction, as in the ``notify_order_status`` outbox consumer,
+    the message is queued right away and a failure to queue it is raised
+    to the caller, which retries. Once a transaction has committed there is
+    nothing left to retry, so failures there are only logged.
+    """
+    if order.status not in STATUS_TEMPLATES or not order.telegram_id:
+        return
+
+    locale = translation.get_language() or settings.LANGUAGE_CODE
+    status, text = order.status, render_status_message(order, locale)
+    # Runs immediately when not in a transaction
+    robust = transaction.get_connection().in_atomic_block
+    transaction.on_commit(lambda: dispatch_notification(order, status, text), robust=robust)
+
+
+def dispatch_notification(order, status: str, text: str):
+    """
+    Enqueue a rendered notification as a transactional Telegram message.
+    """
+    # Compare the committed status, not the instance: a later change in the
+    # same transaction registered a message of its own, and one rolled back
+    # with a savepoint must not suppress this message
+    with pin_to_primary():
+        current = Order.objects.filter(pk=order.pk).values_list('status', flat=True).first()
+    if current != status:
+        return
+
+    TelegramDispatchQueue().enqueue(order.telegram_id, text, TelegramDispatchQueue.PRIORITY_TRANSACTIONAL)
@@ -0,0 +1,132 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Callable, Dict, Any, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Payment
+from .services import apply_gateway_result
+from core.ratelimit import RateLimiter
+from core.services.cryptomus import CryptomusClient
+
+logger = logging.getLogger(__name__)
+
+
+def next_check_delay(age: timedelta) -> Optional[timedelta]:
+    """
+    Return how long to wait before polling a payment of the given age again,
+    or None once the payment is too old to keep polling.
+    """
+    age_seconds = age.total_seconds()
+    for max_age, interval in settings.PAYMENT_RECONCILE_BACKOFF:
+        if age_seconds < max_age:
+            return timedelta(seconds=interval)
+    return None
+
+
+class PaymentReconciler:
+    """
+    Poll Cryptomus for pending payments whose webhook never arrived.
+
+    Due payments are read in keyset-ordered pages. Gateway calls run on a
+    bounded thread pool behind a global rate limit, while all database work
+    stays on the calling thread, so a run uses a single connection no matter
+    how many payments it checks. A run stops starting new pages after
+    ``max_seconds``; the payments it did not reach are still due next time.
+    """
+
+    def __init__(self, page_size=None, max_payments=None, concurrency=None, rate_limit=None, max_seconds=None):
+        self.page_size = page_size or settings.PAYMENT_RECONCILE_PAGE_SIZE
+        self.max_payments = max_payments or settings.PAYMENT_RECONCILE_MAX_PER_RUN
+        self.max_seconds = max_seconds or settings.PAYMENT_RECONCILE_MAX_SECONDS
+        self.concurrency = concurrency or settings.PAYMENT_RECONCILE_CONCURRENCY
+        self.rate_limiter = RateLimiter(rate_limit or settings.PAYMENT_RECONCILE_RATE_LIMIT)
+        self.local = threading.local()
+
+    def _get_client(self) -> CryptomusClient:
+        # requests sessions are not shared between threads
+        client = getattr(self.local, 'client', None)
+        if client is None:
+            client = self.local.client = CryptomusClient()
+        return client
+
+    def _fetch_status(self, order_id: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        self.rate_limiter.acquire()
+        try:
+            response = self._get_client().get_payment_status(order_id)
+            return response.get('result') or {}, None
+        except Exception as e:
+            return None, str(e)
+
+    def _due_payments(self, now, after):
+        queryset = Payment.objects.filter(
+            status=Payment.PaymentStatus.PENDING,
+            payment_method=Payment.PaymentMethod.CRYPTO,
+            next_check_at__lte=now
+        )
+        if after is not None:
+            last_check_at, last_id = after
+            queryset = queryset.filter(
+                Q(next_check_at__gt=last_check_at) |
+                Q(next_check_at=last_check_at, id__gt=last_id)
+            )
+        return list(
+            queryset.order_by('next_check_at', 'id').values_list(
+                'id', 'order_id', 'created_at', 'next_check_at', 'check_count'
+            )[:self.page_size]
+        )
+
+    def run(self, on_page: Optional[Callable[[], Any]] = None) -> Dict[str, int]:
+        """
+        Reconcile due payments and return counters for the run.
+
+        ``on_page`` is called after each page, e.g. to extend a lock held for the run.
+        """
+        stats = {'checked': 0, 'updated': 0, 'errors': 0}
+        now = timezone.now()
+        deadline = time.monotonic() + self.max_seconds
+        after = None
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            while stats['checked'] < self.max_payments and time.monotonic() < deadline:
+                page = self._due_payments(now, after)
+                if not page:
+                    break
+                after = (page[-1][3], page[-1][0])
+
+                results = executor.map(lambda row: self._fetch_status(str(row[1])), page)
+
+                checked_at = timezone.now()
+                reschedule = []
+                for row, (result, error) in zip(page, results):
+                    payment_id, order_id, created_at, _, check_count = row
+                    stats['checked'] += 1
+
+                    if error is not None:
+                        stats['errors'] += 1
+                        logger.warning(f"Error checking payment {payment_id} for order {order_id}: {error}")
+                    elif apply_gateway_result(payment_id, result):
+                        stats['updated'] += 1
+                        continue
+
+                    delay = next_check_delay(checked_at - created_at)
+                    reschedule.append(Payment(
+                        id=payment_id,
+                        last_checked_at=checked_at,
+                        next_check_at=checked_at + delay if delay else None,
+                        check_count=check_count + 1
+                    ))
+
+                Payment.objects.bulk_update(
+                    reschedule,
+                    ['last_checked_at', 'next_check_at', 'check_count']
+                )
+                if on_page is not None:
+                    on_page()
+
+        return stats
@@ -1,9 +1,14 @@
 from rest_framework import serializers
 from django.db import transaction
+from django.db.models import Q
 
 from .models import Order, OrderItem, Payment
+from core.serializers import ValuesSerializer, format_datetime, group_by
 from products.models import Product, ProductVariant
-from products.serializers import ProductSerializer, ProductVariantSerializer
+from products.serializers import (
+    ProductSerializer, ProductVariantSerializer, ProductFastSerializer, ProductVariantFastSerializer,
+    format_price
+)
 
 
 class OrderItemSerializer(serializers.ModelSerializer):
@@ -51,6 +56,118 @@ class OrderSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'user', 'status', 'total_amount', 'created_at', 'updated_at']
 
 
+class PaymentFastSerializer(ValuesSerializer):
+    """
+    Fast-path equivalent of PaymentSerializer for ``.values()`` rows.
+    """
+    columns = ['id', 'order_id', 'amount', 'payment_method', 'status', 'transaction_id', 'created_at']
+
+    def get_fields(self):
+        return [
+            ('id', 'id', str),
+            ('amount', 'amount', format_price),
+            ('payment_method', 'payment_method', None),
+            ('status', 'status', None),
+            ('transaction_id', 'transaction_id', None),
+            ('created_at', 'created_at', format_datetime),
+        ]
+
+
+class OrderItemFastSerializer(ValuesSerializer):
+    """
+    Fast-path equivalent of OrderItemSerializer for ``.values()`` rows.
+
+    ``products`` and ``variants`` map ids to their already serialized details.
+    """
+    columns = ['id', 'order_id', 'product_id', 'variant_id', 'quantity', 'price']
+
+    def __init__(self, context=None, products=None, variants=None):
+        self.products = products or {}
+        self.variants = variants or {}
+        super().__init__(context)
+
+    def get_fields(self):
+        return [
+            ('id', 'id', str),
+            ('product', 'product_id', None),
+            ('product_details', lambda row: self.products[row['product_id']], None),
+            ('variant', 'variant_id', None),
+            ('variant_details', lambda row: self.variants.get(row['variant_id']), None),
+            ('quantity', 'quantity', None),
+            ('price', 'price', format_price),
+            ('total_price', lambda row: row['price'] * row['quantity'], None),
+        ]
+
+
+class OrderFastSerializer(ValuesSerializer):
+    """
+    Fast-path equivalent of OrderSerializer for ``.values()`` rows.
+
+    Items, payments, products and variants for the whole batch are loaded
+    with one ``.values()`` query each, instead of per order and per item.
+    """
+    columns = [
+        'id', 'user_id', 'status', 'total_amount', 'telegram_id', 'notes', 'created_at', 'updated_at'
+    ]
+
+    def __init__(self, context=None):
+        self.items = {}
+        self.payments = {}
+        super().__init__(context)
+
+    def get_fields(self):
+        return [
+            ('id', 'id', str),
+            ('user', 'user_id', None),
+            ('status', 'status', None),
+            ('total_amount', 'total_amount', format_price),
+            ('telegram_id', 'telegram_id', None),
+            ('notes', 'notes', None),
+            ('created_at', 'created_at', format_datetime),
+            ('updated_at', 'updated_at', format_datetime),
+            ('items', lambda row: self.items.get(row['id'], []), None),
+            ('payments', lambda row: self.payments.get(row['id'], []), None),
+        ]
+
+    def serialize(self, rows):
+        rows = list(rows)
+        order_ids = [row['id'] for row in rows]
+        items = list(OrderItem.objects.filter(order_id__in=order_ids).values(*OrderItemFastSerializer.columns))
+        product_ids = {item['product_id'] for item in items}
+        variant_ids = {item['variant_id'] for item in items if item['variant_id'] is not None}
+
+        # One query covers the variants listed under each product and the ones items point at
+        variant_rows = list(
+            ProductVariant.objects.filter(Q(product_id__in=product_ids) | Q(id__in=variant_ids))
+            .values(*ProductVariantFastSerializer.columns)
+        )
+        variant_serializer = ProductVariantFastSerializer(self.context)
+        variants = {
+            row['id']: data for row, data in zip(variant_rows, variant_serializer.serialize(variant_rows))
+            if row['id'] in variant_ids
+        }
+        product_rows = list(Product.objects.filter(id__in=product_ids).values(*ProductFastSerializer.columns))
+        product_serializer = ProductFastSerializer(self.context, variants=group_by(variant_rows, 'product_id'))
+        products = {
+            row['id']: data for row, data in zip(product_rows, product_serializer.serialize(product_rows))
+        }
+
+        item_serializer = OrderItemFastSerializer(self.context, products=products, variants=variants)
+        self.items = {
+            order_id: item_serializer.serialize(order_items)
+            for order_id, order_items in group_by(items, 'order_id').items()
+        }
+        payment_serializer = PaymentFastSerializer(self.context)
+        self.payments = {
+            order_id: payment_serializer.serialize(order_payments)
+            for order_id, order_payments in group_by(
+                Payment.objects.filter(order_id__in=order_ids).values(*PaymentFastSerializer.columns),
+                'order_id'
+            ).items()
+        }
+        return super().serialize(rows)
+
+
 class OrderCreateSerializer(serializers.Serializer):
     """
     Serializer for creating a new order.
@@ -0,0 +1,154 @@
+import logging
+import uuid
+from typing import Dict, Any
+
+from django.db import transaction
+
+from .models import Order, Payment, PaymentPayload
+from core.services.telegram import TelegramPremiumService
+
+logger = logging.getLogger(__name__)
+
+# Cryptomus payment statuses mapped to our payment statuses.
+# Statuses not listed here (process, check, confirm_check, ...) keep the payment pending.
+CRYPTOMUS_STATUS_MAP = {
+    'paid': Payment.PaymentStatus.COMPLETED,
+    'paid_over': Payment.PaymentStatus.COMPLETED,
+    'fail': Payment.PaymentStatus.FAILED,
+    'system_fail': Payment.PaymentStatus.FAILED,
+    'wrong_amount': Payment.PaymentStatus.FAILED,
+    'cancel': Payment.PaymentStatus.FAILED,
+    'refund_paid': Payment.PaymentStatus.REFUNDED,
+}
+
+
+def map_gateway_status(gateway_status: str) -> str:
+    """
+    Map a Cryptomus payment status to a payment status.
+    """
+    return CRYPTOMUS_STATUS_MAP.get(gateway_status, Payment.PaymentStatus.PENDING)
+
+
+def extract_gateway_references(payment: Payment, result: Dict[str, Any]):
+    """
+    Copy the gateway identifiers from a Cryptomus result onto the payment.
+    """
+    if result.get('txid'):
+        payment.transaction_id = result['txid']
+    if result.get('uuid'):
+        try:
+            payment.gateway_uuid = uuid.UUID(str(result['uuid']))
+        except ValueError:
+            logger.warning(f"Ignoring malformed gateway uuid for payment {payment.id}")
+
+
+@transaction.atomic
+def create_gateway_payment(order, payment_data: Dict[str, Any]) -> Payment:
+    """
+    Record a payment created at Cryptomus, together with its raw payload.
+    """
+    payment = Payment(
+        order=order,
+        amount=order.total_amount,
+        payment_method=Payment.PaymentMethod.CRYPTO
+    )
+    extract_gateway_references(payment, payment_data.get('result') or {})
+    payment.save()
+
+    PaymentPayload.objects.create(
+        payment=payment,
+        kind=PaymentPayload.PayloadKind.CREATE,
+        data=payment_data
+    )
+    return payment
+
+
+@transaction.atomic
+def apply_gateway_result(payment_id, result: Dict[str, Any],
+                         kind: str = PaymentPayload.PayloadKind.STATUS) -> bool:
+    """
+    Apply a Cryptomus payment result to a pending payment.
+
+    The payment is locked and saved through the model, so the ``post_save``
+    signal drives the order transition exactly as for any other status change.
+    Webhook payloads are always kept; status responses only when they change
+    the payment. Returns True if the payment status changed.
+    """
+    payment = Payment.objects.select_for_update().filter(
+        pk=payment_id,
+        status=Payment.PaymentStatus.PENDING
+    ).first()
+    if payment is None:
+        return False
+
+    new_status = map_gateway_status(result.get('payment_status') or result.get('status'))
+    changed = new_status != Payment.PaymentStatus.PENDING
+
+    if changed or kind == PaymentPayload.PayloadKind.WEBHOOK:
+        PaymentPayload.objects.create(payment=payment, kind=kind, data=result)
+
+    if not changed:
+        return False
+
+    payment.status = new_status
+    extract_gateway_references(payment, result)
+    payment.next_check_at = None
+    payment.save()
+
+    logger.info(f"Payment {payment.id} moved to {new_status} from gateway status")
+    return True
+
+
+def process_order(order_id) -> bool:
+    """
+    Deliver a paid order based on product type.
+
+    The order is claimed first, by moving it from paid to processing in a
+    transaction of its own, and only then are the providers called. A
+    repeated fulfillment event, or a retry after a failure further down,
+    finds the order already claimed and cannot buy it twice; an order left
+    in processing needs a look from support. Call it outside a transaction,
+    so the claim is committed before any purchase. Returns True if the
+    order was processed.
+    """
+    with transaction.atomic():
+        order = Order.objects.select_for_update().filter(pk=order_id, status=Order.OrderStatus.PAID).first()
+        if order is None:
+            return False
+        order.status = Order.OrderStatus.PROCESSING
+        order.save()
+
+    # Check if all items are processed
+    all_processed = True
+    
+    for item in order.items.select_related('product', 'variant'):
+        product = item.product
+        
+        if product.product_type == 'telegram_premium':
+            # Process Telegram Premium purchase
+            telegram_id = order.telegram_id
+            duration_months = item.variant.duration_months if item.variant else 1
+            
+            try:
+                # Purchase Telegram Premium
+                result = TelegramPremiumService.purchase_premium(
+                    telegram_id=telegram_id,
+                    months=duration_months
+                )
+                
+                if result.get('success'):
+                    # Update order with transaction details
+                    order.notes += f"\nTelegram Premium purchase successful: {result.get('transaction_id')}"
+                else:
+                    all_processed = False
+                    order.notes += f"\nTelegram Premium purchase failed: {result.get('message')}"
+            except Exception as e:
+                all_processed = False
+                order.notes += f"\nError processing Telegram Premium purchase: {str(e)}"
+    
+    # Orders with a failed item stay in processing
+    if all_processed:
+        order.status = Order.OrderStatus.COMPLETED
+    
+    order.save(update_fields=['status', 'notes', 'updated_at'])
+    return True
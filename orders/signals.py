@@ -1,62 +1,76 @@
-from django.db.models.signals import post_save
+from django.conf import settings
+from django.db.models.signals import post_init, post_save
 from django.dispatch import receiver
+from django.utils import translation
 
 from .models import Payment, Order
-from core.services.telegram import TelegramPremiumService
+from core.outbox import publish
+
+# Side effects of these changes run in the consumers of their outbox events
+# (OUTBOX_CONSUMERS), after the transaction that made the change commits.
+ORDER_CREATED = 'order.created'
+ORDER_STATUS_CHANGED = 'order.status_changed'
+PAYMENT_STATUS_CHANGED = 'payment.status_changed'
+
+
+@receiver(post_init, sender=Order)
+def remember_order_status(sender, instance, **kwargs):
+    """
+    Remember the loaded status so changes can be detected on save.
+    """
+    # Read from __dict__ so a deferred status field is not loaded here
+    instance._original_status = instance.__dict__.get('status')
+
+
+@receiver(post_init, sender=Payment)
+def remember_payment_status(sender, instance, **kwargs):
+    instance._original_status = instance.__dict__.get('status')
+
+
+@receiver(post_save, sender=Order)
+def handle_order_status_change(sender, instance, created, **kwargs):
+    """
+    Record the new order, or its status change, in the outbox.
+    """
+    if created:
+        publish(ORDER_CREATED, {
+            'order_id': str(instance.id),
+            'status': instance.status,
+            'total_amount': str(instance.total_amount),
+        })
+    elif instance.status != instance._original_status:
+        publish(ORDER_STATUS_CHANGED, {
+            'order_id': str(instance.id),
+            'status': instance.status,
+            'previous_status': instance._original_status,
+            'total_amount': str(instance.total_amount),
+            # Notifications are written in the language of the request that made the change
+            'locale': translation.get_language() or settings.LANGUAGE_CODE,
+        })
+    instance._original_status = instance.status
 
 
 @receiver(post_save, sender=Payment)
 def handle_payment_status_change(sender, instance, created, **kwargs):
     """
-    Handle payment status changes.
+    Mark the order paid when its payment completes, and record payment
+    status changes in the outbox.
     """
-    if not created and instance.status == Payment.PaymentStatus.COMPLETED:
-        # Update order status
+    if created or instance.status == instance._original_status:
+        instance._original_status = instance.status
+        return
+
+    if instance.status == Payment.PaymentStatus.COMPLETED:
+        # Fulfillment follows from the order's status change event
         order = instance.order
         order.status = Order.OrderStatus.PAID
         order.save()
-        
-        # Process the order based on product type
-        process_order(order)
-
-
-def process_order(order):
-    """
-    Process the order based on product type.
-    """
-    # Check if all items are processed
-    all_processed = True
-    
-    for item in order.items.all():
-        product = item.product
-        
-        if product.product_type == 'telegram_premium':
-            # Process Telegram Premium purchase
-            telegram_id = order.telegram_id
-            duration_months = item.variant.duration_months if item.variant else 1
-            
-            try:
-                # Purchase Telegram Premium
-                result = TelegramPremiumService.purchase_premium(
-                    telegram_id=telegram_id,
-                    months=duration_months
-                )
-                
-                if result.get('success'):
-                    # Update order with transaction details
-                    order.notes += f"\nTelegram Premium purchase successful: {result.get('transaction_id')}"
-                else:
-                    all_processed = False
-                    order.notes += f"\nTelegram Premium purchase failed: {result.get('message')}"
-            except Exception as e:
-                all_processed = False
-                order.notes += f"\nError processing Telegram Premium purchase: {str(e)}"
-    
-    # Update order status
-    if all_processed:
-        order.status = Order.OrderStatus.COMPLETED
-    else:
-        order.status = Order.OrderStatus.PROCESSING
-    
-    order.save()
 
+    publish(PAYMENT_STATUS_CHANGED, {
+        'payment_id': str(instance.id),
+        'order_id': str(instance.order_id),
+        'status': instance.status,
+        'previous_status': instance._original_status,
+        'amount': str(instance.amount),
+    })
+    instance._original_status = instance.status
@@ -0,0 +1,87 @@
+import logging
+
+from celery import shared_task
+from django.conf import settings
+from django.utils import translation
+from redis.exceptions import LockNotOwnedError
+
+from .models import Order, Payment
+from .notifications import notify_status_change
+from .reconciliation import PaymentReconciler
+from .services import process_order
+from .signals import PAYMENT_STATUS_CHANGED
+from core.metrics import ORDER_EVENTS, ORDER_PAID_AMOUNT
+from core.outbox import outbox_consumer
+from core.services.redis import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+RECONCILE_LOCK_KEY = 'orders:reconcile-pending-payments'
+
+
+def reconcile_lock_timeout() -> int:
+    """
+    Lock TTL for a reconciliation run: its wall-time cap, plus the page in
+    flight when the cap is reached and a margin.
+    """
+    page_seconds = settings.PAYMENT_RECONCILE_PAGE_SIZE / settings.PAYMENT_RECONCILE_RATE_LIMIT
+    return int(settings.PAYMENT_RECONCILE_MAX_SECONDS + page_seconds) + 60
+
+
+# Safe to run twice: it only applies the gateway's current status, under a lock
+@shared_task(ignore_result=True, acks_late=True, reject_on_worker_lost=True)
+def reconcile_pending_payments():
+    """
+    Poll the gateway for pending payments that missed their webhook.
+    """
+    # Only one run at a time, so the rate limit stays global
+    lock = get_redis_client().lock(RECONCILE_LOCK_KEY, timeout=reconcile_lock_timeout())
+    if not lock.acquire(blocking=False):
+        logger.info("Payment reconciliation already running, skipping")
+        return
+
+    try:
+        # Reset the TTL after every page; if the lock was lost anyway, stop rather than overlap
+        stats = PaymentReconciler().run(on_page=lock.reacquire)
+        logger.info(f"Payment reconciliation finished: {stats}")
+    except LockNotOwnedError:
+        logger.warning("Payment reconciliation lost its lock, stopping")
+    finally:
+        try:
+            lock.release()
+        except LockNotOwnedError:
+            pass
+
+
+# Outbox consumers (OUTBOX_CONSUMERS); each gets every event at least once and skips repeats
+
+@outbox_consumer()
+def fulfill_order(event_id, topic, payload):
+    """
+    Deliver an order once it is paid.
+    """
+    if payload['status'] == Order.OrderStatus.PAID:
+        process_order(payload['order_id'])
+
+
+@outbox_consumer()
+def notify_order_status(event_id, topic, payload):
+    """
+    Message the customer about the order's new status.
+    """
+    order = Order.objects.filter(pk=payload['order_id']).first()
+    # A later change has an event of its own; only the current status is worth a message
+    if order is None or order.status != payload['status']:
+        return
+    with translation.override(payload['locale']):
+        notify_status_change(order)
+
+
+@outbox_consumer()
+def record_order_analytics(event_id, topic, payload):
+    """
+    Count order and payment events for the business dashboards.
+    """
+    ORDER_EVENTS.labels(topic, payload['status']).inc()
+    if topic == PAYMENT_STATUS_CHANGED and payload['status'] == Payment.PaymentStatus.COMPLETED:
+        ORDER_PAID_AMOUNT.inc(float(payload['amount']))
@@ -0,0 +1,79 @@
+from decimal import Decimal
+from unittest import mock
+
+import redis
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase
+
+from accounts.models import User
+from orders.models import Order
+from orders.notifications import notify_status_change
+
+
+@mock.patch('orders.notifications.TelegramDispatchQueue')
+class NotifyStatusChangeTests(TestCase):
+
+    def setUp(self):
+        user = User.objects.create_user('+989120000000')
+        self.order = Order.objects.create(user=user, total_amount=Decimal('10.00'), telegram_id='12345')
+
+    def sent_texts(self, queue):
+        return [call.args[1] for call in queue.return_value.enqueue.call_args_list]
+
+    def test_rolled_back_change_does_not_suppress_committed_status(self, queue):
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                self.order.status = Order.OrderStatus.PAID
+                self.order.save()
+                notify_status_change(self.order)
+                try:
+                    with transaction.atomic():
+                        self.order.status = Order.OrderStatus.COMPLETED
+                        self.order.save()
+                        notify_status_change(self.order)
+                        raise RuntimeError
+                except RuntimeError:
+                    pass
+
+        texts = self.sent_texts(queue)
+        self.assertEqual(len(texts), 1)
+        self.assertIn('Payment received', texts[0])
+
+    def test_only_latest_status_is_sent(self, queue):
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                for status in (Order.OrderStatus.PAID, Order.OrderStatus.COMPLETED):
+                    self.order.status = status
+                    self.order.save()
+                    notify_status_change(self.order)
+
+        texts = self.sent_texts(queue)
+        self.assertEqual(len(texts), 1)
+        self.assertIn('has been completed', texts[0])
+
+
+
+@mock.patch('orders.notifications.TelegramDispatchQueue')
+class NotificationQueueFailureTests(TransactionTestCase):
+
+    def setUp(self):
+        user = User.objects.create_user('+989120000000')
+        self.order = Order.objects.create(
+            user=user, total_amount=Decimal('10.00'), telegram_id='12345', status=Order.OrderStatus.PAID
+        )
+
+    def test_failure_reaches_caller_outside_a_transaction(self, queue):
+        # The outbox consumer relies on this to retry instead of marking the event done
+        queue.return_value.enqueue.side_effect = redis.ConnectionError('down')
+
+        with self.assertRaises(redis.ConnectionError):
+            notify_status_change(self.order)
+
+    def test_failure_after_commit_is_logged(self, queue):
+        queue.return_value.enqueue.side_effect = redis.ConnectionError('down')
+
+        with self.assertLogs('django.db.backends.base', 'ERROR'):
+            with transaction.atomic():
+                self.order.status = Order.OrderStatus.COMPLETED
+                self.order.save()
+                notify_status_change(self.order)
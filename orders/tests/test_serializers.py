@@ -0,0 +1,56 @@
+from decimal import Decimal
+
+from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+from accounts.models import User
+from orders.models import Order, OrderItem, Payment
+from orders.serializers import OrderFastSerializer, OrderSerializer
+from products.models import Category, Product, ProductVariant
+
+
+class OrderFastSerializerParityTests(TestCase):
+    """
+    OrderFastSerializer must render exactly what OrderSerializer does.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user('+989120000000')
+        category = Category.objects.create(name='Telegram', slug='telegram')
+        premium = Product.objects.create(
+            name='Premium', slug='premium', description='Telegram Premium', category=category,
+            price=Decimal('12.50'), discount_price=Decimal('9.99'), image='products/premium.png'
+        )
+        variant = ProductVariant.objects.create(
+            product=premium, name='3 months', price=Decimal('30'), discount_price=Decimal('27.5'),
+            duration_months=3
+        )
+        ProductVariant.objects.create(product=premium, name='1 month', price=Decimal('10.00'))
+        stars = Product.objects.create(
+            name='Stars', slug='stars', description='', category=category, price=Decimal('1.00')
+        )
+
+        cls.paid = Order.objects.create(
+            user=user, total_amount=Decimal('57.00'), telegram_id='12345', notes='gift',
+            status=Order.OrderStatus.PAID
+        )
+        OrderItem.objects.create(order=cls.paid, product=premium, variant=variant, quantity=2, price=Decimal('27.50'))
+        # No variant: variant and variant_details are null
+        OrderItem.objects.create(order=cls.paid, product=stars, quantity=2, price=Decimal('1'))
+        Payment.objects.create(
+            order=cls.paid, amount=Decimal('57'), payment_method=Payment.PaymentMethod.CRYPTO,
+            status=Payment.PaymentStatus.COMPLETED, transaction_id='tx-1'
+        )
+        # No items or payments, no Telegram ID
+        Order.objects.create(user=user, total_amount=Decimal('0'))
+
+    def test_orders(self):
+        context = {'request': APIRequestFactory().get('/api/v1/orders/')}
+        orders = Order.objects.all()
+        fast = OrderFastSerializer(context).serialize(orders.values(*OrderFastSerializer.columns))
+        model = OrderSerializer(orders, many=True, context=context).data
+
+        self.assertEqual(len(fast), 2)
+        self.assertEqual(JSONRenderer().render(fast), JSONRenderer().render(model))
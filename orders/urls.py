@@ -1,15 +1,25 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
 from .views import OrderViewSet, PaymentWebhookView
+from .async_views import CreatePaymentAsyncView
 
 app_name = 'orders'
 
 router = DefaultRouter()
 router.register(r'', OrderViewSet, basename='order')
 
-urlpatterns = [
-    path('', include(router.urls)),
+urlpatterns = []
+if settings.ASYNC_VIEWS_ENABLED:
+    # Served by config.asgi only; under WSGI each request would run on a throwaway event loop
+    urlpatterns.append(
+        path('<uuid:pk>/create_payment_async/', CreatePaymentAsyncView.as_view(), name='order-create-payment-async')
+    )
+
+urlpatterns += [
+    # Must precede the router, whose detail route would otherwise match 'webhook/'
     path('webhook/', PaymentWebhookView.as_view(), name='payment-webhook'),
+    path('', include(router.urls)),
 ]
 
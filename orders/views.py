@@ -2,10 +2,12 @@ from rest_framework import viewsets, status, generics
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import action
+from django.core.exceptions import ValidationError
 from django.db.models import Q
 
-from .models import Order, Payment
-from .serializers import OrderSerializer, OrderCreateSerializer, PaymentSerializer
+from .models import Order, Payment, PaymentPayload
+from .serializers import OrderSerializer, OrderCreateSerializer, OrderFastSerializer, PaymentSerializer
+from .services import apply_gateway_result, create_gateway_payment
 from core.services.cryptomus import CryptomusClient
 
 
@@ -30,11 +32,26 @@ class OrderViewSet(viewsets.ModelViewSet):
             return OrderCreateSerializer
         return OrderSerializer
     
-    def perform_create(self, serializer):
+    def list(self, request, *args, **kwargs):
         """
-        Create a new order.
+        List orders from ``.values()`` rows through the fast-path serializer.
         """
-        serializer.save()
+        queryset = self.filter_queryset(self.get_queryset()).values(*OrderFastSerializer.columns)
+        serializer = OrderFastSerializer(context=self.get_serializer_context())
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serializer.serialize(page))
+        return Response(serializer.serialize(queryset))
+    
+    def create(self, request, *args, **kwargs):
+        """
+        Create a new order and return it in the read representation.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        order = serializer.save()
+        return Response(OrderSerializer(order, context=self.get_serializer_context()).data,
+                        status=status.HTTP_201_CREATED)
     
     @action(detail=True, methods=['post'])
     def create_payment(self, request, pk=None):
@@ -74,12 +91,7 @@ class OrderViewSet(viewsets.ModelViewSet):
                 )
                 
                 # Create payment record
-                payment = Payment.objects.create(
-                    order=order,
-                    amount=order.total_amount,
-                    payment_method=Payment.PaymentMethod.CRYPTO,
-                    payment_details=payment_data
-                )
+                payment = create_gateway_payment(order, payment_data)
                 
                 return Response({
                     "payment": PaymentSerializer(payment).data,
@@ -103,14 +115,42 @@ class PaymentWebhookView(generics.GenericAPIView):
     View for handling payment webhooks from Cryptomus.
     """
     permission_classes = []  # No authentication required for webhooks
+    authentication_classes = []
     
     def post(self, request, *args, **kwargs):
         """
         Handle webhook from Cryptomus.
         """
-        # In a real implementation, you would verify the webhook signature
-        # and update the order status based on the payment status
+        data = dict(request.data)
+        if not CryptomusClient().verify_webhook(data):
+            return Response(
+                {"detail": "Invalid webhook signature."},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        # Look the payment up by the gateway uuid, falling back to the order
+        try:
+            payments = Payment.objects.filter(payment_method=Payment.PaymentMethod.CRYPTO)
+            payment_id = None
+            if data.get('uuid'):
+                payment_id = payments.filter(
+                    gateway_uuid=data['uuid']
+                ).values_list('id', flat=True).first()
+            if payment_id is None:
+                payment_id = payments.filter(
+                    order_id=data.get('order_id')
+                ).order_by('-created_at').values_list('id', flat=True).first()
+        except (ValueError, ValidationError):
+            payment_id = None
+        
+        if payment_id is None:
+            return Response(
+                {"detail": "Payment not found."},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        # Update the payment; the post_save signal takes care of the order
+        apply_gateway_result(payment_id, data, kind=PaymentPayload.PayloadKind.WEBHOOK)
         
-        # For now, we'll just return a success response
         return Response({"status": "success"})
 
@@ -0,0 +1,11 @@
+from django.conf import settings
+
+from core.cache import NamespacedCache
+
+# Category listings, invalidated whenever a category changes (products.signals)
+catalog_cache = NamespacedCache(
+    'catalog',
+    timeout=settings.CATALOG_CACHE_TTL,
+    local_maxsize=settings.CATALOG_LOCAL_CACHE_SIZE,
+    local_ttl=settings.CATALOG_LOCAL_CACHE_TTL,
+)
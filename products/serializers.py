@@ -1,6 +1,9 @@
 from rest_framework import serializers
 
 from .models import Category, Product, ProductVariant
+from core.serializers import ValuesSerializer, decimal_formatter, file_url_formatter, group_by
+
+format_price = decimal_formatter(max_digits=10, decimal_places=2)
 
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -56,3 +59,112 @@ class ProductListSerializer(serializers.ModelSerializer):
             'product_type', 'image', 'is_active'
         ]
 
+
+def current_price(row):
+    return row['discount_price'] if row['discount_price'] else row['price']
+
+
+def category_details(row):
+    return {
+        'id': str(row['category_id']),
+        'name': row['category__name'],
+        'slug': row['category__slug'],
+        'description': row['category__description'],
+        'is_active': row['category__is_active'],
+    }
+
+
+class ProductVariantFastSerializer(ValuesSerializer):
+    """
+    Fast-path equivalent of ProductVariantSerializer for ``.values()`` rows.
+    """
+    columns = [
+        'id', 'product_id', 'name', 'description', 'price', 'discount_price',
+        'duration_months', 'is_active'
+    ]
+
+    def get_fields(self):
+        return [
+            ('id', 'id', str),
+            ('name', 'name', None),
+            ('description', 'description', None),
+            ('price', 'price', format_price),
+            ('discount_price', 'discount_price', format_price),
+            ('current_price', current_price, format_price),
+            ('duration_months', 'duration_months', None),
+            ('is_active', 'is_active', None),
+        ]
+
+
+class ProductFastSerializer(ValuesSerializer):
+    """
+    Fast-path equivalent of ProductSerializer for ``.values()`` rows.
+
+    Variants for the whole batch are loaded in one query unless the caller
+    passes them in, grouped by product id.
+    """
+    columns = [
+        'id', 'name', 'slug', 'description', 'price', 'discount_price', 'category_id',
+        'category__name', 'category__slug', 'category__description', 'category__is_active',
+        'product_type', 'image', 'is_active'
+    ]
+
+    def __init__(self, context=None, variants=None):
+        self.preloaded_variants = variants
+        self.variants = {}
+        self.variant_serializer = ProductVariantFastSerializer(context)
+        super().__init__(context)
+
+    def get_fields(self):
+        image_url = file_url_formatter(Product._meta.get_field('image').storage, self.context.get('request'))
+        return [
+            ('id', 'id', str),
+            ('name', 'name', None),
+            ('slug', 'slug', None),
+            ('description', 'description', None),
+            ('price', 'price', format_price),
+            ('discount_price', 'discount_price', format_price),
+            ('current_price', current_price, format_price),
+            ('category', category_details, None),
+            ('product_type', 'product_type', None),
+            ('image', 'image', image_url),
+            ('is_active', 'is_active', None),
+            ('variants', self.get_variants, None),
+        ]
+
+    def get_variants(self, row):
+        return self.variant_serializer.serialize(self.variants.get(row['id'], ()))
+
+    def serialize(self, rows):
+        rows = list(rows)
+        self.variants = self.preloaded_variants
+        if self.variants is None:
+            self.variants = group_by(
+                ProductVariant.objects.filter(product_id__in=[row['id'] for row in rows])
+                .values(*ProductVariantFastSerializer.columns),
+                'product_id'
+            )
+        return super().serialize(rows)
+
+
+class ProductListFastSerializer(ValuesSerializer):
+    """
+    Fast-path equivalent of ProductListSerializer for ``.values()`` rows.
+    """
+    columns = [
+        'id', 'name', 'slug', 'price', 'discount_price', 'category__name',
+        'product_type', 'image', 'is_active'
+    ]
+
+    def get_fields(self):
+        image_url = file_url_formatter(Product._meta.get_field('image').storage, self.context.get('request'))
+        return [
+            ('id', 'id', str),
+            ('name', 'name', None),
+            ('slug', 'slug', None),
+            ('current_price', current_price, format_price),
+            ('category_name', 'category__name', None),
+            ('product_type', 'product_type', None),
+            ('image', 'image', image_url),
+            ('is_active', 'is_active', None),
+        ]
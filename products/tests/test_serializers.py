@@ -0,0 +1,65 @@
+from decimal import Decimal
+
+from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+from products.models import Category, Product, ProductVariant
+from products.serializers import (
+    ProductFastSerializer, ProductListFastSerializer, ProductListSerializer, ProductSerializer
+)
+
+
+class FastSerializerParityTests(TestCase):
+    """
+    The fast-path serializers must render exactly what the ModelSerializers do.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        category = Category.objects.create(name='Telegram', slug='telegram', description='Bots and more')
+        cls.discounted = Product.objects.create(
+            name='Premium', slug='premium', description='Telegram Premium', category=category,
+            price=Decimal('12.50'), discount_price=Decimal('9.99'),
+            product_type=Product.ProductType.TELEGRAM_PREMIUM, image='products/premium.png'
+        )
+        ProductVariant.objects.create(
+            product=cls.discounted, name='3 months', price=Decimal('30'), discount_price=Decimal('27.5'),
+            duration_months=3
+        )
+        ProductVariant.objects.create(
+            product=cls.discounted, name='1 month', price=Decimal('10.00'), is_active=False
+        )
+        # A zero discount is not a discount: current_price falls back to the price
+        cls.plain = Product.objects.create(
+            name='Stars', slug='stars', description='', category=category,
+            price=Decimal('1234567.89'), discount_price=Decimal('0.00')
+        )
+
+    def setUp(self):
+        self.context = {'request': APIRequestFactory().get('/api/v1/products/')}
+
+    def assertSameJSON(self, fast, model):
+        self.assertEqual(JSONRenderer().render(fast), JSONRenderer().render(model))
+
+    def test_product_list(self):
+        products = Product.objects.order_by('slug')
+        fast = ProductListFastSerializer(self.context).serialize(
+            products.values(*ProductListFastSerializer.columns)
+        )
+        model = ProductListSerializer(products, many=True, context=self.context).data
+        self.assertSameJSON(fast, model)
+
+    def test_product_detail(self):
+        products = Product.objects.order_by('slug')
+        fast = ProductFastSerializer(self.context).serialize(products.values(*ProductFastSerializer.columns))
+        model = ProductSerializer(products, many=True, context=self.context).data
+        self.assertSameJSON(fast, model)
+
+    def test_without_request(self):
+        # Image URLs are relative when no request is in the context
+        products = Product.objects.order_by('slug')
+        fast = ProductFastSerializer().serialize(products.values(*ProductFastSerializer.columns))
+        model = ProductSerializer(products, many=True).data
+        self.assertSameJSON(fast, model)
+        self.assertEqual(fast[0]['image'], model[0]['image'])
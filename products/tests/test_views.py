@@ -0,0 +1,44 @@
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from products.cache import catalog_cache
+from products.models import Category
+
+
+class CategoryListCacheTests(APITestCase):
+    url = reverse('products:category-list')
+
+    def setUp(self):
+        cache.clear()
+        catalog_cache.invalidate()
+        self.category = Category.objects.create(name='Telegram', slug='telegram')
+
+    def names(self, response):
+        return [category['name'] for category in response.json()['results']]
+
+    def test_list_is_served_from_cache(self):
+        self.assertEqual(self.names(self.client.get(self.url)), ['Telegram'])
+        with self.assertNumQueries(0):
+            self.assertEqual(self.names(self.client.get(self.url)), ['Telegram'])
+
+    def test_other_query_parameters_share_the_cached_page(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            self.client.get(self.url, {'page': '01', 'utm_source': 'x'})
+            self.client.get(self.url, {'nonce': 'y'})
+
+    def test_saving_a_category_invalidates_the_list(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.name = 'Telegram Premium'
+            self.category.save()
+
+        self.assertEqual(self.names(self.client.get(self.url)), ['Telegram Premium'])
+
+    def test_deleting_a_category_invalidates_the_list(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.delete()
+
+        self.assertEqual(self.names(self.client.get(self.url)), [])
@@ -1,14 +1,23 @@
+import logging
+
+import redis
 from rest_framework import viewsets, filters
 from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 
+from .cache import catalog_cache
 from .models import Category, Product, ProductVariant
 from .serializers import (
     CategorySerializer, 
     ProductSerializer, 
     ProductListSerializer,
+    ProductListFastSerializer,
     ProductVariantSerializer
 )
+from core.db import pin_to_primary
+
+logger = logging.getLogger(__name__)
 
 
 class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
@@ -19,6 +28,34 @@ class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = CategorySerializer
     permission_classes = [AllowAny]
     lookup_field = 'slug'
+    
+    def list(self, request, *args, **kwargs):
+        """
+        List categories from the catalog cache, computing each page once.
+        """
+        def compute():
+            # Invalidation runs on commit; a lagging replica would cache the old listing for the full TTL
+            with pin_to_primary():
+                return super(CategoryViewSet, self).list(request, *args, **kwargs).data
+
+        try:
+            data = catalog_cache.get_or_set(self.get_list_cache_key(request), compute)
+        except redis.RedisError as e:
+            logger.warning(f"Catalog cache unavailable, listing categories from the database: {e}")
+            data = compute()
+        return Response(data)
+    
+    def get_list_cache_key(self, request) -> str:
+        """
+        Key a cached page on what selects it, so other query parameters
+        cannot fill the cache with copies of the same page.
+        """
+        page = request.query_params.get(self.paginator.page_query_param, '1')
+        if page.isdigit():
+            page = str(int(page))
+        page_size = self.paginator.get_page_size(request)
+        # Pagination links are absolute, so the scheme and host are part of the key
+        return f"categories:{request.scheme}://{request.get_host()}:{page}:{page_size}"
 
 
 class ProductViewSet(viewsets.ReadOnlyModelViewSet):
@@ -37,6 +74,19 @@ class ProductViewSet(viewsets.ReadOnlyModelViewSet):
         if self.action == 'list':
             return ProductListSerializer
         return ProductSerializer
+    
+    def list(self, request, *args, **kwargs):
+        """
+        List products from ``.values()`` rows through the fast-path serializer.
+        
+        ProductListSerializer still describes the response in the schema.
+        """
+        queryset = self.filter_queryset(self.get_queryset()).values(*ProductListFastSerializer.columns)
+        serializer = ProductListFastSerializer(context=self.get_serializer_context())
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serializer.serialize(page))
+        return Response(serializer.serialize(queryset))
 
 
 class ProductVariantViewSet(viewsets.ReadOnlyModelViewSet):